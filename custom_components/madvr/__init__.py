@@ -4,84 +4,167 @@ from __future__ import annotations
 
 import logging
 
-from pymadvr.madvr import Madvr
-
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PORT, EVENT_HOMEASSISTANT_STOP, Platform
 from homeassistant.core import Event, HomeAssistant
-
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+
+from .clients import async_close_client, async_get_client_pool
+from .const import (
+    CONF_MACROS,
+    CONF_TEMPERATURE_STATISTICS,
+    DOMAIN,
+    RELOAD_OPTIONS,
+)
 from .coordinator import MadVRCoordinator
+from .metrics import MadVRMetricsView
+from .services import async_setup_services
+from .startup import MadVRStartupTimer
+from .websocket_api import async_register_websocket_commands
 
-PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.REMOTE, Platform.SENSOR]
+PLATFORMS: list[Platform] = [
+    Platform.BINARY_SENSOR,
+    Platform.BUTTON,
+    Platform.REMOTE,
+    Platform.SELECT,
+    Platform.SENSOR,
+]
 
 
 type MadVRConfigEntry = ConfigEntry[MadVRCoordinator]
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the madVR integration."""
+    async_setup_services(hass)
+    async_register_websocket_commands(hass)
+    hass.http.register_view(MadVRMetricsView())
+    return True
+
 
-async def async_handle_unload(coordinator: MadVRCoordinator) -> None:
+async def async_handle_unload(
+    coordinator: MadVRCoordinator, keep_client: bool = False
+) -> None:
     """Handle unload."""
     _LOGGER.debug("Integration unloading")
+    if coordinator.tracer is not None:
+        await coordinator.async_stop_tracing()
     # Clean up coordinator resources first
     coordinator.cleanup()
-    coordinator.client.stop()
-    await coordinator.client.async_cancel_tasks()
-    _LOGGER.debug("Integration closing connection")
-    await coordinator.client.close_connection()
-    _LOGGER.debug("Unloaded")
+    await coordinator.sessions.async_save()
+    if keep_client:
+        # stays connected for a while so a reload can pick it up
+        async_get_client_pool(coordinator.hass).async_release(coordinator.client)
+    else:
+        await async_close_client(coordinator.client)
+    _LOGGER.debug("Unloaded, remaining resources: %s", coordinator.resources())
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: MadVRConfigEntry) -> bool:
     """Set up the integration from a config entry."""
     assert entry.unique_id
-    
+
     # Check if this entry is already being set up to prevent duplicate connections
     if hasattr(entry, "_setup_lock"):
         _LOGGER.warning("Setup already in progress for %s", entry.unique_id)
         return False
-        
+
     entry._setup_lock = True
-    
+
     try:
-        madVRClient = Madvr(
-            host=entry.data[CONF_HOST],
-            logger=_LOGGER,
-            port=entry.data[CONF_PORT],
-            mac=entry.unique_id,
-            connect_timeout=10,
-            loop=hass.loop,
-        )
-        coordinator = MadVRCoordinator(hass, madVRClient)
+        startup = MadVRStartupTimer(entry.unique_id)
+        with startup.phase("client"):
+            madVRClient, reused = async_get_client_pool(hass).async_acquire(
+                entry.data[CONF_HOST], entry.data[CONF_PORT], entry.unique_id, _LOGGER
+            )
+            coordinator = MadVRCoordinator(hass, madVRClient)
+        coordinator.startup = startup
+        coordinator.macros.load(entry.options.get(CONF_MACROS, {}))
+        coordinator.async_apply_options(entry.options)
+        coordinator.reload_options = {
+            key: entry.options.get(key) for key in RELOAD_OPTIONS
+        }
+
+        if entry.options.get(CONF_TEMPERATURE_STATISTICS):
+            coordinator.statistics.async_enable()
+        with startup.phase("storage"):
+            await coordinator.profiles.async_load()
+            await coordinator.sessions.async_load()
 
         entry.runtime_data = coordinator
+        coordinator.resolver.async_start()
+        entry.async_on_unload(entry.add_update_listener(async_update_options))
 
-        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        with startup.phase("platforms"):
+            await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
         async def handle_unload(event: Event) -> None:
             """Handle unload."""
             await async_handle_unload(coordinator=coordinator)
 
         # listen for core stop event
-        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, handle_unload)
-
-        # Add a small delay before starting connection to avoid overwhelming the system
-        # This helps when multiple integrations are starting simultaneously
-        await hass.async_add_executor_job(lambda: None)
-        
-        # handle loading operations
-        await coordinator.handle_coordinator_load()
+        entry.async_on_unload(
+            hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, handle_unload)
+        )
+
+        if reused:
+            # the client is connected and its tasks are running, only the
+            # new coordinator needs the current state
+            coordinator.handle_push_data(madVRClient.msg_dict)
+            return True
+
+        # connecting never holds up setup, the device shows as off until the
+        # first push; the task is cancelled if the entry unloads first
+        entry.async_create_background_task(
+            hass,
+            coordinator.handle_coordinator_load(),
+            f"{DOMAIN} {entry.unique_id} load",
+        )
         return True
     finally:
         if hasattr(entry, "_setup_lock"):
             delattr(entry, "_setup_lock")
 
 
+async def async_update_options(hass: HomeAssistant, entry: MadVRConfigEntry) -> None:
+    """Apply changed options live, reloading for a new host or options that need it."""
+    coordinator = entry.runtime_data
+    if entry.data[CONF_HOST] != coordinator.client.host:
+        # the device moved, the reload connects a client to the new address
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    reload_options = {key: entry.options.get(key) for key in RELOAD_OPTIONS}
+    if reload_options != coordinator.reload_options:
+        # the client is parked across the reload, it does not reconnect
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    coordinator.async_apply_options(entry.options)
+    _LOGGER.debug("Applied options to the running coordinator")
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: MadVRConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         coordinator: MadVRCoordinator = entry.runtime_data
-        await async_handle_unload(coordinator=coordinator)
+        client = coordinator.client
+        # park the client for a reload to pick up, unless the entry is being
+        # disabled or now points at another address
+        keep_client = entry.disabled_by is None and (
+            entry.data[CONF_HOST],
+            entry.data[CONF_PORT],
+        ) == (client.host, client.port)
+        await async_handle_unload(coordinator=coordinator, keep_client=keep_client)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: MadVRConfigEntry) -> None:
+    """Close the client the unload before the removal parked."""
+    assert entry.unique_id
+    await async_get_client_pool(hass).async_discard(entry.unique_id)
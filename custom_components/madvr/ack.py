@@ -0,0 +1,208 @@
+"""Pipelined command channel that completes sends on the device's ack."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from pymadvr.commands import ACKs, Connections
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_call_later
+
+from .latency import LatencyStats
+
+if TYPE_CHECKING:
+    from .coordinator import MadVRCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# commands sent before waiting for the oldest ack
+DEFAULT_WINDOW = 4
+# seconds a command waits for its ack
+DEFAULT_ACK_TIMEOUT = 2.0
+CONNECT_TIMEOUT = 2.0
+# the device drops connections idle for 60 seconds, close ours before that
+IDLE_TIMEOUT = 30.0
+
+_OK = ACKs.reply.value.strip()
+_ERROR = ACKs.error.value
+
+
+class CommandRejected(Exception):
+    """The device answered a command with ERROR."""
+
+
+class MadVRAckChannel:
+    """Send commands on a dedicated connection and match OK/ERROR replies.
+
+    The device acknowledges commands in order, so replies resolve the oldest
+    outstanding command. Up to window commands are in flight at once.
+    """
+
+    def __init__(
+        self,
+        coordinator: MadVRCoordinator,
+        window: int = DEFAULT_WINDOW,
+        timeout: float = DEFAULT_ACK_TIMEOUT,
+    ) -> None:
+        """Initialize the channel."""
+        self.coordinator = coordinator
+        self.window = window
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(window)
+        self._connect_lock = asyncio.Lock()
+        self._writer: asyncio.StreamWriter | None = None
+        self._reader_task: asyncio.Task[None] | None = None
+        # (sent at, future) in send order
+        self._pending: deque[tuple[float, asyncio.Future[None]]] = deque()
+        self._unsub_idle: CALLBACK_TYPE | None = None
+        self.latency = LatencyStats()
+        # stats
+        self.sent = 0
+        self.acked = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.max_inflight = 0
+
+    async def async_send(self, payload: bytes, timeout: float | None = None) -> float:
+        """Send pre-encoded bytes and return the ack latency in seconds.
+
+        Raises CommandRejected on ERROR, TimeoutError and ConnectionError.
+        """
+        async with self._slots:
+            writer = await self._async_connect()
+            future: asyncio.Future[None] = self.coordinator.hass.loop.create_future()
+            sent_at = time.perf_counter()
+            self._pending.append((sent_at, future))
+            self.max_inflight = max(self.max_inflight, len(self._pending))
+            self.sent += 1
+            try:
+                writer.write(payload)
+                async with asyncio.timeout(
+                    self.timeout if timeout is None else timeout
+                ):
+                    await writer.drain()
+                    await future
+            except TimeoutError:
+                self.timeouts += 1
+                # a late reply would be matched to the wrong command, start over
+                self._async_reset(TimeoutError("Ack timed out"))
+                raise
+            except OSError as err:
+                self._async_reset(err)
+                raise ConnectionError(str(err)) from err
+            latency = time.perf_counter() - sent_at
+            self.latency.add(latency)
+            return latency
+
+    async def _async_connect(self) -> asyncio.StreamWriter:
+        """Return the open connection, opening it if needed."""
+        async with self._connect_lock:
+            if self._writer is None or self._writer.is_closing():
+                client = self.coordinator.client
+                try:
+                    async with asyncio.timeout(CONNECT_TIMEOUT):
+                        reader, writer = await asyncio.open_connection(
+                            client.host, client.port
+                        )
+                        welcome = await reader.readline()
+                except (OSError, TimeoutError) as err:
+                    raise ConnectionError(f"Failed to connect: {err}") from err
+                if Connections.welcome.value not in welcome:
+                    writer.close()
+                    raise ConnectionError("Did not receive welcome message")
+                self._writer = writer
+                self._reader_task = self.coordinator.hass.async_create_background_task(
+                    self._async_read(reader), "madvr ack reader"
+                )
+                self.connects += 1
+            self._async_schedule_idle_close()
+            return self._writer
+
+    async def _async_read(self, reader: asyncio.StreamReader) -> None:
+        """Resolve outstanding commands from the replies, in order."""
+        try:
+            while line := await reader.readline():
+                line = line.strip()
+                if line == _OK:
+                    error: Exception | None = None
+                elif line.startswith(_ERROR):
+                    error = CommandRejected(line.decode(errors="ignore"))
+                else:
+                    # notifications and data lines of Get commands
+                    continue
+                if not self._pending:
+                    continue
+                _, future = self._pending.popleft()
+                if future.done():
+                    continue
+                if error is None:
+                    self.acked += 1
+                    future.set_result(None)
+                else:
+                    self.rejected += 1
+                    future.set_exception(error)
+        except OSError as err:
+            _LOGGER.debug("Ack connection failed: %s", err)
+        self._async_reset(ConnectionError("Connection closed"), from_reader=True)
+
+    @callback
+    def _async_schedule_idle_close(self) -> None:
+        """Close the connection once nothing has been sent for a while."""
+        if self._unsub_idle is not None:
+            self._unsub_idle()
+        self._unsub_idle = async_call_later(
+            self.coordinator.hass, IDLE_TIMEOUT, self._async_idle_close
+        )
+
+    @callback
+    def _async_idle_close(self, _: Any) -> None:
+        """Close an idle connection."""
+        self._unsub_idle = None
+        if not self._pending:
+            self._async_reset(ConnectionError("Connection closed"))
+
+    @callback
+    def _async_reset(self, error: Exception, from_reader: bool = False) -> None:
+        """Close the connection and fail everything still outstanding."""
+        while self._pending:
+            _, future = self._pending.popleft()
+            if not future.done():
+                future.set_exception(error)
+                # retrieved by the sender, or nobody is waiting anymore
+                future.exception()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._reader_task is not None and not from_reader:
+            self._reader_task.cancel()
+        self._reader_task = None
+
+    @callback
+    def async_close(self) -> None:
+        """Close the channel."""
+        if self._unsub_idle is not None:
+            self._unsub_idle()
+            self._unsub_idle = None
+        self._async_reset(ConnectionError("Channel closed"))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return channel stats for diagnostics."""
+        return {
+            "window": self.window,
+            "timeout": self.timeout,
+            "connected": self._writer is not None,
+            "inflight": len(self._pending),
+            "max_inflight": self.max_inflight,
+            "sent": self.sent,
+            "acked": self.acked,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "latency_ms": self.latency.as_dict(),
+        }
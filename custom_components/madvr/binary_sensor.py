@@ -13,6 +13,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import MadVRConfigEntry
+from .const import FRAME_RATE_MISMATCH, MASKING_DIFFERS, TONE_MAPPING, UPSCALING
 from .coordinator import MadVRCoordinator
 from .entity import MadVREntity
 
@@ -27,36 +28,70 @@ _STANDBY_STATE = "standby_state"
 class MadvrBinarySensorEntityDescription(BinarySensorEntityDescription):
     """Describe madVR binary sensor entity."""
 
-    value_fn: Callable[[MadVRCoordinator], bool]
+    data_key: str
+    value_fn: Callable[[MadVRCoordinator], bool | None]
 
 
 BINARY_SENSORS: tuple[MadvrBinarySensorEntityDescription, ...] = (
     MadvrBinarySensorEntityDescription(
         key=_POWER_STATE,
         translation_key=_POWER_STATE,
+        data_key="is_on",
         value_fn=lambda coordinator: coordinator.data.get("is_on", False),
     ),
     MadvrBinarySensorEntityDescription(
         key=_SIGNAL_STATE,
         translation_key=_SIGNAL_STATE,
+        data_key="is_signal",
         value_fn=lambda coordinator: coordinator.data.get("is_signal", False),
     ),
     MadvrBinarySensorEntityDescription(
         key=_HDR_FLAG,
         translation_key=_HDR_FLAG,
+        data_key="hdr_flag",
         value_fn=lambda coordinator: coordinator.data.get("hdr_flag", False),
     ),
     MadvrBinarySensorEntityDescription(
         key=_OUTGOING_HDR_FLAG,
         translation_key=_OUTGOING_HDR_FLAG,
+        data_key="outgoing_hdr_flag",
         value_fn=lambda coordinator: coordinator.data.get("outgoing_hdr_flag", False),
     ),
     MadvrBinarySensorEntityDescription(
         key=_STANDBY_STATE,
         translation_key=_STANDBY_STATE,
+        data_key="standby",
         value_fn=lambda coordinator: coordinator.data.get("standby", False),
         entity_registry_enabled_default=False,
     ),
+    MadvrBinarySensorEntityDescription(
+        key=UPSCALING,
+        translation_key=UPSCALING,
+        data_key=UPSCALING,
+        value_fn=lambda coordinator: coordinator.derived.values[UPSCALING],
+        entity_registry_enabled_default=False,
+    ),
+    MadvrBinarySensorEntityDescription(
+        key=FRAME_RATE_MISMATCH,
+        translation_key=FRAME_RATE_MISMATCH,
+        data_key=FRAME_RATE_MISMATCH,
+        value_fn=lambda coordinator: coordinator.derived.values[FRAME_RATE_MISMATCH],
+        entity_registry_enabled_default=False,
+    ),
+    MadvrBinarySensorEntityDescription(
+        key=TONE_MAPPING,
+        translation_key=TONE_MAPPING,
+        data_key=TONE_MAPPING,
+        value_fn=lambda coordinator: coordinator.derived.values[TONE_MAPPING],
+        entity_registry_enabled_default=False,
+    ),
+    MadvrBinarySensorEntityDescription(
+        key=MASKING_DIFFERS,
+        translation_key=MASKING_DIFFERS,
+        data_key=MASKING_DIFFERS,
+        value_fn=lambda coordinator: coordinator.derived.values[MASKING_DIFFERS],
+        entity_registry_enabled_default=False,
+    ),
 )
 
 
@@ -86,8 +121,9 @@ class MadvrBinarySensor(MadVREntity, BinarySensorEntity):
         super().__init__(coordinator)
         self.entity_description = description
         self._attr_unique_id = f"{coordinator.mac}_{description.key}"
+        self._priority_key = description.data_key
 
     @property
-    def is_on(self) -> bool:
+    def is_on(self) -> bool | None:
         """Return true if the binary sensor is on."""
         return self.entity_description.value_fn(self.coordinator)
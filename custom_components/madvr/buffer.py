@@ -0,0 +1,157 @@
+"""Buffer for commands issued while the madVR is disconnected."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+
+from .commands import encode_command, split_command
+from .const import DEFAULT_BUFFER_SIZE
+
+if TYPE_CHECKING:
+    from .coordinator import MadVRCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# seconds a buffered command stays valid
+DEFAULT_TTL = 30.0
+# a profile change still matters after a reboot
+PROFILE_TTL = 120.0
+# menu navigation only makes sense right away
+NAVIGATION_TTL = 5.0
+
+PROFILE_COMMANDS = frozenset({"ActivateProfile"})
+NAVIGATION_COMMANDS = frozenset({"KeyPress", "KeyHold", "OpenMenu", "CloseMenu"})
+
+
+@dataclass(slots=True)
+class BufferedCommand:
+    """A command waiting for the connection."""
+
+    name: str
+    # replaces an older buffered command with the same key
+    key: tuple[str, ...]
+    payload: bytes
+    expires: float
+
+
+class MadVRCommandBuffer:
+    """Hold commands while disconnected and flush them in one batch on reconnect.
+
+    Only the latest profile selection per profile group is kept, identical
+    commands are kept once and navigation keys expire after a few seconds.
+    """
+
+    def __init__(self, coordinator: MadVRCoordinator) -> None:
+        """Initialize the buffer."""
+        self.coordinator = coordinator
+        self._commands: deque[BufferedCommand] = deque()
+        self._flush_task: asyncio.Task[None] | None = None
+        # commands kept, the oldest is dropped beyond this
+        self.max_size = DEFAULT_BUFFER_SIZE
+        # stats
+        self.buffered = 0
+        self.replaced = 0
+        self.expired = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.failed = 0
+
+    def __len__(self) -> int:
+        """Return the number of buffered commands."""
+        return len(self._commands)
+
+    @callback
+    def async_add(self, command: Sequence[str]) -> None:
+        """Buffer a command. Raises ValueError for unknown commands."""
+        payload = encode_command(command)
+        name, values = split_command(command)
+        if name in PROFILE_COMMANDS:
+            # ActivateProfile SOURCE 2 replaces any pending SOURCE selection
+            key, ttl = (name, *values[:1]), PROFILE_TTL
+        elif name in NAVIGATION_COMMANDS:
+            # navigation is a sequence, never merge key presses
+            key, ttl = (name, str(self.buffered)), NAVIGATION_TTL
+        else:
+            key, ttl = (name, *values), DEFAULT_TTL
+
+        for buffered in self._commands:
+            if buffered.key == key:
+                self._commands.remove(buffered)
+                self.replaced += 1
+                break
+        # the size can shrink at runtime, drop down to one free slot
+        while self._commands and len(self._commands) >= self.max_size:
+            self._commands.popleft()
+            self.dropped += 1
+        self._commands.append(
+            BufferedCommand(
+                name=name,
+                key=key,
+                payload=payload,
+                expires=self.coordinator.hass.loop.time() + ttl,
+            )
+        )
+        self.buffered += 1
+        _LOGGER.debug("Buffered %s until the device reconnects", command)
+
+    @callback
+    def async_flush(self) -> None:
+        """Send the buffered commands if there are any and none are in flight."""
+        if not self._commands or (
+            self._flush_task is not None and not self._flush_task.done()
+        ):
+            return
+        now = self.coordinator.hass.loop.time()
+        commands = [command for command in self._commands if command.expires > now]
+        self.expired += len(self._commands) - len(commands)
+        self._commands.clear()
+        if commands:
+            self._flush_task = self.coordinator.hass.async_create_background_task(
+                self._async_send(commands), f"madvr flush {self.coordinator.mac}"
+            )
+
+    async def _async_send(self, commands: list[BufferedCommand]) -> None:
+        """Send a batch pipelined through the ack channel."""
+        acks = self.coordinator.acks
+        results = await asyncio.gather(
+            *(acks.async_send(command.payload) for command in commands),
+            return_exceptions=True,
+        )
+        for command, result in zip(commands, results, strict=True):
+            if isinstance(result, Exception):
+                self.failed += 1
+                _LOGGER.warning(
+                    "Failed to send buffered %s: %s",
+                    command.payload.strip(),
+                    str(result) or type(result).__name__,
+                )
+            else:
+                self.flushed += 1
+        _LOGGER.debug("Flushed %s buffered commands", len(commands))
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop buffered commands and stop a running flush."""
+        self._commands.clear()
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return buffer stats for diagnostics."""
+        return {
+            "pending": [command.name for command in self._commands],
+            "buffered": self.buffered,
+            "replaced": self.replaced,
+            "expired": self.expired,
+            "dropped": self.dropped,
+            "flushed": self.flushed,
+            "failed": self.failed,
+        }
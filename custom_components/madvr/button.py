@@ -1,3 +1,44 @@
+"""Button entities for the madVR integration."""
+
+from __future__ import annotations
+
+from homeassistant.components.button import ButtonEntity
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from . import MadVRConfigEntry
+from .coordinator import MadVRCoordinator
+from .entity import MadVREntity
+from .macros import macro_slug
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: MadVRConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up a button for each macro."""
+    coordinator = entry.runtime_data
+    async_add_entities(
+        MadvrMacroButton(coordinator, name) for name in coordinator.macros.macros
+    )
+
+
+class MadvrMacroButton(MadVREntity, ButtonEntity):
+    """Button running a macro."""
+
+    def __init__(self, coordinator: MadVRCoordinator, macro: str) -> None:
+        """Initialize the button."""
+        super().__init__(coordinator)
+        self.macro = macro
+        self._attr_name = macro
+        self._attr_unique_id = f"{coordinator.mac}_macro_{macro_slug(macro)}"
+
+    async def async_press(self) -> None:
+        """Run the macro."""
+        await self.coordinator.macros.async_run(self.macro)
+
+
 # """Binary sensor entities for the madVR integration."""
 
 # from __future__ import annotations
@@ -0,0 +1,128 @@
+"""madVR clients shared across config entry reloads."""
+
+from __future__ import annotations
+
+from functools import partial
+import logging
+from typing import Any
+
+from pymadvr.madvr import Madvr
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_CLIENTS: HassKey[MadVRClientPool] = HassKey(f"{DOMAIN}_clients")
+
+# seconds a released client stays connected, waiting for a reload to take it
+CLIENT_GRACE_PERIOD = 60
+
+type ClientKey = tuple[str, int, str]
+
+
+async def async_close_client(client: Madvr) -> None:
+    """Stop the client's tasks and close its connections."""
+    client.stop()
+    await client.async_cancel_tasks()
+    _LOGGER.debug("Integration closing connection")
+    await client.close_connection()
+
+
+@callback
+def async_get_client_pool(hass: HomeAssistant) -> MadVRClientPool:
+    """Return the client pool, creating it on first use."""
+    if (pool := hass.data.get(DATA_CLIENTS)) is None:
+        pool = hass.data[DATA_CLIENTS] = MadVRClientPool(hass)
+    return pool
+
+
+class MadVRClientPool:
+    """Keep released clients connected for a grace period, keyed by host/port/MAC.
+
+    A reload of an unchanged device picks up the live client instead of opening
+    new connections, so entities stay available through the reload.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the pool."""
+        self.hass = hass
+        self._parked: dict[ClientKey, tuple[Madvr, CALLBACK_TYPE]] = {}
+        self.created = 0
+        self.reused = 0
+        self.expired = 0
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_stop)
+
+    @callback
+    def async_acquire(
+        self, host: str, port: int, mac: str, logger: logging.Logger
+    ) -> tuple[Madvr, bool]:
+        """Return a client for the device and whether its tasks are already running."""
+        if (parked := self._parked.pop((host, port, mac), None)) is not None:
+            client, cancel_expire = parked
+            cancel_expire()
+            self.reused += 1
+            _LOGGER.debug("Reusing connected client for %s", mac)
+            # released before its tasks started, it has to be loaded again
+            return client, client._tasks_running()
+        self.created += 1
+        client = Madvr(
+            host=host,
+            logger=logger,
+            port=port,
+            mac=mac,
+            connect_timeout=10,
+            loop=self.hass.loop,
+        )
+        return client, False
+
+    @callback
+    def async_release(self, client: Madvr) -> None:
+        """Park a client that is no longer bound to an entry."""
+        key = (client.host, client.port, client.mac)
+        if (previous := self._parked.pop(key, None)) is not None:
+            previous[1]()
+            self.hass.async_create_task(async_close_client(previous[0]))
+        client.set_update_callback(None)
+        cancel_expire = async_call_later(
+            self.hass,
+            CLIENT_GRACE_PERIOD,
+            HassJob(partial(self._async_expire, key), cancel_on_shutdown=True),
+        )
+        self._parked[key] = (client, cancel_expire)
+
+    async def async_discard(self, mac: str) -> None:
+        """Close the parked clients of a device that is going away."""
+        for key in [key for key in self._parked if key[2] == mac]:
+            client, cancel_expire = self._parked.pop(key)
+            cancel_expire()
+            _LOGGER.debug("Closing parked client for removed %s", mac)
+            await async_close_client(client)
+
+    async def _async_expire(self, key: ClientKey, _: Any) -> None:
+        """Close a client no entry picked up."""
+        if (parked := self._parked.pop(key, None)) is None:
+            return
+        self.expired += 1
+        _LOGGER.debug("Closing unused client for %s", key[2])
+        await async_close_client(parked[0])
+
+    async def _async_stop(self, event: Event) -> None:
+        """Close all parked clients."""
+        parked, self._parked = self._parked, {}
+        for client, cancel_expire in parked.values():
+            cancel_expire()
+            await async_close_client(client)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return pool stats for diagnostics."""
+        return {
+            "parked": len(self._parked),
+            "created": self.created,
+            "reused": self.reused,
+            "expired": self.expired,
+        }
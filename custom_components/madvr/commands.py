@@ -0,0 +1,61 @@
+"""Encode madVR commands to wire bytes once, ahead of sending them."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from enum import Enum
+
+from pymadvr.commands import Commands, Footer, SingleCmd
+
+# commands whose string parameters are sent quoted
+QUOTED_COMMANDS = frozenset({"DisplayMessage", "DisplayAudioVolume"})
+
+# command name -> (command bytes, parameter enum)
+COMMANDS: dict[str, tuple[bytes, type[Enum]]] = {
+    command.value[0].decode(): (command.value[0], command.value[1])
+    for command in Commands
+} | {
+    # part of the device protocol but not of the library's enum
+    "EnumProfileGroups": (b"EnumProfileGroups", SingleCmd),
+    "EnumProfiles": (b"EnumProfiles", SingleCmd),
+}
+
+
+def split_command(command: str | Sequence[str]) -> tuple[str, list[str]]:
+    """Split "KeyPress, MENU" or ["KeyPress", "MENU"] into name and values."""
+    if isinstance(command, str):
+        command = [command]
+    if len(command) == 1 and "," in command[0]:
+        name, *values = (part.strip() for part in command[0].split(","))
+        return name, values
+    if not command:
+        raise ValueError("Empty command")
+    return command[0].strip(), [value.strip() for value in command[1:]]
+
+
+def encode_command(command: str | Sequence[str]) -> bytes:
+    """Return the bytes pymadvr would send for a command.
+
+    Mirrors Madvr._construct_command but uses a lookup instead of scanning the
+    enum, and raises ValueError so callers can validate user input up front.
+    """
+    name, values = split_command(command)
+    if (known := COMMANDS.get(name)) is None:
+        raise ValueError(f"Unknown command: {name}")
+    payload, parameters = known
+    for value in values:
+        if value.isnumeric():
+            payload += b" " + value.encode()
+        elif (member := parameters.__members__.get(value)) is not None:
+            payload += b" " + (
+                member.value
+                if isinstance(member.value, bytes)
+                else str(member.value).encode()
+            )
+        else:
+            if name in QUOTED_COMMANDS and not (
+                value.startswith('"') and value.endswith('"')
+            ):
+                value = f'"{value}"'
+            payload += b" " + value.encode()
+    return payload + Footer.footer.value
@@ -5,6 +5,44 @@ DOMAIN = "madvr"
 DEFAULT_NAME = "envy"
 DEFAULT_PORT = 44077
 
+# Options
+CONF_MACROS = "macros"
+CONF_PRIORITY_KEYS = "priority_keys"
+CONF_TEMPERATURE_STATISTICS = "temperature_statistics"
+CONF_UPDATE_WINDOW = "update_window"
+CONF_TEMPERATURE_DEADBAND = "temperature_deadband"
+CONF_BUFFER_SIZE = "buffer_size"
+
+# Options applied to the running coordinator, the others reload the entry
+# because they change which entities exist or how they are recorded
+LIVE_OPTIONS = (
+    CONF_PRIORITY_KEYS,
+    CONF_UPDATE_WINDOW,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_BUFFER_SIZE,
+)
+RELOAD_OPTIONS = (CONF_MACROS, CONF_TEMPERATURE_STATISTICS)
+
+# Option defaults
+DEFAULT_UPDATE_WINDOW = 0
+DEFAULT_TEMPERATURE_DEADBAND = 1.0
+DEFAULT_BUFFER_SIZE = 20
+
+# Service attributes
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_QUERY = "query"
+ATTR_MAX_AGE = "max_age"
+ATTR_MAX_SIZE = "max_size"
+ATTR_SINCE = "since"
+ATTR_HDR = "hdr"
+ATTR_LIMIT = "limit"
+ATTR_MACRO = "macro"
+ATTR_COMMAND = "command"
+ATTR_TIMEOUT = "timeout"
+ATTR_MESSAGE = "message"
+ATTR_DURATION = "duration"
+ATTR_TAG = "tag"
+
 # Sensor keys
 TEMP_GPU = "temp_gpu"
 TEMP_HDMI = "temp_hdmi"
@@ -32,3 +70,23 @@ ASPECT_NAME = "aspect_name"
 MASKING_RES = "masking_res"
 MASKING_DEC = "masking_dec"
 MASKING_INT = "masking_int"
+LAST_SESSION = "last_session"
+
+# Derived keys, computed from the data keys above
+UPSCALING = "upscaling"
+SCALING_FACTOR = "scaling_factor"
+FRAME_RATE_MISMATCH = "frame_rate_mismatch"
+TONE_MAPPING = "tone_mapping"
+MASKING_DIFFERS = "masking_differs"
+
+# Keys dispatched ahead of the update throttle, masking and lens memory
+# automations react to these
+DEFAULT_PRIORITY_KEYS = [
+    ASPECT_RES,
+    ASPECT_DEC,
+    ASPECT_INT,
+    ASPECT_NAME,
+    MASKING_RES,
+    MASKING_DEC,
+    MASKING_INT,
+]
@@ -3,22 +3,52 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import timedelta
+from collections.abc import Callable, Mapping
 import logging
+import time
 from typing import TYPE_CHECKING, Any
 
 from pymadvr.madvr import Madvr
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from homeassistant.util import Throttle
 
-from .const import DOMAIN
+from .ack import MadVRAckChannel
+from .buffer import MadVRCommandBuffer
+from .const import (
+    CONF_BUFFER_SIZE,
+    CONF_PRIORITY_KEYS,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_UPDATE_WINDOW,
+    DEFAULT_BUFFER_SIZE,
+    DEFAULT_PRIORITY_KEYS,
+    DEFAULT_TEMPERATURE_DEADBAND,
+    DEFAULT_UPDATE_WINDOW,
+    DOMAIN,
+)
+from .derived import MadVRDerivedValues
+from .governor import async_get_governor
+from .latency import LatencyStats
+from .macros import MadVRMacros
+from .metrics import MadVRMetrics
+from .osd import MadVRMessageQueue
+from .profiler import MadVRProfiler
+from .profiles import PROFILE_KEYS, MadVRProfileIndex
+from .query import MadVRQueryCache
+from .resolver import MadVRHostResolver
+from .scheduler import ACTIVITY_KEYS, MadVRTaskScheduler
+from .sessions import MadVRSessionTracker
+from .startup import MadVRStartupTimer
+from .statistics import TEMPERATURE_KEYS, MadVRTemperatureStatistics
+from .tracing import MadVRTracer, now_us
+from .triggers import async_get_trigger_index
+from .validation import MadVRPushValidator
 
 _LOGGER = logging.getLogger(__name__)
 
-# Minimum time between updates
-MIN_TIME_BETWEEN_UPDATES = timedelta(seconds=0.1)
+# Set by the client on every push
+LAST_UPDATE_KEY = "_last_update"
 
 if TYPE_CHECKING:
     from . import MadVRConfigEntry
@@ -39,78 +69,366 @@ class MadVRCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         assert self.config_entry.unique_id
         self.mac = self.config_entry.unique_id
         self.client = client
-        # this does not use poll/refresh, so we need to set this to not None on init
-        self.data = {}
+        # this does not use poll/refresh, so we need to set this to not None on init;
+        # an Envy that is off at boot pushes nothing, so it starts out off
+        self.data = {"is_on": False}
+        # copy of the last committed data, the client reuses one dict for every push
+        self._snapshot: dict[str, Any] = {}
+        # keys changed by the last commit
+        self.last_delta: dict[str, Any] = {}
+        self._delta_listeners: dict[
+            CALLBACK_TYPE, Callable[[dict[str, Any]], None]
+        ] = {}
         # Rate limiting
         self._last_update_time = 0
+        # hot path counters
+        self.push_count = 0
+        self.commit_count = 0
+        self.throttle_count = 0
         self._pending_update = None
+        # when the oldest push still waiting to be committed arrived
+        self._pending_since = 0.0
         self._update_lock = asyncio.Lock()
+        # single task draining _pending_update, bursts reuse it instead of piling up
+        self._process_task: asyncio.Task[None] | None = None
+        # keys dispatched on the first push, ahead of the throttle and the full
+        # entity fan-out; entities of these keys listen on priority_signal
+        self.priority_keys: frozenset[str] = frozenset(DEFAULT_PRIORITY_KEYS)
+        # floor for the governor's publish window, from the entry options
+        self.update_window = DEFAULT_UPDATE_WINDOW / 1000
+        # options that were applied by reloading, compared on option updates
+        self.reload_options: dict[str, Any] = {}
+        self.priority_signal = f"{DOMAIN}_{self.mac}_priority"
+        self._priority_values: dict[str, Any] = {}
+        # push to entity update, for the priority lane and the throttled commit
+        self.priority_latency = LatencyStats()
+        self.commit_latency = LatencyStats()
+        # per-key checks of the keys each commit changes
+        self.validator = MadVRPushValidator()
+        # facts derived from the snapshot, for the derived entities
+        self.derived = MadVRDerivedValues(self)
+        # on-demand Get* queries
+        self.queries = MadVRQueryCache(self)
+        # viewing sessions derived from the push stream
+        self.sessions = MadVRSessionTracker(self)
+        # prometheus sample lines
+        self.metrics = MadVRMetrics(self)
+        # commands awaiting the device's ack
+        self.acks = MadVRAckChannel(self)
+        # suspends the client's polling tasks while the device is idle
+        self.scheduler = MadVRTaskScheduler(self)
+        # commands issued while disconnected, sent on reconnect
+        self.buffer = MadVRCommandBuffer(self)
+        # profile groups for the select entities, loaded at setup
+        self.profiles = MadVRProfileIndex(self)
+        # hourly temperature statistics, enabled from the entry options
+        self.statistics = MadVRTemperatureStatistics(self)
+        # on-screen messages, paced so bursts do not flood the device
+        self.messages = MadVRMessageQueue(self)
+        # compiled macros, loaded from the entry options
+        self.macros = MadVRMacros(self)
+        # finds the device by its MAC after a DHCP address change
+        self.resolver = MadVRHostResolver(self)
+        # device triggers, kept in hass.data so they survive reloads
+        self.triggers = async_get_trigger_index(hass)
+        # integration wide write budget, sets the window between commits
+        self.governor = async_get_governor(hass)
+        self._unsub_governor = self.governor.async_register(self)
+        # hot path profiling, only wraps callbacks while running
+        self.profiler: MadVRProfiler | None = None
+        self.profile_summary: dict[str, Any] | None = None
+        # per-push span tracing, checked on the hot path only as `is not None`
+        self.tracer: MadVRTracer | None = None
+        self._trace_queued_at = 0
+        # setup phase timings, set by async_setup_entry
+        self.startup: MadVRStartupTimer | None = None
         # this passes a callback to the client to push new data to the coordinator
         self.client.set_update_callback(self.handle_push_data)
         _LOGGER.debug("MadVRCoordinator initialized with mac: %s", self.mac)
 
     def handle_push_data(self, data: dict[str, Any]) -> None:
         """Handle new data pushed from the API with rate limiting."""
-        # Safety check: reject extremely large data payloads
-        try:
-            import sys
-
-            data_size = sys.getsizeof(data)
-            if data_size > 1_000_000:  # 1MB limit
-                _LOGGER.warning("Rejecting oversized data payload: %d bytes", data_size)
-                return
-        except Exception:
-            pass  # Continue if size check fails
-
+        tracer = self.tracer
+        received = now_us() if tracer is not None else 0
         # Store the pending update and schedule processing
+        self.push_count += 1
+        if self._pending_update is None:
+            self._pending_since = time.perf_counter()
+        if tracer is not None:
+            tracer.push_id += 1
+            if self._pending_update is None:
+                self._trace_queued_at = received
+            tracer.span("received", received, push=tracer.push_id, keys=len(data))
         self._pending_update = data
         # Use Home Assistant's event loop to schedule the update
-        self.hass.loop.call_soon_threadsafe(
-            lambda: self.hass.create_task(self._process_update())
-        )
+        self.hass.loop.call_soon_threadsafe(self._schedule_process_update)
+
+    @callback
+    def _schedule_process_update(self) -> None:
+        """Start processing unless a queued run will pick up the pending data."""
+        if (data := self._pending_update) is None:
+            return
+        if (startup := self.startup) is not None and not startup.done:
+            startup.mark("first_push")
+            if data.get("mac_address"):
+                startup.mark("first_mac")
+        if self.priority_keys:
+            self._async_dispatch_priority(data)
+        # a running task has not read _pending_update yet, there is no await
+        # between reading it and committing
+        if self._process_task is None or self._process_task.done():
+            self._process_task = self.hass.async_create_task(
+                self._process_update(), f"{DOMAIN} {self.mac} process update"
+            )
 
     async def _process_update(self) -> None:
         """Process pending updates with rate limiting."""
         async with self._update_lock:
             if self._pending_update is None:
                 return
+            if (tracer := self.tracer) is not None:
+                tracer.span("queued", self._trace_queued_at, push=tracer.push_id)
 
             # Check rate limit
             current_time = self.hass.loop.time()
             time_since_last = current_time - self._last_update_time
 
-            if time_since_last < MIN_TIME_BETWEEN_UPDATES.total_seconds():
+            # the governor's share for this device, adapted to loop lag
+            window = max(self.governor.window, self.update_window)
+            if time_since_last < window:
                 # Schedule update for later
-                await asyncio.sleep(
-                    MIN_TIME_BETWEEN_UPDATES.total_seconds() - time_since_last
-                )
+                self.throttle_count += 1
+                throttled = now_us() if tracer is not None else 0
+                await asyncio.sleep(window - time_since_last)
+                if tracer is not None:
+                    tracer.span("throttle", throttled, push=tracer.push_id)
 
             # Process the update
             if self._pending_update is not None:
                 data = self._pending_update
                 self._pending_update = None
                 self._last_update_time = self.hass.loop.time()
+                pending_since = self._pending_since
 
                 # Always update - remove the data comparison that's blocking updates
                 # The sensor-level filtering will handle duplicate prevention
-                self.async_set_updated_data(data)
+                if tracer is None:
+                    self._async_commit(data)
+                else:
+                    committed = now_us()
+                    self._async_commit(data)
+                    tracer.span("commit", committed, push=tracer.push_id)
+                self.commit_latency.add(time.perf_counter() - pending_since)
+
+    @callback
+    def _async_dispatch_priority(self, data: dict[str, Any]) -> None:
+        """Update the entities of priority keys that changed, skipping the throttle."""
+        values = self._priority_values
+        delta = {
+            key: value
+            for key in self.priority_keys
+            if (value := data.get(key)) != values.get(key)
+            and self.validator.check(key, value)
+        }
+        if not delta:
+            return
+        values.update(delta)
+        tracer = self.tracer
+        start = now_us() if tracer is not None else 0
+        # entities read coordinator.data; a copy of the last commit with only
+        # the checked priority values, the client keeps changing its own dict
+        self.data = {**self._snapshot, **delta}
+        async_dispatcher_send(self.hass, self.priority_signal, delta)
+        self.priority_latency.add(time.perf_counter() - self._pending_since)
+        if tracer is not None:
+            tracer.span("priority", start, push=tracer.push_id, keys=len(delta))
+
+    @callback
+    def async_apply_options(self, options: Mapping[str, Any]) -> None:
+        """Apply the options that do not need a reload to the running pipeline."""
+        priority_keys = frozenset(
+            options.get(CONF_PRIORITY_KEYS, DEFAULT_PRIORITY_KEYS)
+        )
+        if priority_keys != self.priority_keys:
+            self.priority_keys = priority_keys
+            # values of removed keys must not suppress a later dispatch
+            self._priority_values = {}
+        self.update_window = (
+            options.get(CONF_UPDATE_WINDOW, DEFAULT_UPDATE_WINDOW) / 1000
+        )
+        self.statistics.deadband = options.get(
+            CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND
+        )
+        self.buffer.max_size = int(options.get(CONF_BUFFER_SIZE, DEFAULT_BUFFER_SIZE))
+
+    @callback
+    def _async_commit(self, data: dict[str, Any]) -> None:
+        """Update state derived from the snapshot, then notify listeners."""
+        self.commit_count += 1
+        self.last_delta = delta = self._diff(data)
+        # the checked copy, the client keeps changing its own dict
+        data = self._snapshot
+        self.sessions.update(data)
+        if delta:
+            self.derived.async_update(data, delta)
+        self.async_set_updated_data(data)
+        if self.buffer and self.client.connected:
+            self.buffer.async_flush()
+        if not ACTIVITY_KEYS.isdisjoint(delta):
+            self.scheduler.async_update(data)
+        if not PROFILE_KEYS.isdisjoint(delta):
+            self.profiles.async_update(data)
+        if self.statistics.enabled and not TEMPERATURE_KEYS.keys().isdisjoint(delta):
+            self.statistics.async_update(data)
+        if delta:
+            self.metrics.async_update(delta)
+            # the first commit is the state at setup, not a change
+            if self.commit_count > 1:
+                self.triggers.async_fire(self.mac, delta)
+            for delta_listener in list(self._delta_listeners.values()):
+                delta_listener(delta)
+
+    def _diff(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Return the keys that changed since the last commit, removed keys as None.
+
+        A malformed new value is left out of the delta and the key keeps its
+        last valid value in the snapshot.
+        """
+        previous = self._snapshot
+        delta = {
+            key: value
+            for key, value in data.items()
+            if key not in previous or previous[key] != value
+        }
+        for key in previous.keys() - data.keys():
+            delta[key] = None
+        # the library stamps every push, it is not device state
+        delta.pop(LAST_UPDATE_KEY, None)
+        snapshot = dict(data)
+        for key in self.validator.invalid_keys(delta):
+            del delta[key]
+            if key in previous:
+                snapshot[key] = previous[key]
+            else:
+                del snapshot[key]
+        self._snapshot = snapshot
+        return delta
+
+    @callback
+    def async_add_delta_listener(
+        self, delta_listener: Callable[[dict[str, Any]], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for the keys changed by each commit."""
+
+        @callback
+        def remove_delta_listener() -> None:
+            self._delta_listeners.pop(remove_delta_listener, None)
+
+        self._delta_listeners[remove_delta_listener] = delta_listener
+        return remove_delta_listener
+
+    @property
+    def snapshot(self) -> dict[str, Any]:
+        """Return a copy of the last committed data."""
+        snapshot = dict(self._snapshot)
+        snapshot.pop(LAST_UPDATE_KEY, None)
+        return snapshot
 
     async def handle_coordinator_load(self) -> None:
         """Handle operations on integration load."""
         _LOGGER.debug("Using loop: %s", self.client.loop)
+        if self.startup is None:
+            self.startup = MadVRStartupTimer(self.mac)
+        # connecting happens later, in the client's heartbeat task
+        self.startup.watch_connect(self.client)
         try:
-            # tell the library to start background tasks
-            await self.client.async_add_tasks()
+            with self.startup.phase("tasks"):
+                # tell the library to start background tasks
+                await self.client.async_add_tasks()
         except Exception as e:
             _LOGGER.error("Failed to start background tasks: %s", e)
             # Clean up on failure
             self.cleanup()
             raise
 
+    def async_start_profiling(self) -> None:
+        """Start profiling the push hot path."""
+        profiler = MadVRProfiler(self)
+        profiler.start()
+        self.profiler = profiler
+
+    async def async_stop_profiling(self) -> dict[str, Any]:
+        """Stop profiling and write the profile to the config directory."""
+        assert self.profiler is not None
+        profiler, self.profiler = self.profiler, None
+        profiler.restore()
+        self.profile_summary = await self.hass.async_add_executor_job(
+            profiler.write, self.hass.config.path()
+        )
+        _LOGGER.info("Wrote madVR profile to %s", self.profile_summary["filename"])
+        return self.profile_summary
+
+    def async_start_tracing(self, max_bytes: int) -> str:
+        """Start tracing pushes into the config directory."""
+        path = self.hass.config.path(f"madvr_trace_{self.mac.replace(':', '')}.json")
+        self.tracer = MadVRTracer(self.hass, self.mac, path, max_bytes)
+        return path
+
+    async def async_stop_tracing(self) -> dict[str, Any]:
+        """Stop tracing and flush the remaining spans."""
+        assert self.tracer is not None
+        tracer, self.tracer = self.tracer, None
+        await tracer.async_stop()
+        return tracer.as_dict()
+
     def cleanup(self) -> None:
         """Clean up resources to prevent memory leaks."""
         # Clear pending updates
         self._pending_update = None
+        if self._process_task is not None:
+            self._process_task.cancel()
+            self._process_task = None
+        self.queries.cancel()
+        self.buffer.async_cancel()
+        self.messages.async_cancel()
+        self.scheduler.async_cancel()
+        self.profiles.async_cancel()
+        self.statistics.async_cancel()
+        self.resolver.async_cancel()
+        # the resolver's connect wrapper and the startup timer's on top of it
+        vars(self.client).pop("_establish_notification_connection", None)
+        self._unsub_governor()
+        self.acks.async_close()
+        self._delta_listeners.clear()
+        if self.profiler is not None:
+            self.profiler.restore()
+            self.profiler = None
         # Clear the update callback to break circular references
         if hasattr(self.client, "set_update_callback"):
             self.client.set_update_callback(None)
+
+    def latency(self) -> dict[str, Any]:
+        """Return push to entity update latency of both lanes."""
+        return {
+            "priority_keys": sorted(self.priority_keys),
+            "priority_ms": self.priority_latency.as_dict(),
+            "commit_ms": self.commit_latency.as_dict(),
+        }
+
+    def counters(self) -> dict[str, int]:
+        """Return the hot path counters."""
+        return {
+            "pushes": self.push_count,
+            "commits": self.commit_count,
+            "throttled": self.throttle_count,
+        }
+
+    def resources(self) -> dict[str, Any]:
+        """Return the resources held by the coordinator, used to spot leaks."""
+        return {
+            "process_task_pending": self._process_task is not None
+            and not self._process_task.done(),
+            "update_callback_set": getattr(self.client, "update_callback", None)
+            is not None,
+            "listeners": len(self._listeners),
+        }
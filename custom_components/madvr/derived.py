@@ -0,0 +1,119 @@
+"""Video pipeline facts derived from the coordinator snapshot."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+
+from .const import (
+    ASPECT_DEC,
+    FRAME_RATE_MISMATCH,
+    INCOMING_FRAME_RATE,
+    INCOMING_RES,
+    MASKING_DEC,
+    MASKING_DIFFERS,
+    OUTGOING_FRAME_RATE,
+    OUTGOING_RES,
+    SCALING_FACTOR,
+    TONE_MAPPING,
+    UPSCALING,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import MadVRCoordinator
+
+# aspect ratios closer than this are treated as equal, the device rounds
+RATIO_TOLERANCE = 0.01
+
+
+def _height(resolution: Any) -> int | None:
+    """Return the height of a "3840x2160" resolution."""
+    try:
+        return int(str(resolution).partition("x")[2]) or None
+    except ValueError:
+        return None
+
+
+def _scaling_factor(data: dict[str, Any]) -> float | None:
+    """Return outgoing over incoming height."""
+    incoming = _height(data.get(INCOMING_RES))
+    outgoing = _height(data.get(OUTGOING_RES))
+    if incoming is None or outgoing is None:
+        return None
+    return round(outgoing / incoming, 2)
+
+
+def _upscaling(data: dict[str, Any]) -> bool | None:
+    """Return if the output has more lines than the input."""
+    if (factor := _scaling_factor(data)) is None:
+        return None
+    return factor > 1
+
+
+def _frame_rate_mismatch(data: dict[str, Any]) -> bool | None:
+    """Return if the output frame rate differs from the input."""
+    incoming = data.get(INCOMING_FRAME_RATE)
+    outgoing = data.get(OUTGOING_FRAME_RATE)
+    if not incoming or not outgoing:
+        return None
+    return incoming != outgoing
+
+
+def _tone_mapping(data: dict[str, Any]) -> bool:
+    """Return if an HDR input goes out as SDR."""
+    return bool(data.get("hdr_flag")) and not data.get("outgoing_hdr_flag")
+
+
+def _masking_differs(data: dict[str, Any]) -> bool | None:
+    """Return if the masking ratio differs from the detected aspect ratio."""
+    try:
+        aspect = float(data[ASPECT_DEC])
+        masking = float(data[MASKING_DEC])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return abs(aspect - masking) > RATIO_TOLERANCE
+
+
+# derived key -> (input keys, function of the snapshot)
+DERIVED: dict[str, tuple[frozenset[str], Callable[[dict[str, Any]], Any]]] = {
+    UPSCALING: (frozenset({INCOMING_RES, OUTGOING_RES}), _upscaling),
+    SCALING_FACTOR: (frozenset({INCOMING_RES, OUTGOING_RES}), _scaling_factor),
+    FRAME_RATE_MISMATCH: (
+        frozenset({INCOMING_FRAME_RATE, OUTGOING_FRAME_RATE}),
+        _frame_rate_mismatch,
+    ),
+    TONE_MAPPING: (frozenset({"hdr_flag", "outgoing_hdr_flag"}), _tone_mapping),
+    MASKING_DIFFERS: (frozenset({ASPECT_DEC, MASKING_DEC}), _masking_differs),
+}
+
+# input key -> derived keys reading it
+_INPUTS: dict[str, list[str]] = {}
+for _key, (_inputs, _) in DERIVED.items():
+    for _input in _inputs:
+        _INPUTS.setdefault(_input, []).append(_key)
+
+
+class MadVRDerivedValues:
+    """Recompute derived values whose input keys are in a commit's delta."""
+
+    def __init__(self, coordinator: MadVRCoordinator) -> None:
+        """Initialize the values."""
+        self.coordinator = coordinator
+        self.values: dict[str, Any] = dict.fromkeys(DERIVED)
+        self.computations = 0
+
+    @callback
+    def async_update(self, data: dict[str, Any], delta: dict[str, Any]) -> None:
+        """Recompute the values depending on the changed keys."""
+        stale = {
+            key for changed in delta.keys() & _INPUTS.keys() for key in _INPUTS[changed]
+        }
+        for key in stale:
+            self.values[key] = DERIVED[key][1](data)
+        self.computations += len(stale)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the values for diagnostics."""
+        return {"values": self.values, "computations": self.computations}
@@ -0,0 +1,127 @@
+"""Device triggers for the madVR integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components.device_automation import (
+    DEVICE_TRIGGER_BASE_SCHEMA,
+    InvalidDeviceAutomationConfig,
+)
+from homeassistant.const import CONF_DEVICE_ID, CONF_DOMAIN, CONF_PLATFORM, CONF_TYPE
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
+from homeassistant.helpers.typing import ConfigType
+
+from .const import ASPECT_DEC, DOMAIN, INCOMING_FRAME_RATE
+from .triggers import async_get_trigger_index
+
+CONF_VALUE = "value"
+
+# trigger type -> (data key, value it changes to, None for any value or the
+# value configured on the trigger)
+TRIGGERS: dict[str, tuple[str, Any]] = {
+    "hdr_on": ("hdr_flag", True),
+    "hdr_off": ("hdr_flag", False),
+    "signal_detected": ("is_signal", True),
+    "signal_lost": ("is_signal", False),
+    "aspect_ratio_changed": (ASPECT_DEC, None),
+    "frame_rate_changed": (INCOMING_FRAME_RATE, None),
+}
+
+# trigger types that take an optional value
+VALUE_TRIGGERS = frozenset({"aspect_ratio_changed", "frame_rate_changed"})
+
+TRIGGER_SCHEMA = DEVICE_TRIGGER_BASE_SCHEMA.extend(
+    {
+        vol.Required(CONF_TYPE): vol.In(TRIGGERS),
+        vol.Optional(CONF_VALUE): cv.string,
+    }
+)
+
+
+def _async_get_mac(hass: HomeAssistant, device_id: str) -> str:
+    """Return the MAC of a madVR device."""
+    device = dr.async_get(hass).async_get(device_id)
+    if device is not None:
+        for domain, identifier in device.identifiers:
+            if domain == DOMAIN:
+                return identifier
+    raise InvalidDeviceAutomationConfig(f"Device {device_id} is not a madVR")
+
+
+async def async_validate_trigger_config(
+    hass: HomeAssistant, config: ConfigType
+) -> ConfigType:
+    """Validate config."""
+    config = TRIGGER_SCHEMA(config)
+    if CONF_VALUE in config and config[CONF_TYPE] not in VALUE_TRIGGERS:
+        raise InvalidDeviceAutomationConfig(
+            f"Trigger {config[CONF_TYPE]} does not take a value"
+        )
+    _async_get_mac(hass, config[CONF_DEVICE_ID])
+    return config
+
+
+async def async_get_triggers(
+    hass: HomeAssistant, device_id: str
+) -> list[dict[str, Any]]:
+    """List device triggers for a madVR device."""
+    return [
+        {
+            CONF_PLATFORM: "device",
+            CONF_DEVICE_ID: device_id,
+            CONF_DOMAIN: DOMAIN,
+            CONF_TYPE: trigger_type,
+        }
+        for trigger_type in TRIGGERS
+    ]
+
+
+async def async_get_trigger_capabilities(
+    hass: HomeAssistant, config: ConfigType
+) -> dict[str, vol.Schema]:
+    """List the value field of the triggers that take one."""
+    if config[CONF_TYPE] not in VALUE_TRIGGERS:
+        return {}
+    return {"extra_fields": vol.Schema({vol.Optional(CONF_VALUE): cv.string})}
+
+
+async def async_attach_trigger(
+    hass: HomeAssistant,
+    config: ConfigType,
+    action: TriggerActionType,
+    trigger_info: TriggerInfo,
+) -> CALLBACK_TYPE:
+    """Attach a trigger to the device's trigger index."""
+    trigger_type = config[CONF_TYPE]
+    key, value = TRIGGERS[trigger_type]
+    if trigger_type in VALUE_TRIGGERS:
+        value = config.get(CONF_VALUE)
+    job = HassJob(action, f"madVR {trigger_type} trigger")
+    trigger_data = trigger_info["trigger_data"]
+
+    @callback
+    def async_fire(new_value: Any) -> None:
+        """Run the automation."""
+        hass.async_run_hass_job(
+            job,
+            {
+                "trigger": {
+                    **trigger_data,
+                    CONF_PLATFORM: "device",
+                    CONF_DOMAIN: DOMAIN,
+                    CONF_DEVICE_ID: config[CONF_DEVICE_ID],
+                    CONF_TYPE: trigger_type,
+                    CONF_VALUE: new_value,
+                    "description": f"madVR {trigger_type}",
+                }
+            },
+        )
+
+    return async_get_trigger_index(hass).async_attach(
+        _async_get_mac(hass, config[CONF_DEVICE_ID]), key, value, async_fire
+    )
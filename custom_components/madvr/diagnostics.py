@@ -9,17 +9,43 @@ from homeassistant.const import CONF_HOST
 from homeassistant.core import HomeAssistant
 
 from . import MadVRConfigEntry
+from .clients import async_get_client_pool
 
 TO_REDACT = [CONF_HOST]
+# the old and new address of the resolver's last move
+MOVE_REDACT = ["from", "to"]
 
 
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, config_entry: MadVRConfigEntry
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
-    data = config_entry.runtime_data.data
+    coordinator = config_entry.runtime_data
 
     return {
         "config_entry": async_redact_data(config_entry.as_dict(), TO_REDACT),
-        "madvr_data": data,
+        "madvr_data": coordinator.data,
+        "derived": coordinator.derived.as_dict(),
+        "validation": coordinator.validator.as_dict(),
+        "resolver": async_redact_data(coordinator.resolver.as_dict(), MOVE_REDACT),
+        "startup": coordinator.startup.as_dict() if coordinator.startup else None,
+        "counters": coordinator.counters(),
+        "latency": coordinator.latency(),
+        "queries": coordinator.queries.as_dict(),
+        "resources": coordinator.resources(),
+        "client_pool": async_get_client_pool(hass).as_dict(),
+        "governor": coordinator.governor.as_dict(),
+        "scheduler": coordinator.scheduler.as_dict(),
+        "acks": coordinator.acks.as_dict(),
+        "command_buffer": coordinator.buffer.as_dict(),
+        "messages": coordinator.messages.as_dict(),
+        "macros": coordinator.macros.as_dict(),
+        "triggers": coordinator.triggers.as_dict(),
+        "profiles": coordinator.profiles.as_dict(),
+        "temperature_statistics": coordinator.statistics.as_dict(),
+        "tracing": coordinator.tracer.as_dict() if coordinator.tracer else None,
+        "profiling": {
+            "active": coordinator.profiler is not None,
+            "last_summary": coordinator.profile_summary,
+        },
     }
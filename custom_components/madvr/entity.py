@@ -1,16 +1,23 @@
 """Base class for madVR entities."""
 
+from typing import Any
+
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import MadVRCoordinator
+from .tracing import now_us
 
 
 class MadVREntity(CoordinatorEntity[MadVRCoordinator]):
     """Defines a base madVR entity."""
 
     _attr_has_entity_name = True
+    # coordinator data key shown by the entity, for the priority lane
+    _priority_key: str | None = None
 
     def __init__(self, coordinator: MadVRCoordinator) -> None:
         """Initialize madvr entity."""
@@ -22,3 +29,35 @@ class MadVREntity(CoordinatorEntity[MadVRCoordinator]):
             model="Envy",
             connections={(CONNECTION_NETWORK_MAC, coordinator.mac)},
         )
+
+    async def async_added_to_hass(self) -> None:
+        """Also listen on the priority lane if the entity shows a data key.
+
+        The priority keys can change at runtime, the handler only acts on keys
+        in the dispatched delta.
+        """
+        await super().async_added_to_hass()
+        if self._priority_key is not None:
+            self.async_on_remove(
+                async_dispatcher_connect(
+                    self.hass,
+                    self.coordinator.priority_signal,
+                    self._async_handle_priority_update,
+                )
+            )
+
+    @callback
+    def _async_handle_priority_update(self, delta: dict[str, Any]) -> None:
+        """Update ahead of the throttled commit when the key changed."""
+        if self._priority_key in delta:
+            self._handle_coordinator_update()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, recording a span while tracing."""
+        if (tracer := self.coordinator.tracer) is None:
+            super().async_write_ha_state()
+            return
+        start = now_us()
+        super().async_write_ha_state()
+        tracer.span("state write", start, push=tracer.push_id, entity=self.entity_id)
@@ -0,0 +1,159 @@
+"""Integration wide budget for state writes, adapted to event loop lag."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import MadVRCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_GOVERNOR: HassKey[MadVRWriteGovernor] = HassKey(f"{DOMAIN}_governor")
+
+# seconds between loop lag probes
+PROBE_INTERVAL = 1.0
+# weight of a new probe in the smoothed lag
+LAG_SMOOTHING = 0.3
+# smoothed lag above which the budget shrinks, and below which it grows back
+HIGH_LAG = 0.05
+LOW_LAG = 0.01
+
+# commits per second shared by all devices; the initial budget gives a single
+# device the 100 ms window the coordinator always used
+MIN_BUDGET = 1.0
+INITIAL_BUDGET = 10.0
+MAX_BUDGET = 20.0
+# multiplicative decrease under lag, additive increase when idle
+BACKOFF = 0.5
+RECOVERY = 1.0
+
+# bounds of a device's publish window in seconds
+MIN_WINDOW = 0.05
+MAX_WINDOW = 2.0
+
+
+@callback
+def async_get_governor(hass: HomeAssistant) -> MadVRWriteGovernor:
+    """Return the governor, creating it on first use."""
+    if (governor := hass.data.get(DATA_GOVERNOR)) is None:
+        governor = hass.data[DATA_GOVERNOR] = MadVRWriteGovernor(hass)
+    return governor
+
+
+class MadVRWriteGovernor:
+    """Share a write budget between devices and adapt it to loop lag.
+
+    The lag is how late a timer fires. While it stays high the budget is
+    halved, once the loop is idle it grows back a step per probe. Every active
+    device gets an equal share, so its publish window is active devices /
+    budget. Priority keys are dispatched before the window and are never
+    deferred. Probing stops while every device is idle in low power mode,
+    nothing is written then.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the governor."""
+        self.hass = hass
+        self._devices: set[MadVRCoordinator] = set()
+        self._probe: asyncio.TimerHandle | None = None
+        self._expected = 0.0
+        self.budget = INITIAL_BUDGET
+        self.window = MIN_WINDOW
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.probes = 0
+        self.backoffs = 0
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_stop)
+        self._async_set_window()
+
+    @callback
+    def async_register(self, coordinator: MadVRCoordinator) -> CALLBACK_TYPE:
+        """Add a device to the budget, probing while any is active."""
+        self._devices.add(coordinator)
+        self.async_update_activity()
+
+        @callback
+        def unregister() -> None:
+            self._devices.discard(coordinator)
+            self.async_update_activity()
+
+        return unregister
+
+    @callback
+    def async_update_activity(self) -> None:
+        """Share the budget between active devices, probe while there are any."""
+        active = self._async_set_window()
+        if active and self._probe is None:
+            self._async_schedule_probe()
+        elif not active and self._probe is not None:
+            self._probe.cancel()
+            self._probe = None
+
+    @callback
+    def _async_schedule_probe(self) -> None:
+        """Schedule the next lag probe."""
+        self._expected = self.hass.loop.time() + PROBE_INTERVAL
+        self._probe = self.hass.loop.call_at(self._expected, self._async_run_probe)
+
+    @callback
+    def _async_run_probe(self) -> None:
+        """Measure how late the probe ran and adjust the budget."""
+        lag = max(0.0, self.hass.loop.time() - self._expected)
+        self.probes += 1
+        self.lag += LAG_SMOOTHING * (lag - self.lag)
+        self.max_lag = max(self.max_lag, lag)
+        if self.lag > HIGH_LAG and self.budget > MIN_BUDGET:
+            self.budget = max(MIN_BUDGET, self.budget * BACKOFF)
+            self.backoffs += 1
+            _LOGGER.debug(
+                "Loop lag %.0f ms, write budget lowered to %.1f/s",
+                self.lag * 1000,
+                self.budget,
+            )
+        elif self.lag < LOW_LAG and self.budget < MAX_BUDGET:
+            self.budget = min(MAX_BUDGET, self.budget + RECOVERY)
+        self._async_set_window()
+        self._async_schedule_probe()
+
+    @callback
+    def _async_set_window(self) -> int:
+        """Give every active device its share of the budget, return their count.
+
+        Devices in low power mode write nothing, so they take no share.
+        """
+        active = sum(not device.scheduler.low_power for device in self._devices)
+        self.window = min(MAX_WINDOW, max(MIN_WINDOW, max(active, 1) / self.budget))
+        return active
+
+    @callback
+    def _async_stop(self, event: Event) -> None:
+        """Stop probing."""
+        if self._probe is not None:
+            self._probe.cancel()
+            self._probe = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the budget and lag for diagnostics."""
+        return {
+            "devices": len(self._devices),
+            "active_devices": sum(
+                not device.scheduler.low_power for device in self._devices
+            ),
+            "probing": self._probe is not None,
+            "budget_per_second": round(self.budget, 1),
+            "window_ms": round(self.window * 1000),
+            "lag_ms": round(self.lag * 1000, 1),
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "probes": self.probes,
+            "backoffs": self.backoffs,
+            "deferred": sum(device.throttle_count for device in self._devices),
+        }
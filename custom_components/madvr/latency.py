@@ -0,0 +1,40 @@
+"""Rolling latency samples for madVR diagnostics."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any
+
+# samples kept per measurement
+DEFAULT_SAMPLES = 1000
+
+
+class LatencyStats:
+    """Keep the most recent latencies and report percentiles in milliseconds."""
+
+    def __init__(self, samples: int = DEFAULT_SAMPLES) -> None:
+        """Initialize the stats."""
+        self._samples: deque[float] = deque(maxlen=samples)
+        self.count = 0
+
+    def add(self, seconds: float) -> None:
+        """Record a latency."""
+        self._samples.append(seconds)
+        self.count += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the count and p50/p99/max of the kept samples."""
+        samples = sorted(self._samples)
+
+        def percentile(fraction: float) -> float | None:
+            if not samples:
+                return None
+            index = min(len(samples) - 1, int(len(samples) * fraction))
+            return round(samples[index] * 1000, 2)
+
+        return {
+            "count": self.count,
+            "p50": percentile(0.5),
+            "p99": percentile(0.99),
+            "max": percentile(1.0),
+        }
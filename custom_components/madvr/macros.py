@@ -0,0 +1,233 @@
+"""Named multi-step command macros for madVR."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from dataclasses import dataclass
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import slugify
+
+from .ack import CommandRejected
+from .commands import encode_command
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import MadVRCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+CONF_COMMAND = "command"
+CONF_WAIT = "wait"
+CONF_TIMEOUT = "timeout"
+CONF_DELAY = "delay"
+
+# seconds a step waits for its state condition
+DEFAULT_WAIT_TIMEOUT = 10.0
+
+
+def valid_command(value: Any) -> str:
+    """Validate that a command can be encoded."""
+    value = cv.string(value)
+    try:
+        encode_command(value)
+    except ValueError as err:
+        raise vol.Invalid(str(err)) from err
+    return value
+
+
+STEP_SCHEMA = vol.Any(
+    valid_command,
+    vol.All(
+        {
+            vol.Optional(CONF_COMMAND): valid_command,
+            # data key -> value the device has to report before moving on
+            vol.Optional(CONF_WAIT): vol.All(
+                {cv.string: vol.Any(str, int, float, bool, None)}, vol.Length(min=1)
+            ),
+            vol.Optional(CONF_TIMEOUT, default=DEFAULT_WAIT_TIMEOUT): vol.All(
+                vol.Coerce(float), vol.Range(min=0.1, max=300)
+            ),
+            # plain sleep for menus that animate without reporting anything
+            vol.Optional(CONF_DELAY): vol.All(
+                vol.Coerce(float), vol.Range(min=0, max=60)
+            ),
+        },
+        cv.has_at_least_one_key(CONF_COMMAND, CONF_WAIT, CONF_DELAY),
+    ),
+)
+
+MACROS_SCHEMA = vol.Schema(
+    {cv.string: vol.All(cv.ensure_list, vol.Length(min=1), [STEP_SCHEMA])}
+)
+
+
+class DuplicateMacro(vol.Invalid):
+    """Two macro names give their buttons the same unique id."""
+
+
+def macro_slug(name: str) -> str:
+    """Return the part of a macro button's unique id taken from its name."""
+    return slugify(name)
+
+
+@dataclass(frozen=True, slots=True)
+class MacroStep:
+    """A compiled macro step."""
+
+    # original command text, used in logs and timings
+    command: str | None = None
+    payload: bytes | None = None
+    wait: tuple[tuple[str, Any], ...] = ()
+    timeout: float = DEFAULT_WAIT_TIMEOUT
+    delay: float = 0.0
+
+    @property
+    def label(self) -> str:
+        """Return a short description of the step."""
+        if self.command is not None:
+            return self.command
+        if self.wait:
+            return "wait " + ", ".join(f"{key}={value}" for key, value in self.wait)
+        return f"delay {self.delay}"
+
+
+def compile_macros(config: Mapping[str, Any]) -> dict[str, tuple[MacroStep, ...]]:
+    """Validate macro definitions and encode their commands once."""
+    macros: dict[str, tuple[MacroStep, ...]] = {}
+    # slug -> name, "Movie Mode" and "movie-mode" would share a button
+    slugs: dict[str, str] = {}
+    for name, steps in MACROS_SCHEMA(dict(config)).items():
+        if (other := slugs.setdefault(macro_slug(name), name)) != name:
+            raise DuplicateMacro(f"{other} and {name} map to the same button id")
+        compiled = []
+        for step in steps:
+            if isinstance(step, str):
+                step = {CONF_COMMAND: step}
+            command = step.get(CONF_COMMAND)
+            compiled.append(
+                MacroStep(
+                    command=command,
+                    payload=encode_command(command) if command else None,
+                    wait=tuple(step.get(CONF_WAIT, {}).items()),
+                    timeout=step.get(CONF_TIMEOUT, DEFAULT_WAIT_TIMEOUT),
+                    delay=step.get(CONF_DELAY, 0.0),
+                )
+            )
+        macros[name] = tuple(compiled)
+    return macros
+
+
+class MadVRMacros:
+    """Run compiled macros, waiting on acks and state instead of fixed sleeps."""
+
+    def __init__(self, coordinator: MadVRCoordinator) -> None:
+        """Initialize the macro runner."""
+        self.coordinator = coordinator
+        self.macros: dict[str, tuple[MacroStep, ...]] = {}
+        # one macro at a time so steps of two macros never interleave
+        self._lock = asyncio.Lock()
+        # name -> timings of the last run
+        self.last_runs: dict[str, dict[str, Any]] = {}
+        self.runs = 0
+        self.failures = 0
+
+    def load(self, config: Mapping[str, Any]) -> None:
+        """Compile the macros from the entry options."""
+        try:
+            self.macros = compile_macros(config)
+        except vol.Invalid as err:
+            # the options flow validates too, this only guards hand edited storage
+            _LOGGER.error("Invalid madVR macros, ignoring them: %s", err)
+            self.macros = {}
+
+    async def async_run(self, name: str) -> dict[str, Any]:
+        """Run a macro and return its timings."""
+        steps = self.macros[name]
+        timings: list[dict[str, Any]] = []
+        async with self._lock:
+            start = time.perf_counter()
+            self.runs += 1
+            for index, step in enumerate(steps):
+                step_start = time.perf_counter()
+                try:
+                    await self._async_run_step(step)
+                except HomeAssistantError:
+                    self.failures += 1
+                    raise
+                except (CommandRejected, ConnectionError, TimeoutError) as err:
+                    self.failures += 1
+                    raise HomeAssistantError(
+                        translation_domain=DOMAIN,
+                        translation_key="macro_failed",
+                        translation_placeholders={
+                            "macro": name,
+                            "step": str(index + 1),
+                            "error": str(err) or type(err).__name__,
+                        },
+                    ) from err
+                timings.append(
+                    {
+                        "step": step.label,
+                        "ms": round((time.perf_counter() - step_start) * 1000, 1),
+                    }
+                )
+            result = {
+                "macro": name,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+                "steps": timings,
+            }
+        self.last_runs[name] = result
+        _LOGGER.debug("Macro %s ran in %sms", name, result["duration_ms"])
+        return result
+
+    async def _async_run_step(self, step: MacroStep) -> None:
+        """Send the step's command, then wait for its condition."""
+        if step.payload is not None:
+            await self.coordinator.acks.async_send(step.payload)
+        if step.wait:
+            await self._async_wait(step.wait, step.timeout)
+        if step.delay:
+            await asyncio.sleep(step.delay)
+
+    async def _async_wait(
+        self, conditions: tuple[tuple[str, Any], ...], timeout: float
+    ) -> None:
+        """Wait until the device reports all values of a condition."""
+        coordinator = self.coordinator
+
+        def matches() -> bool:
+            return all(coordinator.data.get(key) == value for key, value in conditions)
+
+        if matches():
+            return
+        future: asyncio.Future[None] = coordinator.hass.loop.create_future()
+
+        @callback
+        def on_delta(delta: dict[str, Any]) -> None:
+            if not future.done() and matches():
+                future.set_result(None)
+
+        remove = coordinator.async_add_delta_listener(on_delta)
+        try:
+            async with asyncio.timeout(timeout):
+                await future
+        finally:
+            remove()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return macro stats for diagnostics."""
+        return {
+            "macros": {name: len(steps) for name, steps in self.macros.items()},
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_runs": self.last_runs,
+        }
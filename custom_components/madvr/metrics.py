@@ -0,0 +1,250 @@
+"""Prometheus text format metrics for madVR devices."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from http import HTTPStatus
+from itertools import count
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import web
+
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import callback
+
+from .const import (
+    ASPECT_DEC,
+    DOMAIN,
+    MASKING_DEC,
+    TEMP_CPU,
+    TEMP_GPU,
+    TEMP_HDMI,
+    TEMP_MAINBOARD,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import MadVRCoordinator
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# versions of the rendered lines, shared by all devices and never reused, so a
+# device set up after a reload cannot repeat the key of one that went away
+_versions = count(1)
+
+
+def _temperature(value: Any) -> float | None:
+    """Return a valid temperature."""
+    try:
+        temp = float(value)
+    except (TypeError, ValueError):
+        return None
+    return temp if temp > 0 else None
+
+
+def _flag(value: Any) -> float | None:
+    """Return a boolean as 0/1."""
+    return None if value is None else float(bool(value))
+
+
+def _number(value: Any) -> float | None:
+    """Return a number."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class MadvrGaugeDescription:
+    """Describe a gauge rendered from a coordinator data key."""
+
+    key: str
+    family: str
+    labels: str = ""
+    value_fn: Callable[[Any], float | None]
+
+
+# family -> (type, help), in output order
+FAMILIES: dict[str, tuple[str, str]] = {
+    "madvr_temperature_celsius": ("gauge", "Device temperature."),
+    "madvr_power_on": ("gauge", "1 if the device is on."),
+    "madvr_standby": ("gauge", "1 if the device is in standby."),
+    "madvr_signal": ("gauge", "1 if the device has an incoming signal."),
+    "madvr_hdr": ("gauge", "1 if the incoming signal is HDR."),
+    "madvr_outgoing_hdr": ("gauge", "1 if the outgoing signal is HDR."),
+    "madvr_aspect_ratio": ("gauge", "Detected aspect ratio of the content."),
+    "madvr_masking_ratio": ("gauge", "Current masking ratio."),
+}
+
+GAUGES: tuple[MadvrGaugeDescription, ...] = (
+    MadvrGaugeDescription(
+        key=TEMP_GPU,
+        family="madvr_temperature_celsius",
+        labels=',sensor="gpu"',
+        value_fn=_temperature,
+    ),
+    MadvrGaugeDescription(
+        key=TEMP_HDMI,
+        family="madvr_temperature_celsius",
+        labels=',sensor="hdmi"',
+        value_fn=_temperature,
+    ),
+    MadvrGaugeDescription(
+        key=TEMP_CPU,
+        family="madvr_temperature_celsius",
+        labels=',sensor="cpu"',
+        value_fn=_temperature,
+    ),
+    MadvrGaugeDescription(
+        key=TEMP_MAINBOARD,
+        family="madvr_temperature_celsius",
+        labels=',sensor="mainboard"',
+        value_fn=_temperature,
+    ),
+    MadvrGaugeDescription(key="is_on", family="madvr_power_on", value_fn=_flag),
+    MadvrGaugeDescription(key="standby", family="madvr_standby", value_fn=_flag),
+    MadvrGaugeDescription(key="is_signal", family="madvr_signal", value_fn=_flag),
+    MadvrGaugeDescription(key="hdr_flag", family="madvr_hdr", value_fn=_flag),
+    MadvrGaugeDescription(
+        key="outgoing_hdr_flag", family="madvr_outgoing_hdr", value_fn=_flag
+    ),
+    MadvrGaugeDescription(
+        key=ASPECT_DEC, family="madvr_aspect_ratio", value_fn=_number
+    ),
+    MadvrGaugeDescription(
+        key=MASKING_DEC, family="madvr_masking_ratio", value_fn=_number
+    ),
+)
+GAUGES_BY_KEY = {description.key: description for description in GAUGES}
+
+# rendered on every scrape, they change with every push
+LIVE_FAMILIES: dict[str, tuple[str, str]] = {
+    "madvr_connected": ("gauge", "1 if the notification connection is up."),
+    "madvr_query_rtt_seconds": ("gauge", "Round trip time of the last query."),
+    "madvr_pushes_total": ("counter", "Pushes received from the device."),
+    "madvr_commits_total": ("counter", "Updates committed to entities."),
+    "madvr_throttled_total": ("counter", "Commits delayed by the throttle."),
+    "madvr_commands_buffered_total": (
+        "counter",
+        "Commands buffered while disconnected.",
+    ),
+    "madvr_commands_expired_total": (
+        "counter",
+        "Buffered commands dropped by their TTL.",
+    ),
+    "madvr_commands_flushed_total": (
+        "counter",
+        "Buffered commands sent on reconnect.",
+    ),
+}
+
+
+def _header(family: str, kind: str, help_text: str) -> str:
+    """Return the HELP and TYPE lines of a family."""
+    return f"# HELP {family} {help_text}\n# TYPE {family} {kind}\n"
+
+
+class MadVRMetrics:
+    """Sample lines of one device, re-rendered only for keys that change."""
+
+    def __init__(self, coordinator: MadVRCoordinator) -> None:
+        """Initialize the metrics."""
+        self.coordinator = coordinator
+        self._labels = f'mac="{coordinator.mac}"'
+        # data key -> rendered sample line
+        self.lines: dict[str, str] = {}
+        # renewed whenever a line changes so the view can reuse its buffer
+        self.version = next(_versions)
+
+    @callback
+    def async_update(self, delta: dict[str, Any]) -> None:
+        """Re-render the lines of changed keys."""
+        changed = False
+        for key, value in delta.items():
+            if (description := GAUGES_BY_KEY.get(key)) is None:
+                continue
+            changed = True
+            if (number := description.value_fn(value)) is None:
+                self.lines.pop(key, None)
+                continue
+            self.lines[key] = (
+                f"{description.family}{{{self._labels}{description.labels}}} {number}\n"
+            )
+        if changed:
+            self.version = next(_versions)
+
+    def live_lines(self) -> dict[str, str]:
+        """Return the lines of values that change on every push."""
+        coordinator = self.coordinator
+        values: dict[str, float | None] = {
+            "madvr_connected": float(coordinator.client.connected),
+            "madvr_query_rtt_seconds": coordinator.queries.last_rtt,
+            "madvr_pushes_total": coordinator.push_count,
+            "madvr_commits_total": coordinator.commit_count,
+            "madvr_throttled_total": coordinator.throttle_count,
+            "madvr_commands_buffered_total": coordinator.buffer.buffered,
+            "madvr_commands_expired_total": coordinator.buffer.expired,
+            "madvr_commands_flushed_total": coordinator.buffer.flushed,
+        }
+        return {
+            family: f"{family}{{{self._labels}}} {value}\n"
+            for family, value in values.items()
+            if value is not None
+        }
+
+
+class MadVRMetricsView(HomeAssistantView):
+    """Serve metrics of all loaded madVR devices."""
+
+    url = "/api/madvr/metrics"
+    name = "api:madvr:metrics"
+
+    def __init__(self) -> None:
+        """Initialize the view."""
+        self._cache_key: tuple[int, ...] = ()
+        self._cache = ""
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Render the metrics."""
+        hass = request.app[KEY_HASS]
+        devices: list[MadVRMetrics] = [
+            entry.runtime_data.metrics
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if entry.state is ConfigEntryState.LOADED
+        ]
+        cache_key = tuple(device.version for device in devices)
+        if cache_key != self._cache_key:
+            self._cache = self._render_gauges(devices)
+            self._cache_key = cache_key
+
+        parts = [self._cache]
+        live = [device.live_lines() for device in devices]
+        for family, (kind, help_text) in LIVE_FAMILIES.items():
+            lines = [device[family] for device in live if family in device]
+            if lines:
+                parts.append(_header(family, kind, help_text))
+                parts.extend(lines)
+        return web.Response(
+            body="".join(parts).encode(),
+            status=HTTPStatus.OK,
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+    @staticmethod
+    def _render_gauges(devices: list[MadVRMetrics]) -> str:
+        """Group the cached sample lines of all devices by family."""
+        parts: list[str] = []
+        for family, (kind, help_text) in FAMILIES.items():
+            lines = [
+                line
+                for device in devices
+                for description in GAUGES
+                if description.family == family
+                and (line := device.lines.get(description.key)) is not None
+            ]
+            if lines:
+                parts.append(_header(family, kind, help_text))
+                parts.extend(lines)
+        return "".join(parts)
@@ -1,170 +1,170 @@
-
-# @staticmethod
-# @callback
-# def async_get_options_flow(config_entry: MadVRConfigEntry) -> OptionsFlow:
-#     """Get the options flow for this handler."""
-#     return MadVROptionsFlowHandler(config_entry)
-
-
-# class MadVROptionsFlowHandler(OptionsFlow):
-#     """Handle an options flow for the integration."""
-
-#     def __init__(self, config_entry: MadVRConfigEntry) -> None:
-#         """Initialize the options flow."""
-#         self.config_entry = config_entry
-
-#     async def async_step_init(
-#         self, user_input: dict[str, Any] | None = None
-#     ) -> ConfigFlowResult:
-#         """Manage the options."""
-#         return await self.async_step_user()
-
-#     async def async_step_user(
-#         self, user_input: dict[str, Any] | None = None
-#     ) -> ConfigFlowResult:
-#         """Handle the options step."""
-#         errors: dict[str, str] = {}
-#         if user_input is not None:
-#             new_data = {**self.config_entry.data, **user_input}
-#             # there could be a situation where user changes the IP to "add" a new device so we need to update mac too
-#             try:
-#                 # ensure we can connect and get the mac address from device
-#                 mac = await test_connection(
-#                     self.hass, user_input[CONF_HOST], user_input[CONF_PORT]
-#                 )
-#             except CannotConnect:
-#                 _LOGGER.error("CannotConnect error caught")
-#                 errors["base"] = "cannot_connect"
-#             else:
-#                 if not mac:
-#                     errors["base"] = "no_mac"
-#             if not errors:
-#                 self.hass.config_entries.async_update_entry(
-#                     self.config_entry, data=new_data
-#                 )
-#                 # reload the entity if changed
-#                 await self.hass.config_entries.async_reload(self.config_entry.entry_id)
-#                 return self.async_create_entry(title=DEFAULT_NAME, data=user_input)
-
-#         # if error or initial load, show the form
-#         options = self.config_entry.data
-#         data_schema = vol.Schema(
-#             {
-#                 vol.Required(CONF_HOST, default=options.get(CONF_HOST, "")): str,
-#                 vol.Required(CONF_PORT, default=options.get(CONF_PORT, 44077)): int,
-#             }
-#         )
-
-#         return self.async_show_form(
-#             step_id="user", data_schema=data_schema, errors=errors
-#         )
-
-
-# async def test_options_flow(
-#     hass: HomeAssistant,
-#     mock_madvr_client: AsyncMock,
-#     mock_config_entry: MockConfigEntry,
-# ) -> None:
-#     """Test options flow."""
-#     mock_config_entry.add_to_hass(hass)
-
-#     result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
-
-#     assert result["type"] == FlowResultType.FORM
-#     assert result["step_id"] == "user"
-
-#     result = await hass.config_entries.options.async_configure(
-#         result["flow_id"],
-#         user_input={
-#             CONF_HOST: "192.168.1.100",
-#             CONF_PORT: 44078,
-#         },
-#     )
-
-#     assert result["type"] == FlowResultType.CREATE_ENTRY
-#     assert result["data"] == {
-#         CONF_HOST: "192.168.1.100",
-#         CONF_PORT: 44078,
-#     }
-#     mock_madvr_client.open_connection.assert_called_once()
-#     assert mock_madvr_client.async_add_tasks.call_count == 2
-#     mock_madvr_client.async_cancel_tasks.assert_called_once()
-
-
-# async def test_options_flow_errors(
-#     hass: HomeAssistant,
-#     mock_madvr_client: AsyncMock,
-#     mock_config_entry: MockConfigEntry,
-# ) -> None:
-#     """Test options flow errors."""
-#     mock_config_entry.add_to_hass(hass)
-
-#     result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
-
-#     assert result["type"] == FlowResultType.FORM
-#     assert result["step_id"] == "user"
-
-#     mock_madvr_client.open_connection.side_effect = TimeoutError
-
-#     result = await hass.config_entries.options.async_configure(
-#         result["flow_id"],
-#         user_input={
-#             CONF_HOST: "192.168.1.100",
-#             CONF_PORT: 44078,
-#         },
-#     )
-
-#     assert result["type"] == FlowResultType.FORM
-#     assert result["errors"] == {"base": "cannot_connect"}
-
-#     mock_madvr_client.open_connection.side_effect = None
-#     mock_madvr_client.connected = True
-#     mock_madvr_client.mac_address = None
-
-#     result = await hass.config_entries.options.async_configure(
-#         result["flow_id"],
-#         user_input={
-#             CONF_HOST: "192.168.1.100",
-#             CONF_PORT: 44078,
-#         },
-#     )
-
-#     assert result["type"] == FlowResultType.FORM
-#     assert result["errors"] == {"base": "no_mac"}
-
-#     mock_madvr_client.mac_address = MOCK_MAC
-
-#     result = await hass.config_entries.options.async_configure(
-#         result["flow_id"],
-#         user_input={
-#             CONF_HOST: "192.168.1.100",
-#             CONF_PORT: 44078,
-#         },
-#     )
-
-#     assert result["type"] == FlowResultType.CREATE_ENTRY
-#     assert result["data"] == {
-#         CONF_HOST: "192.168.1.100",
-#         CONF_PORT: 44078,
-#     }
-
-# "options": {
-#     "step": {
-#       "user": {
-#         "title": "Update madVR Envy settings",
-#         "description": "Your device needs to be turned in order to update the integation settings. ",
-#         "data": {
-#           "host": "[%key:common::config_flow::data::host%]",
-#           "port": "[%key:common::config_flow::data::port%]"
-#         },
-#         "data_description": {
-#           "host": "The hostname or IP address of your madVR Envy device.",
-#           "port": "The port your madVR Envy is listening on. In 99% of cases, leave this as the default."
-#         }
-#       }
-#     },
-#     "error": {
-#       "cannot_connect": "[%key:common::config_flow::error::cannot_connect%]",
-#       "no_mac": "A MAC address was not found. It required to identify the device. Please ensure your device is connectable."
-#     }
-#   },
\ No newline at end of file
+"""Options flow for the madVR integration."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigFlowResult, OptionsFlow
+from homeassistant.const import UnitOfTemperature
+from homeassistant.data_entry_flow import section
+from homeassistant.helpers.selector import (
+    BooleanSelector,
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
+    ObjectSelector,
+    SelectSelector,
+    SelectSelectorConfig,
+)
+
+from .const import (
+    CONF_BUFFER_SIZE,
+    CONF_MACROS,
+    CONF_PRIORITY_KEYS,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_TEMPERATURE_STATISTICS,
+    CONF_UPDATE_WINDOW,
+    DEFAULT_BUFFER_SIZE,
+    DEFAULT_PRIORITY_KEYS,
+    DEFAULT_TEMPERATURE_DEADBAND,
+    DEFAULT_UPDATE_WINDOW,
+    INCOMING_ASPECT_RATIO,
+    INCOMING_FRAME_RATE,
+    INCOMING_RES,
+    LIVE_OPTIONS,
+    RELOAD_OPTIONS,
+)
+from .macros import DuplicateMacro, compile_macros
+
+_LOGGER = logging.getLogger(__name__)
+
+# offered in the priority keys selector, any other data key can be typed in
+PRIORITY_KEY_OPTIONS = [
+    *DEFAULT_PRIORITY_KEYS,
+    INCOMING_ASPECT_RATIO,
+    INCOMING_RES,
+    INCOMING_FRAME_RATE,
+    "is_signal",
+    "hdr_flag",
+    "outgoing_hdr_flag",
+]
+
+LIVE_SECTION = "live"
+RELOAD_SECTION = "reload"
+
+DEFAULT_OPTIONS: dict[str, Any] = {
+    CONF_PRIORITY_KEYS: DEFAULT_PRIORITY_KEYS,
+    CONF_UPDATE_WINDOW: DEFAULT_UPDATE_WINDOW,
+    CONF_TEMPERATURE_DEADBAND: DEFAULT_TEMPERATURE_DEADBAND,
+    CONF_BUFFER_SIZE: DEFAULT_BUFFER_SIZE,
+}
+
+DATA_SCHEMA = vol.Schema(
+    {
+        # applied to the running coordinator, see LIVE_OPTIONS
+        vol.Required(LIVE_SECTION): section(
+            vol.Schema(
+                {
+                    vol.Optional(CONF_PRIORITY_KEYS): SelectSelector(
+                        SelectSelectorConfig(
+                            options=PRIORITY_KEY_OPTIONS,
+                            multiple=True,
+                            custom_value=True,
+                        )
+                    ),
+                    vol.Optional(CONF_UPDATE_WINDOW): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0,
+                            max=2000,
+                            step=10,
+                            unit_of_measurement="ms",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Optional(CONF_TEMPERATURE_DEADBAND): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0,
+                            max=10,
+                            step=0.5,
+                            unit_of_measurement=UnitOfTemperature.CELSIUS,
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Optional(CONF_BUFFER_SIZE): vol.All(
+                        NumberSelector(
+                            NumberSelectorConfig(
+                                min=1, max=100, mode=NumberSelectorMode.BOX
+                            )
+                        ),
+                        vol.Coerce(int),
+                    ),
+                }
+            )
+        ),
+        # these change the entities, saving them reloads the entry
+        vol.Required(RELOAD_SECTION): section(
+            vol.Schema(
+                {
+                    vol.Optional(CONF_MACROS): ObjectSelector(),
+                    vol.Optional(
+                        CONF_TEMPERATURE_STATISTICS, default=False
+                    ): BooleanSelector(),
+                }
+            ),
+            {"collapsed": True},
+        ),
+    }
+)
+
+
+class MadVROptionsFlowHandler(OptionsFlow):
+    """Handle an options flow for the integration."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        errors: dict[str, str] = {}
+        placeholders = {"error": ""}
+        if user_input is not None:
+            live = user_input.get(LIVE_SECTION, {})
+            reload = user_input.get(RELOAD_SECTION, {})
+            macros = reload.get(CONF_MACROS) or {}
+            try:
+                compile_macros(macros)
+            except DuplicateMacro as err:
+                errors["base"] = "duplicate_macro"
+                placeholders["error"] = str(err)
+            except vol.Invalid as err:
+                _LOGGER.debug("Invalid macros %s: %s", macros, err)
+                errors["base"] = "invalid_macros"
+                placeholders["error"] = str(err)
+            else:
+                # stored flat, the sections only group the form
+                return self.async_create_entry(
+                    data={
+                        **live,
+                        **reload,
+                        CONF_MACROS: macros,
+                    }
+                )
+
+        options = {**DEFAULT_OPTIONS, **self.config_entry.options}
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                DATA_SCHEMA,
+                user_input
+                or {
+                    LIVE_SECTION: {key: options.get(key) for key in LIVE_OPTIONS},
+                    RELOAD_SECTION: {
+                        key: options[key] for key in RELOAD_OPTIONS if key in options
+                    },
+                },
+            ),
+            errors=errors,
+            description_placeholders=placeholders,
+        )
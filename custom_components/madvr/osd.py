@@ -0,0 +1,121 @@
+"""Rate limited queue of on-screen messages."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+
+from .ack import CommandRejected
+from .commands import encode_command
+
+if TYPE_CHECKING:
+    from .coordinator import MadVRCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# seconds a message stays on screen before the next one may replace it
+MIN_DISPLAY_INTERVAL = 1.5
+# seconds after which a queued message is no longer worth showing
+STALE_AFTER = 10.0
+# messages queued per device, the oldest is dropped beyond this
+MAX_QUEUED = 5
+
+
+@dataclass(slots=True)
+class QueuedMessage:
+    """A message waiting for its turn on screen."""
+
+    payload: bytes
+    queued_at: float
+
+
+class MadVRMessageQueue:
+    """Show messages one at a time through the ack channel.
+
+    A new message replaces a queued one with the same tag, untagged messages
+    replace each other. At most one message is in flight, so a burst of
+    messages takes a single slot of the ack channel and never delays other
+    commands.
+    """
+
+    def __init__(self, coordinator: MadVRCoordinator) -> None:
+        """Initialize the queue."""
+        self.coordinator = coordinator
+        # tag -> message, in the order first queued
+        self._queue: OrderedDict[str, QueuedMessage] = OrderedDict()
+        self._task: asyncio.Task[None] | None = None
+        # stats
+        self.queued = 0
+        self.coalesced = 0
+        self.stale = 0
+        self.dropped = 0
+        self.shown = 0
+        self.failed = 0
+
+    def __len__(self) -> int:
+        """Return the queue depth."""
+        return len(self._queue)
+
+    @callback
+    def async_add(self, message: str, duration: int, tag: str = "") -> bool:
+        """Queue a message, return True if it replaced a queued one."""
+        # the device quotes the text, inner quotes would end it early
+        payload = encode_command(
+            ["DisplayMessage", str(duration), message.replace('"', "'")]
+        )
+        # a replaced message keeps its place in line
+        replaced = tag in self._queue
+        if replaced:
+            self.coalesced += 1
+        elif len(self._queue) >= MAX_QUEUED:
+            self._queue.popitem(last=False)
+            self.dropped += 1
+        self._queue[tag] = QueuedMessage(payload, self.coordinator.hass.loop.time())
+        self.queued += 1
+        if self._task is None or self._task.done():
+            self._task = self.coordinator.hass.async_create_background_task(
+                self._async_drain(), f"madvr messages {self.coordinator.mac}"
+            )
+        return replaced
+
+    async def _async_drain(self) -> None:
+        """Show queued messages, waiting the display interval between them."""
+        loop = self.coordinator.hass.loop
+        while self._queue:
+            _, message = self._queue.popitem(last=False)
+            if loop.time() - message.queued_at > STALE_AFTER:
+                self.stale += 1
+                continue
+            try:
+                await self.coordinator.acks.async_send(message.payload)
+            except (CommandRejected, OSError, TimeoutError) as err:
+                self.failed += 1
+                _LOGGER.debug("Failed to show message: %s", err)
+                continue
+            self.shown += 1
+            await asyncio.sleep(MIN_DISPLAY_INTERVAL)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop queued messages."""
+        self._queue.clear()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return queue stats for diagnostics."""
+        return {
+            "depth": len(self._queue),
+            "queued": self.queued,
+            "coalesced": self.coalesced,
+            "stale": self.stale,
+            "dropped": self.dropped,
+            "shown": self.shown,
+            "failed": self.failed,
+        }
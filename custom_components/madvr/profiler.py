@@ -0,0 +1,120 @@
+"""Opt-in profiling of the madVR push hot path."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import cProfile
+import logging
+from pathlib import Path
+import pstats
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from .coordinator import MadVRCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# coordinator methods wrapped while profiling. async_set_updated_data is the
+# synchronous commit step of _process_update and async_update_listeners runs
+# every entity's _handle_coordinator_update and value_fn
+HOT_PATH = ("handle_push_data", "async_set_updated_data", "async_update_listeners")
+
+# functions listed in the summary
+SUMMARY_LIMIT = 25
+
+_PACKAGE_DIR = str(Path(__file__).parent)
+
+
+class MadVRProfiler:
+    """Deterministic profiler that only runs inside the integration's callbacks.
+
+    Nothing is wrapped until start() is called, so there is no cost when disabled.
+    """
+
+    def __init__(self, coordinator: MadVRCoordinator) -> None:
+        """Initialize the profiler."""
+        self.coordinator = coordinator
+        self._profile = cProfile.Profile()
+        self._depth = 0
+        # name -> [calls, seconds]
+        self._calls: dict[str, list[float]] = {}
+        self._started = time.monotonic()
+
+    def start(self) -> None:
+        """Wrap the hot path of the coordinator."""
+        # fail early if another profiler (e.g. the profiler integration) is active
+        self._profile.enable()
+        self._profile.disable()
+        coordinator = self.coordinator
+        for name in HOT_PATH:
+            # instance attributes shadow the methods until restore()
+            setattr(coordinator, name, self._wrap(name, getattr(coordinator, name)))
+        coordinator.client.set_update_callback(coordinator.handle_push_data)
+        self._started = time.monotonic()
+        _LOGGER.debug("Profiling started for %s", coordinator.mac)
+
+    def restore(self) -> None:
+        """Remove the wrappers."""
+        coordinator = self.coordinator
+        for name in HOT_PATH:
+            vars(coordinator).pop(name, None)
+        if coordinator.client.update_callback is not None:
+            coordinator.client.set_update_callback(coordinator.handle_push_data)
+
+    def _wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Profile calls to func."""
+        profile = self._profile
+        stats = self._calls.setdefault(name, [0, 0.0])
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            self._depth += 1
+            if self._depth == 1:
+                profile.enable()
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats[1] += time.perf_counter() - start
+                stats[0] += 1
+                if self._depth == 1:
+                    profile.disable()
+                self._depth -= 1
+
+        return wrapper
+
+    def write(self, directory: str) -> dict[str, Any]:
+        """Write the profile and return a summary. Runs in the executor."""
+        mac = self.coordinator.mac.replace(":", "")
+        timestamp = dt_util.utcnow().strftime("%Y%m%d%H%M%S")
+        filename = str(Path(directory) / f"madvr_profile_{mac}_{timestamp}.prof")
+        self._profile.dump_stats(filename)
+        return {"filename": filename, **self.summary()}
+
+    def summary(self) -> dict[str, Any]:
+        """Return per-function time spent in the integration's code."""
+        functions = []
+        raw_stats: dict[tuple[str, int, str], tuple[Any, ...]]
+        raw_stats = pstats.Stats(self._profile).stats  # type: ignore[attr-defined]
+        for (path, line, func), (_, calls, tottime, cumtime, _) in raw_stats.items():
+            if not path.startswith(_PACKAGE_DIR) or path == __file__:
+                continue
+            functions.append(
+                {
+                    "function": f"{Path(path).name}:{line}({func})",
+                    "calls": calls,
+                    "total_ms": round(tottime * 1000, 3),
+                    "cumulative_ms": round(cumtime * 1000, 3),
+                }
+            )
+        functions.sort(key=lambda item: item["cumulative_ms"], reverse=True)
+        return {
+            "duration": round(time.monotonic() - self._started, 3),
+            "hot_path": {
+                name: {"calls": int(calls), "total_ms": round(seconds * 1000, 3)}
+                for name, (calls, seconds) in self._calls.items()
+            },
+            "functions": functions[:SUMMARY_LIMIT],
+        }
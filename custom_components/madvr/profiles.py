@@ -0,0 +1,276 @@
+"""Profile index of a madVR, cached on disk and refreshed incrementally."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import logging
+from typing import TYPE_CHECKING, Any
+
+from pymadvr.commands import ACKs, Connections
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+
+from .commands import encode_command
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import MadVRCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# seconds to wait before writing the index after a change
+SAVE_DELAY = 10
+# seconds an enumeration may take
+ENUM_TIMEOUT = 5.0
+# seconds between enumerations, so a profile the device never lists does not
+# trigger one on every push
+MIN_REFRESH_INTERVAL = 300.0
+# seconds before retrying a failed enumeration, doubling up to the interval
+RETRY_DELAY = 15.0
+
+# data keys that can make the index stale
+PROFILE_KEYS = frozenset({"is_on", "profile_name", "profile_num"})
+
+PROFILE_GROUP = b"ProfileGroup"
+PROFILE = b"Profile"
+
+
+@dataclass(slots=True)
+class ProfileGroup:
+    """A profile group and its profiles."""
+
+    group_id: str
+    name: str
+    # profile number -> profile name
+    profiles: dict[str, str] = field(default_factory=dict)
+    # option shown in the select -> ActivateProfile bytes
+    payloads: dict[str, bytes] = field(default_factory=dict)
+    # option -> profile number
+    options: dict[str, str] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        """Pre-encode the command activating each profile."""
+        names = list(self.profiles.values())
+        for number, name in self.profiles.items():
+            # names only have to be unique within the device's menus
+            option = name if names.count(name) == 1 else f"{name} ({number})"
+            self.options[option] = number
+            self.payloads[option] = encode_command(
+                ["ActivateProfile", self.group_id, number]
+            )
+
+    def option(self, number: str | None) -> str | None:
+        """Return the option of a profile number."""
+        for option, option_number in self.options.items():
+            if option_number == number:
+                return option
+        return None
+
+
+class MadVRProfileIndex:
+    """Profile groups read from the device once and kept in storage.
+
+    The index is only enumerated again for a group when the device reports a
+    profile the index does not know.
+    """
+
+    def __init__(self, coordinator: MadVRCoordinator) -> None:
+        """Initialize the index."""
+        self.coordinator = coordinator
+        self._store: Store[dict[str, Any]] = Store(
+            coordinator.hass,
+            STORAGE_VERSION,
+            f"{DOMAIN}.profiles.{coordinator.mac.replace(':', '')}",
+        )
+        self.groups: dict[str, ProfileGroup] = {}
+        # group id -> number of the profile last activated in the group
+        self.active: dict[str, str] = {}
+        self._refresh_task: asyncio.Task[None] | None = None
+        # when the last enumeration succeeded
+        self._refreshed_at: float | None = None
+        self._unsub_retry: CALLBACK_TYPE | None = None
+        self.failures = 0
+        self._listeners: dict[CALLBACK_TYPE, Callable[[], None]] = {}
+        self.enumerations = 0
+
+    async def async_load(self) -> None:
+        """Load the cached index."""
+        if (stored := await self._store.async_load()) is None:
+            return
+        self.groups = {
+            group_id: ProfileGroup(group_id, group["name"], group["profiles"])
+            for group_id, group in stored["groups"].items()
+        }
+        self.active = stored.get("active", {})
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Listen for changes of the index."""
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.pop(remove_listener, None)
+
+        self._listeners[remove_listener] = update_callback
+        return remove_listener
+
+    @callback
+    def async_update(self, data: dict[str, Any]) -> None:
+        """Track the active profile and refresh what the index is missing."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        if not self.groups:
+            # enumerating opens its own connection, it does not wait for the
+            # client's notification connection
+            if data.get("is_on"):
+                self._async_refresh(None)
+            return
+        group_id = data.get("profile_name")
+        number = str(data.get("profile_num"))
+        if group_id is None:
+            return
+        group = self.groups.get(group_id)
+        if group is None or number not in group.profiles:
+            self._async_refresh(group_id)
+        elif self.active.get(group_id) != number:
+            self.active[group_id] = number
+            self._async_changed()
+
+    @callback
+    def _async_refresh(self, group_id: str | None) -> None:
+        """Enumerate all groups, or the profiles of one group."""
+        now = self.coordinator.hass.loop.time()
+        if (
+            self._refreshed_at is not None
+            and now - self._refreshed_at < MIN_REFRESH_INTERVAL
+        ) or self._unsub_retry is not None:
+            return
+        self._refresh_task = self.coordinator.hass.async_create_background_task(
+            self._async_enumerate(group_id), f"madvr profiles {self.coordinator.mac}"
+        )
+
+    async def _async_enumerate(self, group_id: str | None) -> None:
+        """Read groups and profiles from the device."""
+        try:
+            if group_id is not None and group_id in self.groups:
+                targets = [(group_id, self.groups[group_id].name)]
+            else:
+                # everything on first use, later only groups the index lacks
+                targets = [
+                    group
+                    for group in await self._async_list(
+                        ["EnumProfileGroups"], PROFILE_GROUP
+                    )
+                    if group_id is None or group[0] not in self.groups
+                ]
+            for target_id, name in targets:
+                profiles = await self._async_list(["EnumProfiles", target_id], PROFILE)
+                self.groups[target_id] = ProfileGroup(
+                    target_id,
+                    name,
+                    # "Profile SOURCE_1 ..." is profile 1 of group SOURCE
+                    {
+                        profile_id.rsplit("_", 1)[-1]: profile_name
+                        for profile_id, profile_name in profiles
+                    },
+                )
+        except (OSError, TimeoutError) as err:
+            delay = min(RETRY_DELAY * 2**self.failures, MIN_REFRESH_INTERVAL)
+            self.failures += 1
+            _LOGGER.warning(
+                "Failed to read madVR profiles, retrying in %.0f s: %s", delay, err
+            )
+            self._unsub_retry = async_call_later(
+                self.coordinator.hass, delay, self._async_retry
+            )
+            return
+        self._refreshed_at = self.coordinator.hass.loop.time()
+        self.failures = 0
+        self.enumerations += 1
+        if (data := self.coordinator.data).get("profile_name") in self.groups:
+            self.active[data["profile_name"]] = str(data.get("profile_num"))
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        self._async_changed()
+
+    async def _async_list(
+        self, command: list[str], prefix: bytes
+    ) -> list[tuple[str, str]]:
+        """Send an Enum command on its own connection and collect the items."""
+        client = self.coordinator.client
+        async with asyncio.timeout(ENUM_TIMEOUT):
+            reader, writer = await asyncio.open_connection(client.host, client.port)
+            try:
+                if Connections.welcome.value not in await reader.readline():
+                    raise ConnectionError("Did not receive welcome message")
+                writer.write(encode_command(command))
+                await writer.drain()
+                items: list[tuple[str, str]] = []
+                # OK, then one line per item and "<prefix>." after the last one
+                while True:
+                    if not (line := await reader.readline()):
+                        # a list cut short must not be taken for the whole one
+                        raise ConnectionError("Connection closed before the list ended")
+                    line = line.strip()
+                    if line.startswith(ACKs.error.value):
+                        raise ConnectionError(line.decode(errors="ignore"))
+                    if line == prefix + b".":
+                        break
+                    if line.startswith(prefix + b" "):
+                        item_id, _, name = (
+                            line[len(prefix) + 1 :]
+                            .decode(errors="ignore")
+                            .partition(" ")
+                        )
+                        items.append((item_id, name.strip('"') or item_id))
+                return items
+            finally:
+                writer.close()
+
+    @callback
+    def _async_retry(self, _: Any) -> None:
+        """Try the failed enumeration again with the current data."""
+        self._unsub_retry = None
+        self.async_update(self.coordinator.data)
+
+    @callback
+    def _async_changed(self) -> None:
+        """Notify listeners."""
+        for update_callback in list(self._listeners.values()):
+            update_callback()
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the index to store."""
+        return {
+            "groups": {
+                group_id: {"name": group.name, "profiles": group.profiles}
+                for group_id, group in self.groups.items()
+            },
+            "active": self.active,
+        }
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop a running or scheduled enumeration."""
+        if self._unsub_retry is not None:
+            self._unsub_retry()
+            self._unsub_retry = None
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        self._listeners.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return index stats for diagnostics."""
+        return {
+            "groups": {
+                group_id: len(group.profiles) for group_id, group in self.groups.items()
+            },
+            "active": self.active,
+            "enumerations": self.enumerations,
+            "failures": self.failures,
+        }
@@ -0,0 +1,223 @@
+"""On-demand device queries with a TTL cache for madVR."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import logging
+from typing import TYPE_CHECKING, Any
+
+from pymadvr.commands import ACKs, Connections
+from pymadvr.notifications import NotificationProcessor
+
+from .commands import encode_command
+from .const import (
+    ASPECT_DEC,
+    ASPECT_INT,
+    ASPECT_NAME,
+    ASPECT_RES,
+    INCOMING_ASPECT_RATIO,
+    INCOMING_BIT_DEPTH,
+    INCOMING_BLACK_LEVELS,
+    INCOMING_COLOR_SPACE,
+    INCOMING_COLORIMETRY,
+    INCOMING_FRAME_RATE,
+    INCOMING_RES,
+    INCOMING_SIGNAL_TYPE,
+    MASKING_DEC,
+    MASKING_INT,
+    MASKING_RES,
+    OUTGOING_BIT_DEPTH,
+    OUTGOING_BLACK_LEVELS,
+    OUTGOING_COLOR_SPACE,
+    OUTGOING_COLORIMETRY,
+    OUTGOING_FRAME_RATE,
+    OUTGOING_RES,
+    OUTGOING_SIGNAL_TYPE,
+    TEMP_CPU,
+    TEMP_GPU,
+    TEMP_HDMI,
+    TEMP_MAINBOARD,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import MadVRCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Default time a query result is served from cache
+DEFAULT_QUERY_TTL = 5.0
+# seconds a query may take, connecting included
+QUERY_TIMEOUT = 3.0
+
+# query name -> (device command, keys the response populates)
+QUERIES: dict[str, tuple[str, tuple[str, ...]]] = {
+    "incoming_signal": (
+        "GetIncomingSignalInfo",
+        (
+            "is_signal",
+            "hdr_flag",
+            INCOMING_RES,
+            INCOMING_FRAME_RATE,
+            INCOMING_SIGNAL_TYPE,
+            INCOMING_COLOR_SPACE,
+            INCOMING_BIT_DEPTH,
+            INCOMING_COLORIMETRY,
+            INCOMING_BLACK_LEVELS,
+            INCOMING_ASPECT_RATIO,
+        ),
+    ),
+    "outgoing_signal": (
+        "GetOutgoingSignalInfo",
+        (
+            "outgoing_hdr_flag",
+            OUTGOING_RES,
+            OUTGOING_FRAME_RATE,
+            OUTGOING_SIGNAL_TYPE,
+            OUTGOING_COLOR_SPACE,
+            OUTGOING_BIT_DEPTH,
+            OUTGOING_COLORIMETRY,
+            OUTGOING_BLACK_LEVELS,
+        ),
+    ),
+    "aspect_ratio": (
+        "GetAspectRatio",
+        (ASPECT_RES, ASPECT_DEC, ASPECT_INT, ASPECT_NAME),
+    ),
+    "masking_ratio": ("GetMaskingRatio", (MASKING_RES, MASKING_DEC, MASKING_INT)),
+    "temperatures": (
+        "GetTemperatures",
+        (TEMP_GPU, TEMP_HDMI, TEMP_CPU, TEMP_MAINBOARD),
+    ),
+    "mac_address": ("GetMacAddress", ("mac_address",)),
+}
+
+
+@dataclass(slots=True)
+class QueryResult:
+    """Result of a device query."""
+
+    data: dict[str, Any]
+    # loop time the result was fetched at
+    fetched_at: float
+    # True if the device answered the query itself
+    fresh: bool
+
+
+class MadVRQueryCache:
+    """Run Get* commands on demand, caching results and collapsing duplicates."""
+
+    def __init__(
+        self, coordinator: MadVRCoordinator, ttl: float = DEFAULT_QUERY_TTL
+    ) -> None:
+        """Initialize the query cache."""
+        self.coordinator = coordinator
+        self.ttl = ttl
+        self._results: dict[str, QueryResult] = {}
+        self._inflight: dict[str, asyncio.Task[QueryResult]] = {}
+        self._processor = NotificationProcessor(_LOGGER)
+        # stats
+        self.hits = 0
+        self.misses = 0
+        self.collapsed = 0
+        self.last_rtt: float | None = None
+
+    async def async_query(
+        self, query: str, max_age: float | None = None
+    ) -> tuple[QueryResult, bool]:
+        """Return the result for a query and whether it came from cache."""
+        loop = self.coordinator.hass.loop
+        max_age = self.ttl if max_age is None else max_age
+        result = self._results.get(query)
+        if result is not None and loop.time() - result.fetched_at <= max_age:
+            self.hits += 1
+            return result, True
+
+        if (task := self._inflight.get(query)) is None:
+            self.misses += 1
+            task = self.coordinator.hass.async_create_task(
+                self._async_fetch(query), f"madvr query {query}"
+            )
+            self._inflight[query] = task
+        else:
+            self.collapsed += 1
+        # shield so one caller going away does not cancel the shared request
+        return await asyncio.shield(task), False
+
+    async def _async_fetch(self, query: str) -> QueryResult:
+        """Send the query command to the device and parse the reply."""
+        command, keys = QUERIES[query]
+        loop = self.coordinator.hass.loop
+        try:
+            start = loop.time()
+            try:
+                response = await self._async_request(command)
+            except TimeoutError as err:
+                raise ConnectionError(f"No reply to {command}") from err
+            except OSError as err:
+                raise ConnectionError(f"Failed to connect: {err}") from err
+            self.last_rtt = loop.time() - start
+            parsed = await self._processor.process_notifications(response)
+            fresh = all(key in parsed for key in keys)
+            if not fresh:
+                # the reply leaves out fields, such as the aspect name when
+                # there is none; fall back to the latest pushed values
+                _LOGGER.debug("Query %s answered with %s", query, response)
+            data = {
+                key: parsed[key] if key in parsed else self.coordinator.data.get(key)
+                for key in keys
+            }
+            result = QueryResult(data=data, fetched_at=loop.time(), fresh=fresh)
+            self._results[query] = result
+            return result
+        finally:
+            self._inflight.pop(query, None)
+
+    async def _async_request(self, command: str) -> str:
+        """Send a Get command on its own connection and return its data line.
+
+        The pooled client connection returns after a single read, usually with
+        just the OK, so the reply is read here until the line answering the
+        command, skipping the OK and any notification before it.
+        """
+        client = self.coordinator.client
+        # the device answers GetTemperatures with a Temperatures line
+        title = command.removeprefix("Get").encode()
+        async with asyncio.timeout(QUERY_TIMEOUT):
+            reader, writer = await asyncio.open_connection(client.host, client.port)
+            try:
+                if Connections.welcome.value not in await reader.readline():
+                    raise ConnectionError("Did not receive welcome message")
+                writer.write(encode_command(command))
+                await writer.drain()
+                while line := await reader.readline():
+                    line = line.strip()
+                    if line.startswith(ACKs.error.value):
+                        raise ConnectionError(line.decode(errors="ignore"))
+                    if line.partition(b" ")[0] == title:
+                        return line.decode(errors="ignore")
+                raise ConnectionError("Connection closed")
+            finally:
+                writer.close()
+
+    def invalidate(self) -> None:
+        """Drop all cached results."""
+        self._results.clear()
+
+    def cancel(self) -> None:
+        """Cancel queries still waiting on the device."""
+        for task in self._inflight.values():
+            task.cancel()
+        self._inflight.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return cache stats for diagnostics."""
+        return {
+            "ttl": self.ttl,
+            "cached": sorted(self._results),
+            "inflight": sorted(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "collapsed": self.collapsed,
+            "last_rtt": self.last_rtt,
+        }
@@ -70,6 +70,13 @@ class MadvrRemote(MadVREntity, RemoteEntity):
 
     async def async_send_command(self, command: Iterable[str], **kwargs: Any) -> None:
         """Send a command to one device."""
+        if not self.madvr_client.connected:
+            # sent in one batch once the device is back
+            try:
+                self.coordinator.buffer.async_add(list(command))
+            except ValueError as err:
+                _LOGGER.error("Failed to send command %s", err)
+            return
         _LOGGER.debug("adding command %s", command)
         try:
             await self.madvr_client.add_command_to_queue(command)
@@ -0,0 +1,286 @@
+"""Find the device by its MAC when it moved to a new address."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from ipaddress import ip_network
+import logging
+import random
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.device_registry import format_mac
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util.network import is_ipv4_address
+
+from .commands import encode_command
+
+if TYPE_CHECKING:
+    from pymadvr.madvr import Madvr
+
+    from .coordinator import MadVRCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# how often the connection is checked while the device is unreachable
+CHECK_INTERVAL = timedelta(seconds=15)
+# failed connection attempts to the old address before the first sweep
+SWEEP_AFTER_FAILURES = 4
+# seconds between sweeps, doubling after each one, plus up to the jitter so
+# the entries of several devices do not sweep at once
+SWEEP_INTERVAL = 300.0
+SWEEP_JITTER = 60.0
+# sweeps that did not find the device before giving up until it reconnects
+MAX_SWEEPS = 3
+# concurrent probes of a sweep and the time one probe may take
+PROBE_PARALLEL = 64
+PROBE_TIMEOUT = 2.0
+NEIGHBOUR_TABLE = "/proc/net/arp"
+
+
+def read_neighbours(path: str = NEIGHBOUR_TABLE) -> dict[str, str]:
+    """Return MAC -> IPv4 address from the kernel's neighbour table."""
+    try:
+        with open(path, encoding="ascii") as file:
+            lines = file.read().splitlines()[1:]
+    except OSError:
+        # not on Linux, or no access in a container
+        return {}
+    neighbours: dict[str, str] = {}
+    for line in lines:
+        fields = line.split()
+        # incomplete entries have no flags and a zero MAC
+        if len(fields) >= 4 and fields[2] != "0x0":
+            neighbours[format_mac(fields[3])] = fields[0]
+    return neighbours
+
+
+async def async_probe_mac(host: str, port: int) -> str | None:
+    """Return the MAC of a madVR listening at host, None if there is none."""
+    writer: asyncio.StreamWriter | None = None
+    try:
+        async with asyncio.timeout(PROBE_TIMEOUT):
+            reader, writer = await asyncio.open_connection(host, port)
+            if b"WELCOME" not in await reader.read(1024):
+                return None
+            writer.write(encode_command("GetMacAddress"))
+            await writer.drain()
+            # the reply is an OK line, then the MAC amongst any notifications
+            while line := await reader.readline():
+                title, _, value = line.decode(errors="ignore").strip().partition(" ")
+                if title == "MacAddress":
+                    return format_mac(value)
+    except (OSError, TimeoutError):
+        return None
+    finally:
+        if writer is not None:
+            writer.close()
+    return None
+
+
+class MadVRHostResolver:
+    """Move the entry to the device's new address after DHCP changed it.
+
+    The client only connects while it believes the device is on, a power off
+    or standby notification stops it. So only after the client failed to
+    connect is the device missing rather than switched off, and only then
+    does each check try the old address, until the client connects. Once
+    that fails, the MAC is looked up in the neighbour table, which finds the
+    device as soon as the host has talked to it. Only when connecting keeps
+    failing and the table has no usable address is the /24 around the old
+    address swept for port 44077, a bounded number of times, since a device
+    that is switched off is unreachable too. A verified new address is
+    written to the entry, whose update listener reloads it onto a client for
+    that address.
+    """
+
+    def __init__(self, coordinator: MadVRCoordinator) -> None:
+        """Initialize the resolver."""
+        self.coordinator = coordinator
+        self._mac = format_mac(coordinator.mac)
+        self._unsub_check: CALLBACK_TYPE | None = None
+        self._task: asyncio.Task[None] | None = None
+        # failed connection attempts of the client since it was last connected
+        self._link_failures = 0
+        # failed probes of the old address in a row
+        self._connect_failures = 0
+        self._failed_sweeps = 0
+        self._next_sweep = 0.0
+        # stats
+        self.lookups = 0
+        self.sweeps = 0
+        self.probes = 0
+        self.moves = 0
+        self.last_move: dict[str, Any] | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Count the client's failed connections and check them periodically."""
+        # a host name is left to DNS
+        if not is_ipv4_address(self.coordinator.client.host):
+            return
+        self._watch_connect(self.coordinator.client)
+        self._unsub_check = async_track_time_interval(
+            self.coordinator.hass,
+            self._async_check,
+            CHECK_INTERVAL,
+            name=f"madVR {self.coordinator.mac} resolver",
+            cancel_on_shutdown=True,
+        )
+
+    def _watch_connect(self, client: Madvr) -> None:
+        """Count the failures of the client's notification connection.
+
+        Shadowed by an instance attribute like the startup timer does, the
+        coordinator's cleanup removes it.
+        """
+        establish = client._establish_notification_connection
+
+        async def counted_establish() -> None:
+            try:
+                await establish()
+            except ConnectionError:
+                self._link_failures += 1
+                raise
+            self._link_failures = 0
+
+        client._establish_notification_connection = counted_establish  # type: ignore[method-assign]
+
+    @callback
+    def _async_check(self, now: datetime) -> None:
+        """Start a lookup if the client failed to connect since it last did."""
+        if self.coordinator.client.connected:
+            self._link_failures = 0
+            self._connect_failures = 0
+            self._failed_sweeps = 0
+            self._next_sweep = 0.0
+            return
+        if not self._link_failures:
+            # disconnected by a power off, or never connected
+            return
+        if self._task is not None and not self._task.done():
+            return
+        self._task = self.coordinator.hass.async_create_background_task(
+            self._async_resolve(), f"madVR {self.coordinator.mac} resolve"
+        )
+
+    async def _async_resolve(self) -> None:
+        """Look for the device at another address and move the entry there."""
+        entry = self.coordinator.config_entry
+        host: str = entry.data[CONF_HOST]
+        port: int = entry.data[CONF_PORT]
+        self.probes += 1
+        if await async_probe_mac(host, port) == self._mac:
+            # still there, the client reconnects on its own
+            self._connect_failures = 0
+            return
+        self._connect_failures += 1
+        self.lookups += 1
+        neighbours = await self.coordinator.hass.async_add_executor_job(read_neighbours)
+        if (neighbour := neighbours.get(self._mac)) == host:
+            # known at the old address, it is switched off rather than moved
+            return
+        if neighbour is not None and (
+            new_host := await self._async_find([neighbour], port)
+        ):
+            self._async_move(host, new_host, swept=False)
+            return
+        # the MAC is missing from the table, or its address does not answer
+        if not self._async_sweep_due():
+            return
+        self.sweeps += 1
+        network = ip_network(f"{host}/24", strict=False)
+        candidates = [
+            str(address) for address in network.hosts() if str(address) != host
+        ]
+        if (new_host := await self._async_find(candidates, port)) is not None:
+            self._async_move(host, new_host, swept=True)
+            return
+        self._failed_sweeps += 1
+        if self._failed_sweeps == MAX_SWEEPS:
+            _LOGGER.info(
+                "madVR %s not found around %s after %s sweeps, "
+                "not sweeping again until it reconnects",
+                self.coordinator.mac,
+                host,
+                MAX_SWEEPS,
+            )
+
+    @callback
+    def _async_sweep_due(self) -> bool:
+        """Return if a sweep may run now, scheduling the one after it."""
+        if (
+            self._connect_failures < SWEEP_AFTER_FAILURES
+            or self._failed_sweeps >= MAX_SWEEPS
+        ):
+            return False
+        loop_time = self.coordinator.hass.loop.time()
+        if not self._next_sweep:
+            # spread the first sweep of devices that went away together
+            self._next_sweep = loop_time + random.uniform(0, SWEEP_JITTER)
+        if loop_time < self._next_sweep:
+            return False
+        self._next_sweep = (
+            loop_time
+            + SWEEP_INTERVAL * 2**self._failed_sweeps
+            + random.uniform(0, SWEEP_JITTER)
+        )
+        return True
+
+    @callback
+    def _async_move(self, host: str, new_host: str, swept: bool) -> None:
+        """Point the entry at the device's new address."""
+        self.moves += 1
+        self.last_move = {"from": host, "to": new_host, "swept": swept}
+        _LOGGER.info(
+            "madVR %s moved from %s to %s", self.coordinator.mac, host, new_host
+        )
+        entry = self.coordinator.config_entry
+        self.coordinator.hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_HOST: new_host}
+        )
+
+    async def _async_find(self, candidates: list[str], port: int) -> str | None:
+        """Return the first candidate answering with the device's MAC."""
+        semaphore = asyncio.Semaphore(PROBE_PARALLEL)
+
+        async def probe(host: str) -> str | None:
+            async with semaphore:
+                self.probes += 1
+                return host if await async_probe_mac(host, port) == self._mac else None
+
+        tasks = [asyncio.create_task(probe(host)) for host in candidates]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                if (found := await next_done) is not None:
+                    return found
+        finally:
+            for task in tasks:
+                task.cancel()
+        return None
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop checking and abandon a running lookup."""
+        if self._unsub_check is not None:
+            self._unsub_check()
+            self._unsub_check = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return resolver stats for diagnostics."""
+        return {
+            "active": self._unsub_check is not None,
+            "link_failures": self._link_failures,
+            "connect_failures": self._connect_failures,
+            "lookups": self.lookups,
+            "sweeps": self.sweeps,
+            "failed_sweeps": self._failed_sweeps,
+            "probes": self.probes,
+            "moves": self.moves,
+            "last_move": self.last_move,
+        }
@@ -0,0 +1,223 @@
+"""Suspend the client's background tasks while the madVR is idle."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Coroutine
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_call_later
+
+if TYPE_CHECKING:
+    from pymadvr.madvr import Madvr
+
+    from .coordinator import MadVRCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# seconds the device has to stay off before tasks are suspended, so a
+# quick power cycle or input switch does not restart everything
+LOW_POWER_DELAY = 30.0
+
+# keys that decide between full and low power cadence
+ACTIVITY_KEYS = frozenset({"is_on", "is_signal", "standby"})
+
+# client task attribute -> (wrapper starting it, task name), as in
+# Madvr.async_add_tasks. The ping task is not listed, it keeps running at its
+# 10 second interval and is what notices the device waking up
+SUSPENDABLE_TASKS: dict[str, tuple[str, str]] = {
+    "notification_task": ("_notification_task_wrapper", "notifications"),
+    "notification_heartbeat_task": (
+        "_notification_heartbeat_wrapper",
+        "notification_heartbeat",
+    ),
+    "refresh_task": ("_refresh_task_wrapper", "refresh"),
+    "queue_task": ("_queue_task_wrapper", "queue"),
+}
+
+# client task attribute -> wrapper starting it, for every task whose wakeups
+# are counted
+COUNTED_TASKS: dict[str, str] = {
+    **{attribute: wrapper for attribute, (wrapper, _) in SUSPENDABLE_TASKS.items()},
+    "ping_task": "_ping_task_wrapper",
+}
+
+
+class _CountingCoroutine(Coroutine[Any, Any, Any]):
+    """Run a coroutine, counting each time the loop resumes it."""
+
+    __slots__ = ("_coro", "_counter")
+
+    def __init__(self, coro: Coroutine[Any, Any, Any], counter: WakeupCounter) -> None:
+        self._coro = coro
+        self._counter = counter
+
+    def send(self, value: Any) -> Any:
+        self._counter.wakeups += 1
+        return self._coro.send(value)
+
+    def throw(self, *args: Any) -> Any:
+        self._counter.wakeups += 1
+        return self._coro.throw(*args)
+
+    def close(self) -> None:
+        self._coro.close()
+
+    def __await__(self) -> _CountingCoroutine:
+        return self
+
+    def __iter__(self) -> _CountingCoroutine:
+        return self
+
+    def __next__(self) -> Any:
+        return self.send(None)
+
+
+class WakeupCounter:
+    """Start a client task through its wrapper and count the task's wakeups.
+
+    Installed on the client instance in place of the wrapper, so the tasks
+    the library starts and the ones resumed here are both counted. It stays
+    on the client, a reload that reuses the client keeps counting.
+    """
+
+    def __init__(self, start: Callable[[], Coroutine[Any, Any, Any]]) -> None:
+        """Initialize the counter."""
+        self._start = start
+        self.wakeups = 0
+
+    def __call__(self) -> _CountingCoroutine:
+        """Return the task's coroutine."""
+        return _CountingCoroutine(self._start(), self)
+
+
+class MadVRTaskScheduler:
+    """Switch the client between full and low power task schedules."""
+
+    def __init__(self, coordinator: MadVRCoordinator) -> None:
+        """Initialize the scheduler."""
+        self.coordinator = coordinator
+        self.low_power = False
+        self._unsub_suspend: CALLBACK_TYPE | None = None
+        self._counters = self._watch(coordinator.client)
+        self._mode_since = time.monotonic()
+        self._wakeups_since = self._wakeups()
+        # seconds spent and task wakeups counted in each mode
+        self._seconds = {"full": 0.0, "low_power": 0.0}
+        self._mode_wakeups = {"full": 0, "low_power": 0}
+        self.suspends = 0
+        self.resumes = 0
+
+    @staticmethod
+    def _watch(client: Madvr) -> dict[str, WakeupCounter]:
+        """Count the wakeups of the client's tasks, started from now on."""
+        counters: dict[str, WakeupCounter] = {}
+        for attribute, wrapper in COUNTED_TASKS.items():
+            if not isinstance(counter := getattr(client, wrapper), WakeupCounter):
+                counter = WakeupCounter(counter)
+                setattr(client, wrapper, counter)
+            counters[attribute] = counter
+        return counters
+
+    def _wakeups(self) -> int:
+        """Return the wakeups counted over all tasks."""
+        return sum(counter.wakeups for counter in self._counters.values())
+
+    @callback
+    def async_update(self, data: dict[str, Any]) -> None:
+        """Pick the schedule for the device's current state."""
+        idle = (not data.get("is_on") or data.get("standby")) and not data.get(
+            "is_signal"
+        )
+        if not idle:
+            if self._unsub_suspend is not None:
+                self._unsub_suspend()
+                self._unsub_suspend = None
+            # also covers a client reused from before a reload while suspended
+            self._async_resume()
+        elif not self.low_power and self._unsub_suspend is None:
+            self._unsub_suspend = async_call_later(
+                self.coordinator.hass, LOW_POWER_DELAY, self._async_suspend
+            )
+
+    @callback
+    def _async_suspend(self, _: Any) -> None:
+        """Cancel the tasks that only matter while the device is on."""
+        self._unsub_suspend = None
+        client = self.coordinator.client
+        for attribute in SUSPENDABLE_TASKS:
+            if (task := getattr(client, attribute)) is not None and not task.done():
+                task.cancel()
+        self._async_set_mode(low_power=True)
+        self.suspends += 1
+        _LOGGER.debug("Device idle, suspended background tasks")
+
+    @callback
+    def _async_resume(self) -> None:
+        """Restart the suspended tasks."""
+        client = self.coordinator.client
+        hass = self.coordinator.hass
+        suspended = [
+            attribute
+            for attribute in SUSPENDABLE_TASKS
+            if (task := getattr(client, attribute)) is None or task.done()
+        ]
+        if not suspended:
+            return
+        for attribute in suspended:
+            wrapper, name = SUSPENDABLE_TASKS[attribute]
+            setattr(
+                client,
+                attribute,
+                hass.async_create_background_task(
+                    getattr(client, wrapper)(), f"madvr {name}"
+                ),
+            )
+        self._async_set_mode(low_power=False)
+        self.resumes += 1
+        _LOGGER.debug("Device active, resumed background tasks")
+
+    @callback
+    def _async_set_mode(self, low_power: bool) -> None:
+        """Account the time and wakeups of the current mode and switch."""
+        now = time.monotonic()
+        wakeups = self._wakeups()
+        mode = "low_power" if self.low_power else "full"
+        self._seconds[mode] += now - self._mode_since
+        self._mode_wakeups[mode] += wakeups - self._wakeups_since
+        self._mode_since = now
+        self._wakeups_since = wakeups
+        self.low_power = low_power
+        self.coordinator.governor.async_update_activity()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel a pending suspend."""
+        if self._unsub_suspend is not None:
+            self._unsub_suspend()
+            self._unsub_suspend = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the schedule and the measured wakeups for diagnostics."""
+        seconds = dict(self._seconds)
+        wakeups = dict(self._mode_wakeups)
+        mode = "low_power" if self.low_power else "full"
+        seconds[mode] += time.monotonic() - self._mode_since
+        wakeups[mode] += self._wakeups() - self._wakeups_since
+        return {
+            "mode": mode,
+            "suspends": self.suspends,
+            "resumes": self.resumes,
+            "seconds": {key: round(value) for key, value in seconds.items()},
+            "wakeups": wakeups,
+            "wakeups_per_hour": {
+                key: round(wakeups[key] * 3600 / seconds[key]) if seconds[key] else None
+                for key in seconds
+            },
+            "task_wakeups": {
+                attribute: counter.wakeups
+                for attribute, counter in self._counters.items()
+            },
+        }
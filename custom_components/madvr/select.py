@@ -0,0 +1,95 @@
+"""Select entities for the madVR profile groups."""
+
+from __future__ import annotations
+
+from homeassistant.components.select import SelectEntity
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from . import MadVRConfigEntry
+from .ack import CommandRejected
+from .const import DOMAIN
+from .coordinator import MadVRCoordinator
+from .entity import MadVREntity
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: MadVRConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up a select for each profile group in the index."""
+    coordinator = entry.runtime_data
+    index = coordinator.profiles
+    added: set[str] = set()
+
+    @callback
+    def async_add_groups() -> None:
+        """Add selects for groups the index learned about."""
+        new = [group_id for group_id in index.groups if group_id not in added]
+        added.update(new)
+        async_add_entities(
+            MadvrProfileSelect(coordinator, group_id) for group_id in new
+        )
+
+    async_add_groups()
+    entry.async_on_unload(index.async_add_listener(async_add_groups))
+
+
+class MadvrProfileSelect(MadVREntity, SelectEntity):
+    """Select activating a profile of one profile group."""
+
+    def __init__(self, coordinator: MadVRCoordinator, group_id: str) -> None:
+        """Initialize the select."""
+        super().__init__(coordinator)
+        self.group_id = group_id
+        self._attr_name = coordinator.profiles.groups[group_id].name
+        self._attr_unique_id = f"{coordinator.mac}_profile_{group_id}"
+
+    async def async_added_to_hass(self) -> None:
+        """Also update when the profile index changes."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.profiles.async_add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def options(self) -> list[str]:
+        """Return the profiles of the group."""
+        return list(self.coordinator.profiles.groups[self.group_id].options)
+
+    @property
+    def current_option(self) -> str | None:
+        """Return the profile last activated in the group."""
+        index = self.coordinator.profiles
+        return index.groups[self.group_id].option(index.active.get(self.group_id))
+
+    async def async_select_option(self, option: str) -> None:
+        """Activate a profile."""
+        group = self.coordinator.profiles.groups[self.group_id]
+        if not self.coordinator.client.connected:
+            # sent in one batch once the device is back
+            self.coordinator.buffer.async_add(
+                ["ActivateProfile", self.group_id, group.options[option]]
+            )
+            return
+        try:
+            await self.coordinator.acks.async_send(group.payloads[option])
+        except CommandRejected as err:
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="command_rejected",
+                translation_placeholders={
+                    "command": f"ActivateProfile {self.group_id} {option}"
+                },
+            ) from err
+        except (OSError, TimeoutError) as err:
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="command_failed",
+                translation_placeholders={
+                    "command": f"ActivateProfile {self.group_id} {option}",
+                    "error": str(err) or type(err).__name__,
+                },
+            ) from err
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -11,7 +12,7 @@ from homeassistant.components.sensor import (
     SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import UnitOfTemperature
+from homeassistant.const import UnitOfTemperature, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
@@ -30,6 +31,7 @@ from .const import (
     INCOMING_FRAME_RATE,
     INCOMING_RES,
     INCOMING_SIGNAL_TYPE,
+    LAST_SESSION,
     MASKING_DEC,
     MASKING_INT,
     MASKING_RES,
@@ -40,6 +42,7 @@ from .const import (
     OUTGOING_FRAME_RATE,
     OUTGOING_RES,
     OUTGOING_SIGNAL_TYPE,
+    SCALING_FACTOR,
     TEMP_CPU,
     TEMP_GPU,
     TEMP_HDMI,
@@ -47,6 +50,7 @@ from .const import (
 )
 from .coordinator import MadVRCoordinator
 from .entity import MadVREntity
+from .statistics import TEMPERATURE_KEYS
 
 
 def is_valid_temperature(value: float | None) -> bool:
@@ -64,11 +68,28 @@ def get_temperature(coordinator: MadVRCoordinator, key: str) -> float | None:
         return temp if is_valid_temperature(temp) else None
 
 
+def get_last_session_duration(coordinator: MadVRCoordinator) -> float | None:
+    """Return the length of the running or last viewing session in minutes."""
+    if (session := coordinator.sessions.last) is None:
+        return None
+    return round(session.duration / 60, 1)
+
+
+def get_last_session_attributes(coordinator: MadVRCoordinator) -> dict[str, Any] | None:
+    """Return the details of the running or last viewing session."""
+    if (session := coordinator.sessions.last) is None:
+        return None
+    attributes = session.as_dict()
+    attributes["active"] = session is coordinator.sessions.current
+    return attributes
+
+
 @dataclass(frozen=True, kw_only=True)
 class MadvrSensorEntityDescription(SensorEntityDescription):
     """Describe madVR sensor entity."""
 
     value_fn: Callable[[MadVRCoordinator], StateType]
+    attributes_fn: Callable[[MadVRCoordinator], dict[str, Any] | None] | None = None
 
 
 SENSORS: tuple[MadvrSensorEntityDescription, ...] = (
@@ -248,6 +269,21 @@ SENSORS: tuple[MadvrSensorEntityDescription, ...] = (
         translation_key=MASKING_INT,
         entity_registry_enabled_default=False,
     ),
+    MadvrSensorEntityDescription(
+        key=SCALING_FACTOR,
+        value_fn=lambda coordinator: coordinator.derived.values[SCALING_FACTOR],
+        translation_key=SCALING_FACTOR,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    MadvrSensorEntityDescription(
+        key=LAST_SESSION,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        value_fn=get_last_session_duration,
+        attributes_fn=get_last_session_attributes,
+        translation_key=LAST_SESSION,
+    ),
 )
 
 
@@ -273,7 +309,23 @@ class MadvrSensor(MadVREntity, SensorEntity):
         super().__init__(coordinator)
         self.entity_description: MadvrSensorEntityDescription = description
         self._attr_unique_id = f"{coordinator.mac}_{description.key}"
+        self._priority_key = description.key
         self._previous_value = None
+        # hourly statistics are imported instead, only write real changes
+        self._deadband = False
+        if coordinator.statistics.enabled and description.key in TEMPERATURE_KEYS:
+            self._attr_state_class = None
+            self._deadband = True
+
+    async def async_added_to_hass(self) -> None:
+        """Count the temperature sensors whose statistics are imported."""
+        await super().async_added_to_hass()
+        if self._deadband:
+            statistics = self.coordinator.statistics
+            statistics.sensors.add(self.entity_description.key)
+            self.async_on_remove(
+                lambda: statistics.sensors.discard(self.entity_description.key)
+            )
 
     @property
     def native_value(self) -> float | str | None:
@@ -290,12 +342,31 @@ class MadvrSensor(MadVREntity, SensorEntity):
             return None
 
         return val
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return additional attributes of the sensor."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self.coordinator)
     
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         # Get the new value
         new_value = self.native_value
         
+        # temperatures within the deadband are left to the hourly statistics
+        if (
+            self._deadband
+            and isinstance(new_value, float)
+            and isinstance(self._previous_value, float)
+            and 0
+            < abs(new_value - self._previous_value)
+            < self.coordinator.statistics.deadband
+        ):
+            self.coordinator.statistics.suppressed_writes += 1
+            return
+
         # Always update on first run (when _previous_value is None)
         # or when value has actually changed
         if self._previous_value is None or new_value != self._previous_value:
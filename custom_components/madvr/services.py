@@ -0,0 +1,477 @@
+"""Services for the madVR integration."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, cast
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .ack import CommandRejected, MadVRAckChannel
+from .commands import encode_command
+from .const import (
+    ATTR_COMMAND,
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_DURATION,
+    ATTR_HDR,
+    ATTR_LIMIT,
+    ATTR_MACRO,
+    ATTR_MAX_AGE,
+    ATTR_MAX_SIZE,
+    ATTR_MESSAGE,
+    ATTR_QUERY,
+    ATTR_SINCE,
+    ATTR_TAG,
+    ATTR_TIMEOUT,
+    DOMAIN,
+)
+from .query import QUERIES
+from .tracing import DEFAULT_TRACE_MAX_BYTES
+
+if TYPE_CHECKING:
+    from . import MadVRConfigEntry
+
+SERVICE_GET_SESSIONS = "get_sessions"
+SERVICE_GET_SESSIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): str,
+        vol.Optional(ATTR_SINCE): cv.datetime,
+        vol.Optional(ATTR_HDR): cv.boolean,
+        vol.Optional(ATTR_LIMIT): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+
+SERVICE_SEND_COMMAND = "send_command"
+SERVICE_SEND_COMMAND_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): str,
+        vol.Required(ATTR_COMMAND): vol.All(cv.ensure_list, [cv.string]),
+        # seconds each command waits for its ack
+        vol.Optional(ATTR_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=30)
+        ),
+    }
+)
+
+SERVICE_BROADCAST_COMMAND = "broadcast_command"
+SERVICE_BROADCAST_COMMAND_SCHEMA = vol.Schema(
+    {
+        # all loaded devices when left out
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [str]),
+        vol.Required(ATTR_COMMAND): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=30)
+        ),
+    }
+)
+# devices commanded at the same time by broadcast_command
+BROADCAST_PARALLEL = 64
+
+SERVICE_DISPLAY_MESSAGE = "display_message"
+SERVICE_DISPLAY_MESSAGE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): str,
+        vol.Required(ATTR_MESSAGE): vol.All(cv.string, vol.Length(min=1, max=100)),
+        # seconds the device shows the message
+        vol.Optional(ATTR_DURATION, default=3): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=60)
+        ),
+        vol.Optional(ATTR_TAG, default=""): cv.string,
+    }
+)
+
+SERVICE_RUN_MACRO = "run_macro"
+SERVICE_RUN_MACRO_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): str,
+        vol.Required(ATTR_MACRO): cv.string,
+    }
+)
+
+SERVICE_START_PROFILING = "start_profiling"
+SERVICE_STOP_PROFILING = "stop_profiling"
+SERVICE_PROFILING_SCHEMA = vol.Schema({vol.Required(ATTR_CONFIG_ENTRY_ID): str})
+
+SERVICE_START_TRACING = "start_tracing"
+SERVICE_START_TRACING_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): str,
+        # megabytes per trace file before it is rotated
+        vol.Optional(
+            ATTR_MAX_SIZE, default=DEFAULT_TRACE_MAX_BYTES // (1024 * 1024)
+        ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1024)),
+    }
+)
+SERVICE_STOP_TRACING = "stop_tracing"
+SERVICE_STOP_TRACING_SCHEMA = vol.Schema({vol.Required(ATTR_CONFIG_ENTRY_ID): str})
+
+SERVICE_QUERY = "query"
+SERVICE_QUERY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): str,
+        vol.Required(ATTR_QUERY): vol.In(list(QUERIES)),
+        vol.Optional(ATTR_MAX_AGE): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    }
+)
+
+
+def async_get_entry(hass: HomeAssistant, config_entry_id: str) -> MadVRConfigEntry:
+    """Get a loaded madVR config entry."""
+    entry = hass.config_entries.async_get_entry(config_entry_id)
+    if entry is None or entry.domain != DOMAIN:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="integration_not_found",
+            translation_placeholders={"target": config_entry_id},
+        )
+    if entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="not_loaded",
+            translation_placeholders={"target": entry.title},
+        )
+    return cast("MadVRConfigEntry", entry)
+
+
+def _encode_commands(commands: list[str]) -> list[bytes]:
+    """Encode service commands, raising a validation error for unknown ones."""
+    try:
+        return [encode_command(command) for command in commands]
+    except ValueError as err:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="invalid_command",
+            translation_placeholders={"error": str(err)},
+        ) from err
+
+
+async def _async_send_payloads(
+    acks: MadVRAckChannel, payloads: list[bytes], timeout: float | None
+) -> list[Any]:
+    """Send pipelined, return each ack latency or exception in order."""
+    # the channel keeps at most its window of commands in flight
+    return await asyncio.gather(
+        *(acks.async_send(payload, timeout) for payload in payloads),
+        return_exceptions=True,
+    )
+
+
+def _command_error(command: str, error: BaseException) -> HomeAssistantError:
+    """Return the service error for a failed command."""
+    if isinstance(error, CommandRejected):
+        return HomeAssistantError(
+            translation_domain=DOMAIN,
+            translation_key="command_rejected",
+            translation_placeholders={"command": command},
+        )
+    return HomeAssistantError(
+        translation_domain=DOMAIN,
+        translation_key="command_failed",
+        translation_placeholders={
+            "command": command,
+            "error": str(error) or type(error).__name__,
+        },
+    )
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Set up the services for the madVR integration."""
+
+    async def async_query(call: ServiceCall) -> ServiceResponse:
+        """Query the device, serving recent answers from cache."""
+        entry = async_get_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        query = call.data[ATTR_QUERY]
+        queries = entry.runtime_data.queries
+        try:
+            result, cached = await queries.async_query(
+                query, call.data.get(ATTR_MAX_AGE)
+            )
+        except (ConnectionError, NotImplementedError) as err:
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="query_failed",
+                translation_placeholders={"query": query, "error": str(err)},
+            ) from err
+        return {
+            "query": query,
+            "data": result.data,
+            "cached": cached,
+            "fresh": result.fresh,
+            "age": round(hass.loop.time() - result.fetched_at, 3),
+        }
+
+    async def async_get_sessions(call: ServiceCall) -> ServiceResponse:
+        """Return the stored viewing sessions."""
+        sessions = async_get_entry(
+            hass, call.data[ATTR_CONFIG_ENTRY_ID]
+        ).runtime_data.sessions
+        since = call.data.get(ATTR_SINCE)
+        found = sessions.query(
+            since=dt_util.as_utc(since) if since else None,
+            hdr=call.data.get(ATTR_HDR),
+            limit=call.data.get(ATTR_LIMIT),
+        )
+        return {
+            "current": sessions.current.as_dict() if sessions.current else None,
+            "sessions": [session.as_dict() for session in found],
+        }
+
+    async def async_send_command(call: ServiceCall) -> ServiceResponse:
+        """Send commands pipelined and return once the device acked all of them."""
+        entry = async_get_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        commands: list[str] = call.data[ATTR_COMMAND]
+        payloads = _encode_commands(commands)
+
+        start = time.perf_counter()
+        results = await _async_send_payloads(
+            entry.runtime_data.acks, payloads, call.data.get(ATTR_TIMEOUT)
+        )
+        duration = time.perf_counter() - start
+        for command, result in zip(commands, results, strict=True):
+            if isinstance(result, Exception):
+                raise _command_error(command, result) from result
+        if not call.return_response:
+            return None
+        return {
+            "duration_ms": round(duration * 1000, 1),
+            "commands": [
+                {"command": command, "latency_ms": round(latency * 1000, 1)}
+                for command, latency in zip(commands, results, strict=True)
+            ],
+        }
+
+    async def async_broadcast_command(call: ServiceCall) -> ServiceResponse:
+        """Send commands to many devices at once and report each result."""
+        if ATTR_CONFIG_ENTRY_ID in call.data:
+            entries = [
+                async_get_entry(hass, entry_id)
+                for entry_id in call.data[ATTR_CONFIG_ENTRY_ID]
+            ]
+        else:
+            entries = hass.config_entries.async_loaded_entries(DOMAIN)
+        commands: list[str] = call.data[ATTR_COMMAND]
+        payloads = _encode_commands(commands)
+        timeout = call.data.get(ATTR_TIMEOUT)
+        semaphore = asyncio.Semaphore(BROADCAST_PARALLEL)
+
+        async def async_send(entry: MadVRConfigEntry) -> dict[str, Any]:
+            """Send the commands to one device."""
+            async with semaphore:
+                start = time.perf_counter()
+                results = await _async_send_payloads(
+                    entry.runtime_data.acks, payloads, timeout
+                )
+            result: dict[str, Any] = {
+                "config_entry_id": entry.entry_id,
+                "title": entry.title,
+                "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+            }
+            for command, command_result in zip(commands, results, strict=True):
+                if isinstance(command_result, CommandRejected):
+                    result["error"] = f"{command} rejected"
+                    break
+                if isinstance(command_result, Exception):
+                    result["error"] = (
+                        f"{command} failed: "
+                        f"{str(command_result) or type(command_result).__name__}"
+                    )
+                    break
+            result["success"] = "error" not in result
+            return result
+
+        start = time.perf_counter()
+        devices = await asyncio.gather(*(async_send(entry) for entry in entries))
+        duration = time.perf_counter() - start
+        failed = [device for device in devices if not device["success"]]
+        if failed and not call.return_response:
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="broadcast_failed",
+                translation_placeholders={
+                    "failed": str(len(failed)),
+                    "total": str(len(devices)),
+                    "errors": "; ".join(
+                        f"{device['title']}: {device['error']}" for device in failed
+                    ),
+                },
+            )
+        if not call.return_response:
+            return None
+        return {"duration_ms": round(duration * 1000, 1), "devices": devices}
+
+    async def async_display_message(call: ServiceCall) -> ServiceResponse:
+        """Queue an on-screen message and return the queue depth."""
+        coordinator = async_get_entry(
+            hass, call.data[ATTR_CONFIG_ENTRY_ID]
+        ).runtime_data
+        if not coordinator.client.connected:
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="not_connected",
+                translation_placeholders={"target": coordinator.config_entry.title},
+            )
+        coalesced = coordinator.messages.async_add(
+            call.data[ATTR_MESSAGE], call.data[ATTR_DURATION], call.data[ATTR_TAG]
+        )
+        if not call.return_response:
+            return None
+        return {"queue_depth": len(coordinator.messages), "coalesced": coalesced}
+
+    async def async_run_macro(call: ServiceCall) -> ServiceResponse:
+        """Run a macro and report how long each step took."""
+        entry = async_get_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        macros = entry.runtime_data.macros
+        name = call.data[ATTR_MACRO]
+        if name not in macros.macros:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="macro_not_found",
+                translation_placeholders={"macro": name},
+            )
+        result = await macros.async_run(name)
+        if call.return_response:
+            return result
+        return None
+
+    async def async_start_profiling(call: ServiceCall) -> None:
+        """Start profiling the integration's callbacks."""
+        coordinator = async_get_entry(
+            hass, call.data[ATTR_CONFIG_ENTRY_ID]
+        ).runtime_data
+        if coordinator.profiler is not None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN, translation_key="profiling_active"
+            )
+        try:
+            coordinator.async_start_profiling()
+        except ValueError as err:
+            # cProfile refuses to run next to another active profiler
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="profiler_busy",
+                translation_placeholders={"error": str(err)},
+            ) from err
+
+    async def async_stop_profiling(call: ServiceCall) -> ServiceResponse:
+        """Stop profiling and write the profile file."""
+        coordinator = async_get_entry(
+            hass, call.data[ATTR_CONFIG_ENTRY_ID]
+        ).runtime_data
+        if coordinator.profiler is None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN, translation_key="profiling_not_active"
+            )
+        summary = await coordinator.async_stop_profiling()
+        if call.return_response:
+            return summary
+        return None
+
+    async def async_start_tracing(call: ServiceCall) -> ServiceResponse:
+        """Start recording per-push spans."""
+        coordinator = async_get_entry(
+            hass, call.data[ATTR_CONFIG_ENTRY_ID]
+        ).runtime_data
+        if coordinator.tracer is not None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN, translation_key="tracing_active"
+            )
+        path = coordinator.async_start_tracing(call.data[ATTR_MAX_SIZE] * 1024 * 1024)
+        if call.return_response:
+            return {"path": path}
+        return None
+
+    async def async_stop_tracing(call: ServiceCall) -> ServiceResponse:
+        """Stop recording spans and flush the trace file."""
+        coordinator = async_get_entry(
+            hass, call.data[ATTR_CONFIG_ENTRY_ID]
+        ).runtime_data
+        if coordinator.tracer is None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN, translation_key="tracing_not_active"
+            )
+        result = await coordinator.async_stop_tracing()
+        if call.return_response:
+            return result
+        return None
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_SESSIONS,
+        async_get_sessions,
+        schema=SERVICE_GET_SESSIONS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SEND_COMMAND,
+        async_send_command,
+        schema=SERVICE_SEND_COMMAND_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BROADCAST_COMMAND,
+        async_broadcast_command,
+        schema=SERVICE_BROADCAST_COMMAND_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DISPLAY_MESSAGE,
+        async_display_message,
+        schema=SERVICE_DISPLAY_MESSAGE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RUN_MACRO,
+        async_run_macro,
+        schema=SERVICE_RUN_MACRO_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_PROFILING,
+        async_start_profiling,
+        schema=SERVICE_PROFILING_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_PROFILING,
+        async_stop_profiling,
+        schema=SERVICE_PROFILING_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_TRACING,
+        async_start_tracing,
+        schema=SERVICE_START_TRACING_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_TRACING,
+        async_stop_tracing,
+        schema=SERVICE_STOP_TRACING_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY,
+        async_query,
+        schema=SERVICE_QUERY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,241 @@
+"""Viewing session detection for madVR."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ASPECT_DEC,
+    ASPECT_NAME,
+    DOMAIN,
+    INCOMING_COLORIMETRY,
+    INCOMING_FRAME_RATE,
+    INCOMING_RES,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import MadVRCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Sessions kept per device
+DEFAULT_MAX_SESSIONS = 500
+
+STORAGE_VERSION = 1
+# seconds to wait before writing the sessions after one ended
+SAVE_DELAY = 10
+
+# keys that start a new format segment when they change
+FORMAT_KEYS = (INCOMING_RES, INCOMING_FRAME_RATE, "hdr_flag", INCOMING_COLORIMETRY)
+
+END_SIGNAL_LOST = "signal_lost"
+END_STANDBY = "standby"
+END_POWER_OFF = "power_off"
+
+
+@dataclass(slots=True)
+class ViewingSession:
+    """A stretch of playback from signal start to signal loss or standby."""
+
+    start: datetime
+    end: datetime | None = None
+    end_reason: str | None = None
+    # [{"offset": seconds, resolution, frame_rate, hdr, colorimetry}, ...]
+    formats: list[dict[str, Any]] = field(default_factory=list)
+    # [{"offset": seconds, "aspect_ratio": ..., "aspect_name": ...}, ...]
+    aspect_ratios: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        """Return the length of the session in seconds."""
+        return ((self.end or dt_util.utcnow()) - self.start).total_seconds()
+
+    @property
+    def hdr(self) -> bool:
+        """Return true if any part of the session was HDR."""
+        return any(segment["hdr"] for segment in self.formats)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the session as a serializable dict."""
+        return {
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat() if self.end else None,
+            "end_reason": self.end_reason,
+            "duration": round(self.duration),
+            "hdr": self.hdr,
+            "formats": self.formats,
+            "aspect_ratios": self.aspect_ratios,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ViewingSession:
+        """Return a session stored with as_dict."""
+        return cls(
+            start=dt_util.parse_datetime(data["start"], raise_on_error=True),
+            end=dt_util.parse_datetime(data["end"]) if data["end"] else None,
+            end_reason=data["end_reason"],
+            formats=data["formats"],
+            aspect_ratios=data["aspect_ratios"],
+        )
+
+
+class MadVRSessionTracker:
+    """Derive viewing sessions from coordinator snapshots and keep them in storage.
+
+    The running session is stored on unload too. After a reload it goes on if
+    the first snapshot still has a signal, otherwise it ends when it was
+    stored.
+    """
+
+    def __init__(
+        self, coordinator: MadVRCoordinator, max_sessions: int = DEFAULT_MAX_SESSIONS
+    ) -> None:
+        """Initialize the tracker."""
+        self._store: Store[dict[str, Any]] = Store(
+            coordinator.hass,
+            STORAGE_VERSION,
+            f"{DOMAIN}.sessions.{coordinator.mac.replace(':', '')}",
+        )
+        # ordered by start time, oldest first
+        self.sessions: deque[ViewingSession] = deque(maxlen=max_sessions)
+        self.current: ViewingSession | None = None
+        # when a restored running session was stored
+        self._stored_at: datetime | None = None
+        self._format: tuple[Any, ...] | None = None
+        self._aspect: tuple[Any, ...] | None = None
+
+    async def async_load(self) -> None:
+        """Load the stored sessions."""
+        if (stored := await self._store.async_load()) is None:
+            return
+        self.sessions.extend(
+            ViewingSession.from_dict(session) for session in stored["sessions"]
+        )
+        if (current := stored.get("current")) is not None:
+            self.current = ViewingSession.from_dict(current)
+            self._stored_at = dt_util.parse_datetime(stored["stored_at"])
+            if formats := self.current.formats:
+                last = formats[-1]
+                self._format = (
+                    last["resolution"],
+                    last["frame_rate"],
+                    last["hdr"],
+                    last["colorimetry"],
+                )
+            if aspect_ratios := self.current.aspect_ratios:
+                last = aspect_ratios[-1]
+                self._aspect = (last["aspect_ratio"], last["aspect_name"])
+
+    async def async_save(self) -> None:
+        """Store the sessions now, including the running one."""
+        await self._store.async_save(self._data_to_save())
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the sessions to store."""
+        return {
+            "sessions": [session.as_dict() for session in self.sessions],
+            "current": self.current.as_dict() if self.current else None,
+            "stored_at": dt_util.utcnow().isoformat(),
+        }
+
+    @property
+    def last(self) -> ViewingSession | None:
+        """Return the running session or the most recent finished one."""
+        if self.current is not None:
+            return self.current
+        return self.sessions[-1] if self.sessions else None
+
+    def update(self, data: dict[str, Any]) -> None:
+        """Feed a new snapshot."""
+        if (session := self.current) is None:
+            if data.get("is_signal"):
+                self._start(data)
+            return
+
+        if (stored_at := self._stored_at) is not None:
+            self._stored_at = None
+            if not data.get("is_signal"):
+                # the restored session ended while the entry was not loaded
+                self._end(END_SIGNAL_LOST, stored_at)
+                return
+
+        if data.get("is_on") is False:
+            self._end(END_STANDBY if data.get("standby") else END_POWER_OFF)
+        elif data.get("standby"):
+            self._end(END_STANDBY)
+        elif not data.get("is_signal"):
+            self._end(END_SIGNAL_LOST)
+        else:
+            self._record(session, data)
+
+    def _start(self, data: dict[str, Any]) -> None:
+        """Open a session."""
+        self.current = ViewingSession(start=dt_util.utcnow())
+        self._format = self._aspect = None
+        self._record(self.current, data)
+        _LOGGER.debug("Viewing session started")
+
+    def _end(self, reason: str, end: datetime | None = None) -> None:
+        """Close the running session and add it to the index."""
+        assert self.current is not None
+        session, self.current = self.current, None
+        session.end = end or dt_util.utcnow()
+        session.end_reason = reason
+        self.sessions.append(session)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        _LOGGER.debug("Viewing session ended (%s) after %ss", reason, session.duration)
+
+    def _record(self, session: ViewingSession, data: dict[str, Any]) -> None:
+        """Append format and aspect changes to the session."""
+        resolution, frame_rate, hdr, colorimetry = (
+            data.get(key) for key in FORMAT_KEYS
+        )
+        # as stored, so a restored session compares equal
+        fmt = (resolution, frame_rate, bool(hdr), colorimetry)
+        if fmt != self._format:
+            self._format = fmt
+            session.formats.append(
+                {
+                    "offset": round(session.duration),
+                    "resolution": resolution,
+                    "frame_rate": frame_rate,
+                    "hdr": fmt[2],
+                    "colorimetry": colorimetry,
+                }
+            )
+        aspect = (data.get(ASPECT_DEC), data.get(ASPECT_NAME))
+        if aspect != self._aspect and aspect[0] is not None:
+            self._aspect = aspect
+            session.aspect_ratios.append(
+                {
+                    "offset": round(session.duration),
+                    "aspect_ratio": aspect[0],
+                    "aspect_name": aspect[1],
+                }
+            )
+
+    def query(
+        self,
+        since: datetime | None = None,
+        hdr: bool | None = None,
+        limit: int | None = None,
+    ) -> list[ViewingSession]:
+        """Return finished sessions, newest first."""
+        result: list[ViewingSession] = []
+        for session in reversed(self.sessions):
+            # sessions are ordered by start, nothing older can match
+            if since is not None and session.start < since:
+                break
+            if hdr is not None and session.hdr != hdr:
+                continue
+            result.append(session)
+            if limit is not None and len(result) >= limit:
+                break
+        return result
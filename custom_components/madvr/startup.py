@@ -0,0 +1,103 @@
+"""Timings of the phases of a config entry's startup."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+import logging
+import time
+from typing import Any
+
+from pymadvr.madvr import Madvr
+
+_LOGGER = logging.getLogger(__name__)
+
+# marks that complete a startup, set by the first pushes
+FINAL_MARKS = ("first_mac", "first_push")
+
+
+class MadVRStartupTimer:
+    """Record monotonic timings of setup phases and the first device data.
+
+    Phases are durations of steps awaited in order, marks are the time since
+    setup started at which something first happened. Once every final mark
+    is set a single summary line is logged.
+    """
+
+    def __init__(self, mac: str) -> None:
+        """Start timing."""
+        self.mac = mac
+        self._start = time.monotonic()
+        self.phases: dict[str, float] = {}
+        self.marks: dict[str, float] = {}
+        self.connect_attempts = 0
+        self.done = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a setup phase."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.monotonic() - start
+
+    def mark(self, name: str) -> None:
+        """Record when something first happened, log once startup completed."""
+        if name in self.marks:
+            return
+        self.marks[name] = time.monotonic() - self._start
+        if not self.done and all(mark in self.marks for mark in FINAL_MARKS):
+            self.done = True
+            _LOGGER.debug("%s", self.summary())
+
+    def watch_connect(self, client: Madvr) -> None:
+        """Time the client's notification connection until it first succeeds.
+
+        The library opens the socket and reads the welcome message in one
+        call, so TCP connect and handshake are timed together.
+        """
+        establish = client._establish_notification_connection
+        # the resolver's connect wrapper, if any, is restored after
+        shadowed = vars(client).get("_establish_notification_connection")
+
+        async def timed_establish() -> None:
+            self.connect_attempts += 1
+            self.mark("connect_start")
+            start = time.monotonic()
+            await establish()
+            self.phases["connect"] = time.monotonic() - start
+            self.mark("connected")
+            # the instance attribute shadows the method until the first success
+            if shadowed is None:
+                vars(client).pop("_establish_notification_connection", None)
+            else:
+                client._establish_notification_connection = shadowed  # type: ignore[method-assign]
+
+        client._establish_notification_connection = timed_establish  # type: ignore[method-assign]
+
+    def summary(self) -> str:
+        """Return the timings as one line."""
+        phases = ", ".join(
+            f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases.items()
+        )
+        marks = ", ".join(
+            f"{name} at {seconds * 1000:.0f} ms" for name, seconds in self.marks.items()
+        )
+        return (
+            f"madVR {self.mac} startup: {phases}; {marks};"
+            f" {self.connect_attempts} connect attempts"
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the timings for diagnostics."""
+        return {
+            "done": self.done,
+            "phases_ms": {
+                name: round(seconds * 1000, 1) for name, seconds in self.phases.items()
+            },
+            "since_start_ms": {
+                name: round(seconds * 1000, 1) for name, seconds in self.marks.items()
+            },
+            "connect_attempts": self.connect_attempts,
+        }
@@ -0,0 +1,201 @@
+"""Hourly temperature statistics imported in batches instead of recorder rows."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+)
+from homeassistant.const import UnitOfTemperature
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.device_registry import format_mac
+from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DEFAULT_TEMPERATURE_DEADBAND,
+    DOMAIN,
+    TEMP_CPU,
+    TEMP_GPU,
+    TEMP_HDMI,
+    TEMP_MAINBOARD,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import MadVRCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# temperature key -> statistic name
+TEMPERATURE_KEYS: dict[str, str] = {
+    TEMP_GPU: "GPU temperature",
+    TEMP_HDMI: "HDMI temperature",
+    TEMP_CPU: "CPU temperature",
+    TEMP_MAINBOARD: "Mainboard temperature",
+}
+
+# short-term statistics the recorder compiles per hour for a measurement sensor
+SHORT_TERM_ROWS_PER_HOUR = 12
+# rough sqlite row sizes including indexes, for the savings estimate
+STATE_ROW_BYTES = 200
+SHORT_TERM_ROW_BYTES = 100
+
+
+def parse_temperature(value: Any) -> float | None:
+    """Return a valid temperature, the device reports 0 while off."""
+    try:
+        temperature = float(value)
+    except (TypeError, ValueError):
+        return None
+    return temperature if temperature > 0 else None
+
+
+@dataclass(slots=True)
+class TemperatureAggregate:
+    """Time weighted mean, min and max of one temperature within an hour."""
+
+    value: float | None = None
+    since: float = 0.0
+    weighted: float = 0.0
+    seconds: float = 0.0
+    min: float | None = None
+    max: float | None = None
+
+    def advance(self, now: float) -> None:
+        """Account the current value up to now."""
+        if self.value is not None and now > self.since:
+            self.weighted += self.value * (now - self.since)
+            self.seconds += now - self.since
+        self.since = now
+
+    def add(self, value: float | None, now: float) -> None:
+        """Switch to a new value."""
+        self.advance(now)
+        self.value = value
+        if value is not None:
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def close(self, end: float) -> StatisticData | None:
+        """Return the statistic of the hour ending at end and start the next."""
+        self.advance(end)
+        statistic = None
+        if self.seconds and self.min is not None and self.max is not None:
+            statistic = StatisticData(
+                start=dt_util.utc_from_timestamp(end) - timedelta(hours=1),
+                mean=round(self.weighted / self.seconds, 2),
+                min=self.min,
+                max=self.max,
+            )
+        self.weighted = self.seconds = 0.0
+        self.min = self.max = self.value
+        return statistic
+
+
+class MadVRTemperatureStatistics:
+    """Aggregate temperatures in memory and import them once per hour.
+
+    While enabled the temperature sensors have no state class, so the
+    recorder compiles no statistics for them, and only write their state when
+    the temperature moves by the deadband.
+    """
+
+    def __init__(self, coordinator: MadVRCoordinator) -> None:
+        """Initialize the statistics."""
+        self.coordinator = coordinator
+        self.enabled = False
+        # degrees a sensor has to move before its state is written
+        self.deadband = DEFAULT_TEMPERATURE_DEADBAND
+        # the device reports its MAC with dashes, not valid in a statistic id
+        self._object_id = format_mac(coordinator.mac).replace(":", "")
+        self._aggregates = {key: TemperatureAggregate() for key in TEMPERATURE_KEYS}
+        # keys of sensors added to hass, only those would have had rows
+        self.sensors: set[str] = set()
+        self._unsub_hourly: CALLBACK_TYPE | None = None
+        self._enabled_at = 0.0
+        # stats
+        self.samples = 0
+        self.imported_hours = 0
+        self.suppressed_writes = 0
+        self.short_term_rows_avoided = 0
+
+    @callback
+    def async_enable(self) -> None:
+        """Start aggregating and importing at the top of every hour."""
+        self.enabled = True
+        self._enabled_at = time.monotonic()
+        self._unsub_hourly = async_track_utc_time_change(
+            self.coordinator.hass, self._async_import, minute=0, second=0
+        )
+
+    @callback
+    def async_update(self, data: dict[str, Any]) -> None:
+        """Record the temperatures of a commit."""
+        now = dt_util.utcnow().timestamp()
+        for key, aggregate in self._aggregates.items():
+            value = parse_temperature(data.get(key))
+            if value != aggregate.value:
+                aggregate.add(value, now)
+        self.samples += 1
+
+    @callback
+    def _async_import(self, now: datetime) -> None:
+        """Import the hour that just ended, one batch per temperature."""
+        end = now.replace(minute=0, second=0, microsecond=0).timestamp()
+        self.short_term_rows_avoided += SHORT_TERM_ROWS_PER_HOUR * len(self.sensors)
+        recorder = "recorder" in self.coordinator.hass.config.components
+        for key, aggregate in self._aggregates.items():
+            if (statistic := aggregate.close(end)) is None or not recorder:
+                continue
+            async_add_external_statistics(
+                self.coordinator.hass,
+                StatisticMetaData(
+                    mean_type=StatisticMeanType.ARITHMETIC,
+                    has_sum=False,
+                    name=f"madVR Envy {TEMPERATURE_KEYS[key]}",
+                    source=DOMAIN,
+                    statistic_id=f"{DOMAIN}:{self._object_id}_{key}",
+                    unit_of_measurement=UnitOfTemperature.CELSIUS,
+                ),
+                [statistic],
+            )
+            self.imported_hours += 1
+        _LOGGER.debug("Imported temperature statistics for %s", now)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop importing, the current hour is dropped."""
+        if self._unsub_hourly is not None:
+            self._unsub_hourly()
+            self._unsub_hourly = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the import stats and the estimated recorder savings."""
+        if not self.enabled:
+            return {"enabled": False}
+        rows = self.suppressed_writes + self.short_term_rows_avoided
+        size = (
+            self.suppressed_writes * STATE_ROW_BYTES
+            + self.short_term_rows_avoided * SHORT_TERM_ROW_BYTES
+        )
+        # projected from the time enabled, needs a few hours to settle
+        days = max(time.monotonic() - self._enabled_at, 3600) / 86400
+        return {
+            "enabled": True,
+            "samples": self.samples,
+            "imported_hours": self.imported_hours,
+            "suppressed_writes": self.suppressed_writes,
+            "short_term_rows_avoided": self.short_term_rows_avoided,
+            "rows_saved_per_day": round(rows / days),
+            "bytes_saved_per_day": round(size / days),
+        }
@@ -0,0 +1,154 @@
+"""Opt-in per-push tracing in Chrome trace format for madVR."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_TRACE_MAX_BYTES = 10 * 1024 * 1024
+TRACE_BACKUPS = 3
+# seconds between flushes of the event buffer
+FLUSH_INTERVAL = 1.0
+# flush early once this many events are buffered
+FLUSH_EVENTS = 2000
+
+
+def now_us() -> int:
+    """Return a monotonic timestamp in microseconds."""
+    return time.perf_counter_ns() // 1000
+
+
+class MadVRTracer:
+    """Record spans and write them through a buffered, size-rotated writer.
+
+    Files use the JSON array trace format, which Perfetto and chrome://tracing
+    accept without the closing bracket, so every flush is a plain append.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        mac: str,
+        path: str,
+        max_bytes: int = DEFAULT_TRACE_MAX_BYTES,
+    ) -> None:
+        """Initialize the tracer."""
+        self.hass = hass
+        self.path = path
+        self.max_bytes = max_bytes
+        self._tid = mac
+        self._pid = os.getpid()
+        self._events: list[dict[str, Any]] = []
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self._write_task: asyncio.Task[None] | None = None
+        self.push_id = 0
+        self.events_written = 0
+        self.rotations = 0
+
+    @callback
+    def span(self, name: str, start: int, end: int | None = None, **args: Any) -> None:
+        """Record a complete span from start to end (microseconds)."""
+        end = now_us() if end is None else end
+        self._events.append(
+            {
+                "name": name,
+                "cat": "madvr",
+                "ph": "X",
+                "ts": start,
+                "dur": end - start,
+                "pid": self._pid,
+                "tid": self._tid,
+                "args": args,
+            }
+        )
+        if len(self._events) >= FLUSH_EVENTS:
+            self._async_flush()
+        elif self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self.hass, FLUSH_INTERVAL, self._async_flush_later
+            )
+
+    @callback
+    def _async_flush_later(self, _: Any) -> None:
+        """Flush after the interval."""
+        self._unsub_flush = None
+        self._async_flush()
+
+    @callback
+    def _async_flush(self) -> None:
+        """Hand the buffered events to the executor."""
+        if not self._events or (
+            self._write_task is not None and not self._write_task.done()
+        ):
+            return
+        events, self._events = self._events, []
+        self._write_task = self.hass.async_create_background_task(
+            self._async_write(events), f"madvr trace writer {self._tid}"
+        )
+
+    async def _async_write(self, events: list[dict[str, Any]]) -> None:
+        """Write events off the event loop."""
+        try:
+            await self.hass.async_add_executor_job(self._write, events)
+        except OSError as err:
+            _LOGGER.error("Failed to write madVR trace %s: %s", self.path, err)
+            return
+        self.events_written += len(events)
+        # anything recorded while writing goes out on the next timer
+        if self._events and self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self.hass, FLUSH_INTERVAL, self._async_flush_later
+            )
+
+    def _write(self, events: list[dict[str, Any]]) -> None:
+        """Append events to the trace file, rotating by size."""
+        path = Path(self.path)
+        if path.exists() and path.stat().st_size >= self.max_bytes:
+            self._rotate(path)
+        with path.open("a", encoding="utf-8") as file:
+            if file.tell() == 0:
+                file.write("[\n")
+            file.writelines(
+                json.dumps(event, separators=(",", ":")) + ",\n" for event in events
+            )
+
+    def _rotate(self, path: Path) -> None:
+        """Shift trace.json to trace.json.1 and so on."""
+        for index in range(TRACE_BACKUPS - 1, 0, -1):
+            older = path.with_name(f"{path.name}.{index}")
+            if older.exists():
+                older.replace(path.with_name(f"{path.name}.{index + 1}"))
+        path.replace(path.with_name(f"{path.name}.1"))
+        self.rotations += 1
+
+    async def async_stop(self) -> None:
+        """Flush what is left and stop."""
+        if self._write_task is not None:
+            await self._write_task
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        if self._events:
+            events, self._events = self._events, []
+            await self.hass.async_add_executor_job(self._write, events)
+            self.events_written += len(events)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return tracer state for diagnostics."""
+        return {
+            "path": self.path,
+            "pushes": self.push_id,
+            "buffered": len(self._events),
+            "events_written": self.events_written,
+            "rotations": self.rotations,
+        }
@@ -0,0 +1,113 @@
+"""Device trigger index matched against the coordinator's commit delta."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_TRIGGERS: HassKey[MadVRTriggerIndex] = HassKey(f"{DOMAIN}_triggers")
+
+type TriggerCallback = Callable[[Any], None]
+
+# flags the client deletes on standby and power off instead of clearing them,
+# a removed flag is off
+FLAG_KEYS = frozenset({"is_on", "is_signal", "hdr_flag", "outgoing_hdr_flag"})
+
+
+def normalize_value(value: Any) -> Any:
+    """Return a hashable form shared by pushed and configured values.
+
+    Numbers compare as floats so "2.40" matches a pushed 2.4, anything else
+    as a string.
+    """
+    if value is None or isinstance(value, bool):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+@callback
+def async_get_trigger_index(hass: HomeAssistant) -> MadVRTriggerIndex:
+    """Return the trigger index, creating it on first use."""
+    if (index := hass.data.get(DATA_TRIGGERS)) is None:
+        index = hass.data[DATA_TRIGGERS] = MadVRTriggerIndex()
+    return index
+
+
+class MadVRTriggerIndex:
+    """Attached triggers by device, data key and value.
+
+    A commit only looks up the keys in its delta, so the cost depends on the
+    changed keys and the triggers that match, not on the number of triggers.
+    Triggers are kept per MAC rather than on the coordinator, so they survive
+    entry reloads.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the index."""
+        # mac -> key -> value (None matches any) -> callbacks
+        self._index: dict[str, dict[str, dict[Any, list[TriggerCallback]]]] = {}
+        self.attached = 0
+        self.fired = 0
+
+    @callback
+    def async_attach(
+        self, mac: str, key: str, value: Any, trigger_callback: TriggerCallback
+    ) -> CALLBACK_TYPE:
+        """Call trigger_callback with the new value when key changes to value."""
+        bucket = (
+            self._index.setdefault(mac, {})
+            .setdefault(key, {})
+            .setdefault(normalize_value(value), [])
+        )
+        bucket.append(trigger_callback)
+        self.attached += 1
+
+        @callback
+        def detach() -> None:
+            bucket.remove(trigger_callback)
+            self.attached -= 1
+            # drop empty levels so lookups stay misses
+            keys = self._index[mac]
+            if not bucket:
+                del keys[key][normalize_value(value)]
+            if not keys[key]:
+                del keys[key]
+            if not keys:
+                del self._index[mac]
+
+        return detach
+
+    @callback
+    def async_fire(self, mac: str, delta: dict[str, Any]) -> None:
+        """Run the triggers matching a commit delta."""
+        if (keys := self._index.get(mac)) is None:
+            return
+        for key in keys.keys() & delta.keys():
+            values = keys[key]
+            if (value := delta[key]) is None and key in FLAG_KEYS:
+                value = False
+            matched = list(values.get(None, ()))
+            # a removed key only matches the triggers for any value
+            if value is not None:
+                matched.extend(values.get(normalize_value(value), ()))
+            for trigger_callback in matched:
+                self.fired += 1
+                try:
+                    trigger_callback(value)
+                except Exception:
+                    _LOGGER.exception("Error running trigger for %s", key)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return index stats for diagnostics."""
+        return {"attached": self.attached, "fired": self.fired}
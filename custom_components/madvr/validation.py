@@ -0,0 +1,156 @@
+"""Per-key validation of the keys each commit changes."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from .const import (
+    ASPECT_DEC,
+    INCOMING_ASPECT_RATIO,
+    INCOMING_BIT_DEPTH,
+    INCOMING_BLACK_LEVELS,
+    INCOMING_COLOR_SPACE,
+    INCOMING_COLORIMETRY,
+    INCOMING_FRAME_RATE,
+    INCOMING_RES,
+    INCOMING_SIGNAL_TYPE,
+    MASKING_DEC,
+    OUTGOING_BIT_DEPTH,
+    OUTGOING_BLACK_LEVELS,
+    OUTGOING_COLOR_SPACE,
+    OUTGOING_COLORIMETRY,
+    OUTGOING_FRAME_RATE,
+    OUTGOING_RES,
+    OUTGOING_SIGNAL_TYPE,
+    TEMP_CPU,
+    TEMP_GPU,
+    TEMP_HDMI,
+    TEMP_MAINBOARD,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+type Check = Callable[[Any], bool]
+
+# longest string accepted for keys without a tighter bound, the device sends
+# short tokens and profile names
+MAX_STRING_LENGTH = 256
+# longest token such as a resolution or color space; the device may add token
+# values, so only their type and length are checked
+TOKEN_LENGTH = 16
+# types of keys the schema does not know, the library may add keys
+SCALAR_TYPES = frozenset({str, bool, int, float, type(None)})
+
+
+def _flag(value: Any) -> bool:
+    return value is None or type(value) is bool
+
+
+def _number(value: Any) -> bool:
+    return value is None or type(value) in (int, float)
+
+
+def _text(max_length: int) -> Check:
+    def check(value: Any) -> bool:
+        return value is None or (type(value) is str and len(value) <= max_length)
+
+    return check
+
+
+def _any(value: Any) -> bool:
+    """Accept scalars of keys the schema does not cover."""
+    return type(value) in SCALAR_TYPES and (
+        type(value) is not str or len(value) <= MAX_STRING_LENGTH
+    )
+
+
+# data key -> check, each runs in constant time
+SCHEMA: dict[str, Check] = {
+    "is_on": _flag,
+    "is_signal": _flag,
+    "standby": _flag,
+    "power_off": _flag,
+    "hdr_flag": _flag,
+    "outgoing_hdr_flag": _flag,
+    "_last_update": _number,
+    ASPECT_DEC: _number,
+    MASKING_DEC: _number,
+    "mac_address": _text(17),
+    INCOMING_RES: _text(TOKEN_LENGTH),
+    OUTGOING_RES: _text(TOKEN_LENGTH),
+    INCOMING_FRAME_RATE: _text(TOKEN_LENGTH),
+    OUTGOING_FRAME_RATE: _text(TOKEN_LENGTH),
+    INCOMING_SIGNAL_TYPE: _text(TOKEN_LENGTH),
+    OUTGOING_SIGNAL_TYPE: _text(TOKEN_LENGTH),
+    INCOMING_COLOR_SPACE: _text(TOKEN_LENGTH),
+    OUTGOING_COLOR_SPACE: _text(TOKEN_LENGTH),
+    INCOMING_BIT_DEPTH: _text(TOKEN_LENGTH),
+    OUTGOING_BIT_DEPTH: _text(TOKEN_LENGTH),
+    INCOMING_COLORIMETRY: _text(TOKEN_LENGTH),
+    OUTGOING_COLORIMETRY: _text(TOKEN_LENGTH),
+    INCOMING_BLACK_LEVELS: _text(TOKEN_LENGTH),
+    OUTGOING_BLACK_LEVELS: _text(TOKEN_LENGTH),
+    INCOMING_ASPECT_RATIO: _text(TOKEN_LENGTH),
+    "aspect_res": _text(TOKEN_LENGTH),
+    "aspect_int": _text(TOKEN_LENGTH),
+    "aspect_name": _text(64),
+    "masking_res": _text(TOKEN_LENGTH),
+    "masking_int": _text(TOKEN_LENGTH),
+    "profile_name": _text(MAX_STRING_LENGTH),
+    "profile_num": _text(TOKEN_LENGTH),
+    TEMP_GPU: _text(8),
+    TEMP_HDMI: _text(8),
+    TEMP_CPU: _text(8),
+    TEMP_MAINBOARD: _text(8),
+}
+
+
+class MadVRPushValidator:
+    """Reject malformed values of the keys a commit changed.
+
+    Only the commit's delta is checked, so the cost depends on the keys that
+    changed rather than the size of the data, and nothing runs per push. A
+    malformed value is not committed, the key keeps its last valid value.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the validator."""
+        # key -> malformed values seen
+        self.malformed: dict[str, int] = {}
+        # stats
+        self.checked = 0
+        self.rejected = 0
+
+    def check(self, key: str, value: Any) -> bool:
+        """Return if the value is valid for the key."""
+        self.checked += 1
+        if SCHEMA.get(key, _any)(value):
+            return True
+        self._reject(key, value)
+        return False
+
+    def invalid_keys(self, delta: dict[str, Any]) -> list[str]:
+        """Return the keys of a delta whose new value is malformed."""
+        self.checked += len(delta)
+        invalid = [
+            key for key, value in delta.items() if not SCHEMA.get(key, _any)(value)
+        ]
+        for key in invalid:
+            self._reject(key, delta[key])
+        return invalid
+
+    def _reject(self, key: str, value: Any) -> None:
+        """Count a malformed value."""
+        self.rejected += 1
+        self.malformed[key] = self.malformed.get(key, 0) + 1
+        _LOGGER.debug("Ignoring malformed %s: %.64r", key, value)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return validation stats for diagnostics."""
+        return {
+            "checked": self.checked,
+            "rejected": self.rejected,
+            "malformed": self.malformed,
+        }
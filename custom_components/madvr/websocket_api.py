@@ -0,0 +1,167 @@
+"""Websocket API streaming madVR device deltas."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.config_entries import (
+    SIGNAL_CONFIG_ENTRY_CHANGED,
+    ConfigEntry,
+    ConfigEntryChange,
+    ConfigEntryState,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN
+
+# Upper bound for the coalescing window a client can ask for
+MAX_MIN_INTERVAL = 10.0
+
+# states of an entry that will not load again on its own; during a setup
+# retry the subscription waits and starts over with a snapshot once loaded
+STOPPED_STATES = frozenset(
+    {
+        ConfigEntryState.SETUP_ERROR,
+        ConfigEntryState.MIGRATION_ERROR,
+        ConfigEntryState.FAILED_UNLOAD,
+    }
+)
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the madVR websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "madvr/subscribe",
+        vol.Required("entry_id"): str,
+        vol.Optional("keys"): [str],
+        # seconds; deltas arriving faster are merged into one message
+        vol.Optional("min_interval", default=0.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=MAX_MIN_INTERVAL)
+        ),
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Send a snapshot of the device, then only the keys that change.
+
+    A reload moves the subscription to the new coordinator, starting over with
+    a snapshot. It ends with an error when the entry is removed, disabled or
+    fails to load.
+    """
+    entry = hass.config_entries.async_get_entry(msg["entry_id"])
+    if (
+        entry is None
+        or entry.domain != DOMAIN
+        or entry.state is not ConfigEntryState.LOADED
+    ):
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_NOT_FOUND,
+            "madVR entry not found or not loaded",
+        )
+        return
+
+    coordinator = entry.runtime_data
+    msg_id: int = msg["id"]
+    keys: frozenset[str] | None = frozenset(msg["keys"]) if "keys" in msg else None
+    min_interval: float = msg["min_interval"]
+    loop = hass.loop
+    pending: dict[str, Any] = {}
+    last_sent = 0.0
+    flush_handle: asyncio.TimerHandle | None = None
+
+    @callback
+    def flush() -> None:
+        nonlocal flush_handle, last_sent
+        flush_handle = None
+        last_sent = loop.time()
+        connection.send_message(
+            websocket_api.event_message(msg_id, {"delta": pending.copy()})
+        )
+        pending.clear()
+
+    @callback
+    def on_delta(delta: dict[str, Any]) -> None:
+        nonlocal flush_handle
+        if keys is None:
+            pending.update(delta)
+        else:
+            pending.update({key: value for key, value in delta.items() if key in keys})
+        if not pending or flush_handle is not None:
+            return
+        due = last_sent + min_interval
+        if due <= loop.time():
+            flush()
+        else:
+            flush_handle = loop.call_at(due, flush)
+
+    @callback
+    def send_snapshot() -> None:
+        snapshot = coordinator.snapshot
+        if keys is not None:
+            snapshot = {key: value for key, value in snapshot.items() if key in keys}
+        connection.send_message(
+            websocket_api.event_message(msg_id, {"snapshot": snapshot})
+        )
+
+    @callback
+    def stop_listening() -> None:
+        nonlocal flush_handle
+        remove_listener()
+        if flush_handle is not None:
+            flush_handle.cancel()
+            flush_handle = None
+        pending.clear()
+
+    @callback
+    def on_entry_changed(change: ConfigEntryChange, changed: ConfigEntry) -> None:
+        nonlocal coordinator, remove_listener
+        if changed.entry_id != msg["entry_id"]:
+            return
+        if (
+            change is ConfigEntryChange.REMOVED
+            or changed.disabled_by is not None
+            or changed.state in STOPPED_STATES
+        ):
+            unsubscribe()
+            connection.subscriptions.pop(msg_id, None)
+            connection.send_error(
+                msg_id, websocket_api.ERR_NOT_FOUND, "madVR entry unloaded"
+            )
+            return
+        if changed.state is ConfigEntryState.LOADED and (
+            changed.runtime_data is not coordinator
+        ):
+            # reloaded, the old coordinator dropped its delta listeners
+            stop_listening()
+            coordinator = changed.runtime_data
+            remove_listener = coordinator.async_add_delta_listener(on_delta)
+            send_snapshot()
+
+    remove_listener = coordinator.async_add_delta_listener(on_delta)
+    remove_entry_listener = async_dispatcher_connect(
+        hass, SIGNAL_CONFIG_ENTRY_CHANGED, on_entry_changed
+    )
+
+    @callback
+    def unsubscribe() -> None:
+        remove_entry_listener()
+        stop_listening()
+
+    connection.subscriptions[msg_id] = unsubscribe
+    connection.send_result(msg_id)
+    send_snapshot()
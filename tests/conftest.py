@@ -0,0 +1,41 @@
+"""Fixtures for madVR tests."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
+
+from custom_components.madvr.const import DOMAIN
+
+from .envy import MAC, FakeEnvy
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load the integration from custom_components."""
+
+
+@pytest.fixture
+async def envy(socket_enabled: None) -> AsyncGenerator[FakeEnvy]:
+    """Return a running simulated Envy on localhost."""
+    device = FakeEnvy()
+    await device.start()
+    yield device
+    await device.stop()
+
+
+def make_entry(hass: HomeAssistant, port: int, **options: object) -> MockConfigEntry:
+    """Add a config entry for a device on localhost."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=MAC,
+        data={CONF_HOST: "127.0.0.1", CONF_PORT: port},
+        options=options,
+    )
+    entry.add_to_hass(hass)
+    return entry
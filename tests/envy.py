@@ -0,0 +1,139 @@
+"""A simulated madVR Envy speaking the IP control protocol on localhost."""
+
+from __future__ import annotations
+
+import asyncio
+
+MAC = "01-02-03-04-05-06"
+
+# Get* command -> notification line it answers with
+GET_REPLIES = {
+    "GetMacAddress": f"MacAddress {MAC}",
+    "GetTemperatures": "Temperatures 56 48 44 40",
+    "GetIncomingSignalInfo": (
+        "IncomingSignalInfo 3840x2160 23.976p 2D 422 10bit HDR10 2020 TV 16:9"
+    ),
+    "GetOutgoingSignalInfo": (
+        "OutgoingSignalInfo 3840x2160 23.976p 2D RGB 12bit HDR10 2020 PC"
+    ),
+    "GetAspectRatio": 'AspectRatio 3840:1600 2.400 240 "Scope"',
+    "GetMaskingRatio": "MaskingRatio 3840:1600 2.400 240",
+}
+
+PROFILE_GROUPS = {"SOURCE": ("Source", {"1": "Movies", "2": "Sports"})}
+
+
+class FakeEnvy:
+    """Accept connections and answer commands like the device does.
+
+    Every command is answered with OK, or ERROR for unknown ones, ack_delay
+    seconds after it arrived, like a link with that round trip; later
+    commands are read meanwhile and answered in order. Get commands are
+    followed by their data line and Enum commands by their items. With
+    welcome off, connections are accepted but never greeted, like a host
+    that is up but not an Envy. With cut_lists on, Enum replies stop after
+    their first item and the connection is closed.
+    """
+
+    def __init__(self, ack_delay: float = 0.0, welcome: bool = True) -> None:
+        """Initialize the device."""
+        self.ack_delay = ack_delay
+        self.welcome = welcome
+        self.cut_lists = False
+        self.port = 0
+        self.commands: list[str] = []
+        self.connections = 0
+        self._server: asyncio.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    async def start(self) -> int:
+        """Listen on a free port, or the previous one on a restart, and return it."""
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self) -> None:
+        """Close the listener and every connection."""
+        assert self._server is not None
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+
+    def push(self, line: str) -> None:
+        """Send a notification on every open connection."""
+        for writer in self._writers:
+            writer.write(f"{line}\r\n".encode())
+
+    def _reply(self, command: str) -> list[str]:
+        """Return the lines answering a command."""
+        name, _, args = command.partition(" ")
+        if name in GET_REPLIES:
+            return ["OK", GET_REPLIES[name]]
+        if name == "EnumProfileGroups":
+            return [
+                "OK",
+                *(
+                    f'ProfileGroup {gid} "{n}"'
+                    for gid, (n, _) in PROFILE_GROUPS.items()
+                ),
+                "ProfileGroup.",
+            ]
+        if name == "EnumProfiles":
+            _, profiles = PROFILE_GROUPS.get(args, ("", {}))
+            return [
+                "OK",
+                *(f'Profile {args}_{num} "{n}"' for num, n in profiles.items()),
+                "Profile.",
+            ]
+        if name in ("Heartbeat", "KeyPress", "DisplayMessage", "ActivateProfile"):
+            return ["OK"]
+        return ['ERROR "unknown command"']
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one connection."""
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            if not self.welcome:
+                await reader.read()
+                return
+            writer.write(b"WELCOME to Envy v1.1.3\r\n")
+            replies: asyncio.Queue[tuple[float, bytes]] = asyncio.Queue()
+            sender = asyncio.create_task(self._send_replies(writer, replies))
+            try:
+                while line := await reader.readline():
+                    command = line.decode().strip()
+                    self.commands.append(command)
+                    lines = self._reply(command)
+                    cut = self.cut_lists and command.startswith("Enum")
+                    reply = "".join(f"{r}\r\n" for r in lines[: 2 if cut else None])
+                    due = asyncio.get_running_loop().time() + self.ack_delay
+                    replies.put_nowait((due, reply.encode()))
+                    if cut:
+                        # an empty reply closes the connection
+                        replies.put_nowait((due, b""))
+            finally:
+                sender.cancel()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _send_replies(
+        self, writer: asyncio.StreamWriter, replies: asyncio.Queue[tuple[float, bytes]]
+    ) -> None:
+        """Write each reply once it is due, in the order the commands came in."""
+        loop = asyncio.get_running_loop()
+        while True:
+            due, reply = await replies.get()
+            if (wait := due - loop.time()) > 0:
+                await asyncio.sleep(wait)
+            if not reply:
+                writer.close()
+                return
+            writer.write(reply)
+            await writer.drain()
@@ -0,0 +1,70 @@
+"""Benchmark of the ack channel against the simulated Envy.
+
+Reports commands per second and the p99 ack latency for each window, run
+with -s to see them; BENCH_COMMANDS sets the number of commands per run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.madvr.ack import DEFAULT_WINDOW, MadVRAckChannel
+from custom_components.madvr.commands import encode_command
+from custom_components.madvr.latency import LatencyStats
+
+from .conftest import make_entry
+from .envy import FakeEnvy
+
+BENCH_COMMANDS = int(os.environ.get("BENCH_COMMANDS", "100"))
+# round trip of the simulated link
+LINK_DELAY = 0.02
+
+
+async def _run(channel: MadVRAckChannel, commands: int) -> tuple[float, float]:
+    """Send commands from one caller per window slot, return the rate and p99."""
+    payload = encode_command("KeyPress, MENU")
+
+    async def caller() -> None:
+        for _ in range(commands // channel.window):
+            await channel.async_send(payload)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(channel.window)))
+    elapsed = time.perf_counter() - start
+    return commands / elapsed, channel.latency.as_dict()["p99"]
+
+
+@pytest.mark.parametrize("window", [1, DEFAULT_WINDOW])
+async def test_ack_throughput(hass: HomeAssistant, envy: FakeEnvy, window: int) -> None:
+    """Pipelining lifts throughput above one command per round trip."""
+    envy.ack_delay = LINK_DELAY
+    entry = make_entry(hass, envy.port)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    # the coordinator closes its channel on unload
+    channel = entry.runtime_data.acks = MadVRAckChannel(
+        entry.runtime_data, window=window
+    )
+
+    # the first send opens the connection, it is not measured
+    await channel.async_send(encode_command("KeyPress, MENU"))
+    channel.latency = LatencyStats()
+    rate, p99 = await _run(channel, BENCH_COMMANDS)
+    print(f"window {window}: {rate:.0f} commands/s, p99 ack {p99} ms")
+
+    assert channel.acked == BENCH_COMMANDS + 1
+    assert channel.max_inflight == window
+    # one command per round trip at most, unless several are in flight
+    if window == 1:
+        assert rate < 1 / LINK_DELAY
+    else:
+        assert rate > 1 / LINK_DELAY
+    assert p99 < channel.timeout * 1000
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,51 @@
+"""Tests for the write governor."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.madvr.governor import (
+    INITIAL_BUDGET,
+    MAX_BUDGET,
+    MIN_WINDOW,
+    async_get_governor,
+)
+
+IDLE_DEVICES = 3
+
+
+class Device:
+    """A stand-in coordinator in the given mode."""
+
+    def __init__(self, low_power: bool) -> None:
+        """Initialize the device."""
+        self.scheduler = SimpleNamespace(low_power=low_power)
+        self.throttle_count = 0
+
+
+async def test_idle_devices_take_no_share(hass: HomeAssistant) -> None:
+    """One active device among idle ones gets the window of a single device."""
+    governor = async_get_governor(hass)
+    active = Device(low_power=False)
+    unregister = [governor.async_register(active)]
+    unregister += [
+        governor.async_register(Device(low_power=True)) for _ in range(IDLE_DEVICES)
+    ]
+    assert governor.window == 1 / INITIAL_BUDGET
+
+    governor.budget = MAX_BUDGET
+    governor.async_update_activity()
+    assert governor.window == MIN_WINDOW
+
+    # a device waking up takes its share again
+    idle = Device(low_power=True)
+    unregister.append(governor.async_register(idle))
+    idle.scheduler.low_power = False
+    governor.async_update_activity()
+    assert governor.window == 2 / MAX_BUDGET
+
+    for unsub in unregister:
+        unsub()
+    assert not governor.as_dict()["probing"]
@@ -0,0 +1,81 @@
+"""Tests for setting up the madVR integration."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from pymadvr.madvr import Madvr
+import pytest
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import STATE_OFF
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.madvr.const import DOMAIN
+
+from .conftest import make_entry
+from .envy import MAC, FakeEnvy
+
+# seconds setup may take whatever the device does, well under a connect timeout
+SETUP_BUDGET = 1.0
+
+
+@pytest.mark.parametrize("device", ["reachable", "silent", "refused"])
+async def test_setup_does_not_wait_for_device(
+    hass: HomeAssistant, socket_enabled: None, device: str
+) -> None:
+    """Setup takes the same short time whether the device answers or not."""
+    envy = FakeEnvy(welcome=device != "silent")
+    port = await envy.start()
+    if device == "refused":
+        await envy.stop()
+    entry = make_entry(hass, port)
+
+    start = time.monotonic()
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    elapsed = time.monotonic() - start
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert elapsed < SETUP_BUDGET
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "binary_sensor", DOMAIN, f"{MAC}_power_state"
+    )
+    assert entity_id is not None
+    if device != "reachable":
+        # an Envy that is off at boot pushes nothing, it shows as off
+        assert hass.states.get(entity_id).state == STATE_OFF
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    if device != "refused":
+        await envy.stop()
+
+
+async def test_reload_before_tasks_started_connects(
+    hass: HomeAssistant, envy: FakeEnvy, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A client released before its load ran is loaded again when reused."""
+    started = asyncio.Event()
+    add_tasks = Madvr.async_add_tasks
+
+    async def slow_add_tasks(client: Madvr) -> None:
+        await started.wait()
+        await add_tasks(client)
+
+    monkeypatch.setattr(Madvr, "async_add_tasks", slow_add_tasks)
+    entry = make_entry(hass, envy.port)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    client = entry.runtime_data.client
+    # unloading cancels the load while it waits to start the tasks
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    assert entry.runtime_data.client is client
+
+    started.set()
+    async with asyncio.timeout(10):
+        while not client.connected:
+            await asyncio.sleep(0.05)
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
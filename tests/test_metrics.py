@@ -0,0 +1,36 @@
+"""Tests for the metrics endpoint."""
+
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
+
+from homeassistant.core import HomeAssistant
+
+from .conftest import make_entry
+from .envy import FakeEnvy
+
+
+async def test_metrics_rendered_again_after_reload(
+    hass: HomeAssistant, hass_client: ClientSessionGenerator, envy: FakeEnvy
+) -> None:
+    """A reloaded device never reuses the cached lines of the one it replaced."""
+    await envy.stop()
+    entry = make_entry(hass, envy.port)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    client = await hass_client()
+
+    entry.runtime_data._async_commit({"is_on": True, "hdr_flag": True})
+    body = await (await client.get("/api/madvr/metrics")).text()
+    assert "madvr_hdr{" in body and "} 1.0" in body
+
+    old_version = entry.runtime_data.metrics.version
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    entry.runtime_data._async_commit({"is_on": True, "hdr_flag": False})
+    assert entry.runtime_data.metrics.version > old_version
+    body = await (await client.get("/api/madvr/metrics")).text()
+    hdr = [line for line in body.splitlines() if line.startswith("madvr_hdr{")]
+    assert hdr == [f'madvr_hdr{{mac="{entry.unique_id}"}} 0.0']
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,62 @@
+"""Tests for the options flow."""
+
+from __future__ import annotations
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.madvr.macros import DuplicateMacro, compile_macros
+from custom_components.madvr.options_flow import LIVE_SECTION, RELOAD_SECTION
+
+from .conftest import make_entry
+from .envy import FakeEnvy
+
+
+def test_colliding_macro_names_are_rejected() -> None:
+    """Names that slugify alike would give two buttons the same id."""
+    with pytest.raises(DuplicateMacro):
+        compile_macros({"Movie Mode": "KeyPress, MENU", "movie-mode": "KeyPress, OK"})
+
+
+async def test_colliding_macro_names_show_an_error(
+    hass: HomeAssistant, envy: FakeEnvy
+) -> None:
+    """The options flow reports the collision on the form."""
+    await envy.stop()
+    entry = make_entry(hass, envy.port)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            LIVE_SECTION: {},
+            RELOAD_SECTION: {
+                "macros": {"Movie Mode": "KeyPress, MENU", "movie-mode": "KeyPress, OK"}
+            },
+        },
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "duplicate_macro"}
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_cleared_option_is_not_kept(hass: HomeAssistant, envy: FakeEnvy) -> None:
+    """An optional field left empty drops the value saved before."""
+    await envy.stop()
+    entry = make_entry(hass, envy.port, update_window=500)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {LIVE_SECTION: {}, RELOAD_SECTION: {}}
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert "update_window" not in entry.options
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
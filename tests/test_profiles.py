@@ -0,0 +1,92 @@
+"""Tests for the profile index."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from custom_components.madvr.const import DOMAIN
+from custom_components.madvr.profiles import RETRY_DELAY
+
+from .conftest import make_entry
+from .envy import MAC, FakeEnvy
+
+
+async def test_profiles_enumerated_on_fresh_install(
+    hass: HomeAssistant, envy: FakeEnvy
+) -> None:
+    """Without a cached index the profiles are read once the device is on."""
+    entry = make_entry(hass, envy.port)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    profiles = entry.runtime_data.profiles
+
+    async with asyncio.timeout(10):
+        while not profiles.groups:
+            await asyncio.sleep(0.1)
+    await hass.async_block_till_done()
+
+    assert list(profiles.groups["SOURCE"].options) == ["Movies", "Sports"]
+    assert er.async_get(hass).async_get_entity_id(
+        "select", DOMAIN, f"{MAC}_profile_SOURCE"
+    )
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_failed_enumeration_is_retried(
+    hass: HomeAssistant, envy: FakeEnvy
+) -> None:
+    """A failure schedules a retry instead of blocking the refresh interval."""
+    await envy.stop()
+    entry = make_entry(hass, envy.port)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    profiles = entry.runtime_data.profiles
+
+    profiles.async_update({"is_on": True})
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert profiles.failures == 1
+    assert not profiles.groups
+
+    await envy.start()
+    # a push while the retry is pending does not enumerate ahead of it
+    entry.runtime_data.handle_push_data({"is_on": True})
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert profiles.failures == 1
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=RETRY_DELAY))
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert profiles.failures == 0
+    assert "SOURCE" in profiles.groups
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_list_cut_short_is_not_cached(
+    hass: HomeAssistant, envy: FakeEnvy
+) -> None:
+    """A connection closed in the middle of a list fails and is retried."""
+    envy.cut_lists = True
+    entry = make_entry(hass, envy.port)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    profiles = entry.runtime_data.profiles
+
+    profiles.async_update({"is_on": True})
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert profiles.failures == 1
+    assert not profiles.groups
+
+    envy.cut_lists = False
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=RETRY_DELAY))
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert list(profiles.groups["SOURCE"].options) == ["Movies", "Sports"]
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,48 @@
+"""Tests for the on-demand query cache."""
+
+from __future__ import annotations
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from .conftest import make_entry
+from .envy import FakeEnvy
+
+
+async def test_query_reads_the_data_line(hass: HomeAssistant, envy: FakeEnvy) -> None:
+    """The reply is read past the OK, so the result comes from the device."""
+    entry = make_entry(hass, envy.port)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    queries = entry.runtime_data.queries
+
+    result, cached = await queries.async_query("temperatures")
+    assert not cached
+    assert result.fresh
+    assert result.data == {
+        "temp_gpu": "56",
+        "temp_hdmi": "48",
+        "temp_cpu": "44",
+        "temp_mainboard": "40",
+    }
+    assert "GetTemperatures" in envy.commands
+
+    _, cached = await queries.async_query("temperatures")
+    assert cached
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_query_unreachable(hass: HomeAssistant, envy: FakeEnvy) -> None:
+    """A device that cannot be reached fails the query."""
+    await envy.stop()
+    entry = make_entry(hass, envy.port)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    queries = entry.runtime_data.queries
+
+    with pytest.raises(ConnectionError):
+        await queries.async_query("mac_address")
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,144 @@
+"""Tests for the host resolver."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import pytest
+
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import format_mac
+from homeassistant.util import dt as dt_util
+
+from custom_components.madvr import resolver
+from custom_components.madvr.diagnostics import async_get_config_entry_diagnostics
+from custom_components.madvr.resolver import MAX_SWEEPS, SWEEP_AFTER_FAILURES
+
+from .conftest import make_entry
+from .envy import MAC, FakeEnvy
+
+NEW_HOST = "127.0.0.2"
+
+
+@dataclass
+class Network:
+    """Devices answering probes and the neighbour table, both by address."""
+
+    # host -> MAC read back by a probe
+    answering: dict[str, str] = field(default_factory=dict)
+    # MAC -> host
+    neighbours: dict[str, str] = field(default_factory=dict)
+
+
+@pytest.fixture
+def network(monkeypatch: pytest.MonkeyPatch) -> Network:
+    """Return a simulated network, with sweeps due as soon as allowed."""
+    network = Network()
+
+    async def probe(host: str, port: int) -> str | None:
+        return network.answering.get(host)
+
+    monkeypatch.setattr(resolver, "async_probe_mac", probe)
+    monkeypatch.setattr(resolver, "read_neighbours", lambda: network.neighbours)
+    monkeypatch.setattr(resolver, "SWEEP_INTERVAL", 0.0)
+    monkeypatch.setattr(resolver, "SWEEP_JITTER", 0.0)
+    return network
+
+
+async def test_powered_off_device_is_not_looked_for(
+    hass: HomeAssistant, envy: FakeEnvy, network: Network
+) -> None:
+    """A disconnected client only starts lookups once it failed to connect."""
+    await envy.stop()
+    entry = make_entry(hass, envy.port)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    host_resolver = entry.runtime_data.resolver
+
+    # switched off, the client does not try to connect
+    for _ in range(SWEEP_AFTER_FAILURES * 2):
+        host_resolver._async_check(dt_util.utcnow())
+    await hass.async_block_till_done()
+    assert host_resolver.probes == 0
+
+    with pytest.raises(ConnectionError):
+        await entry.runtime_data.client._establish_notification_connection()
+    host_resolver._async_check(dt_util.utcnow())
+    await hass.async_block_till_done()
+    assert host_resolver.probes == 1
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_switched_off_device_sweeps_a_bounded_number_of_times(
+    hass: HomeAssistant,
+    envy: FakeEnvy,
+    network: Network,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Failed connections start sweeps, which stop after a few failed ones."""
+    await envy.stop()
+    entry = make_entry(hass, envy.port)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    host_resolver = entry.runtime_data.resolver
+
+    for _ in range(SWEEP_AFTER_FAILURES - 1):
+        await host_resolver._async_resolve()
+    assert host_resolver.sweeps == 0
+
+    for _ in range(20):
+        await host_resolver._async_resolve()
+    assert host_resolver.sweeps == MAX_SWEEPS
+    assert host_resolver.moves == 0
+    assert "not sweeping again" in caplog.text
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_device_at_its_address_is_not_swept(
+    hass: HomeAssistant, envy: FakeEnvy, network: Network
+) -> None:
+    """A device answering at the old address is never looked for."""
+    await envy.stop()
+    entry = make_entry(hass, envy.port)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    host_resolver = entry.runtime_data.resolver
+    network.answering["127.0.0.1"] = format_mac(MAC)
+
+    for _ in range(SWEEP_AFTER_FAILURES * 2):
+        await host_resolver._async_resolve()
+    assert host_resolver.sweeps == 0
+    assert host_resolver.lookups == 0
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_device_found_through_the_neighbour_table(
+    hass: HomeAssistant, envy: FakeEnvy, network: Network
+) -> None:
+    """The neighbour table's address is verified and the entry moved to it."""
+    await envy.stop()
+    entry = make_entry(hass, envy.port)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    host_resolver = entry.runtime_data.resolver
+    network.answering[NEW_HOST] = format_mac(MAC)
+    network.neighbours[format_mac(MAC)] = NEW_HOST
+
+    await host_resolver._async_resolve()
+    # before the move reloads the entry onto a new resolver
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    assert diagnostics["resolver"]["last_move"]["to"] == "**REDACTED**"
+    await hass.async_block_till_done()
+    assert host_resolver.sweeps == 0
+    assert host_resolver.last_move == {
+        "from": "127.0.0.1",
+        "to": NEW_HOST,
+        "swept": False,
+    }
+    assert entry.data[CONF_HOST] == NEW_HOST
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,53 @@
+"""Tests for the low power task schedule."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.madvr.scheduler import LOW_POWER_DELAY
+
+from .conftest import make_entry
+from .envy import FakeEnvy
+
+
+async def test_idle_device_suspends_tasks_and_probing(
+    hass: HomeAssistant, envy: FakeEnvy
+) -> None:
+    """An idle device stops its polling tasks and the governor's probe."""
+    entry = make_entry(hass, envy.port)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    coordinator = entry.runtime_data
+    scheduler = coordinator.scheduler
+    governor = coordinator.governor
+    await asyncio.sleep(1.5)
+    assert governor.as_dict()["probing"]
+    assert all(scheduler.as_dict()["task_wakeups"].values())
+
+    scheduler.async_update({"is_on": False})
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=LOW_POWER_DELAY))
+    await hass.async_block_till_done()
+    assert scheduler.low_power
+    assert not governor.as_dict()["probing"]
+
+    # nothing but the ping task wakes up while suspended
+    wakeups = dict(scheduler.as_dict()["task_wakeups"])
+    await asyncio.sleep(1.5)
+    idle = scheduler.as_dict()
+    assert idle["task_wakeups"] == {
+        **wakeups,
+        "ping_task": idle["task_wakeups"]["ping_task"],
+    }
+    assert idle["wakeups"]["full"] > 0
+
+    scheduler.async_update({"is_on": True})
+    assert not scheduler.low_power
+    assert governor.as_dict()["probing"]
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
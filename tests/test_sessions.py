@@ -0,0 +1,45 @@
+"""Tests for the viewing sessions."""
+
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant
+
+from .conftest import make_entry
+from .envy import FakeEnvy
+
+PLAYING = {"is_on": True, "is_signal": True, "incoming_res": "3840x2160"}
+STOPPED = {"is_on": True, "is_signal": False}
+
+
+async def test_sessions_kept_across_reloads(
+    hass: HomeAssistant, envy: FakeEnvy
+) -> None:
+    """Finished sessions and the running one survive a reload."""
+    await envy.stop()
+    entry = make_entry(hass, envy.port)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    entry.runtime_data._async_commit(PLAYING)
+    entry.runtime_data._async_commit(STOPPED)
+    entry.runtime_data._async_commit(PLAYING)
+
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    sessions = entry.runtime_data.sessions
+    assert len(sessions.sessions) == 1
+    assert sessions.current is not None
+    start = sessions.current.start
+
+    # still playing after the reload, the running session goes on
+    entry.runtime_data._async_commit(PLAYING)
+    assert sessions.current.start == start
+    assert len(sessions.current.formats) == 1
+
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    sessions = entry.runtime_data.sessions
+    # the signal was lost while the entry was not loaded
+    entry.runtime_data._async_commit(STOPPED)
+    assert sessions.current is None
+    assert [session.start for session in sessions.query()][0] == start
+    assert len(sessions.sessions) == 2
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
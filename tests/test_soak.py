@@ -0,0 +1,137 @@
+"""Soak test of repeated reloads, reconnects and push bursts.
+
+The CI profile runs a few cycles; set MADVR_SOAK_CYCLES for a longer run,
+each cycle also moves time forward by an hour.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import gc
+import os
+import tracemalloc
+import weakref
+
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.config_entries import ConfigEntryDisabler
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from custom_components.madvr.coordinator import MadVRCoordinator
+
+from .conftest import make_entry
+from .envy import FakeEnvy
+
+SOAK_CYCLES = int(os.environ.get("MADVR_SOAK_CYCLES", "6"))
+# cycles run before the baseline, caches and pools fill up during these
+WARMUP_CYCLES = 2
+# bytes the integration may hold at the end beyond the baseline, plus a
+# little per cycle the log capture and the interpreter keep; a leaked
+# coordinator is tens of KiB
+MAX_GROWTH = 16 * 1024
+MAX_GROWTH_PER_CYCLE = 1024
+
+BURST = [
+    *(f"Temperatures {56 + n % 4} 48 44 40" for n in range(20)),
+    "IncomingSignalInfo 1920x1080 59.940p 2D 422 10bit SDR 709 TV 16:9",
+    "IncomingSignalInfo 3840x2160 23.976p 2D 422 10bit HDR10 2020 TV 16:9",
+    'AspectRatio 3840:1600 2.400 240 "Scope"',
+    'AspectRatio 3840:2160 1.778 178 "Wide"',
+]
+
+
+async def _wait_connected(coordinator: MadVRCoordinator) -> None:
+    """Wait for the client to connect its notification link."""
+    async with asyncio.timeout(15):
+        while not coordinator.client.connected:
+            await asyncio.sleep(0.05)
+
+
+async def _settle(hass: HomeAssistant) -> None:
+    """Let cancelled tasks finish and drop unreachable objects."""
+    await hass.async_block_till_done()
+    await asyncio.sleep(0)
+    # the mocked storage records every call, holding each Store
+    for method in (Store._async_load, Store._async_write_data, Store.async_remove):
+        method.reset_mock()
+    gc.collect()
+
+
+def _integration_bytes(snapshot: tracemalloc.Snapshot) -> int:
+    """Return the bytes allocated by the integration and its client library."""
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(True, "*custom_components/madvr/*"),
+            tracemalloc.Filter(True, "*pymadvr/*"),
+        ]
+    )
+    return sum(stat.size for stat in snapshot.statistics("filename"))
+
+
+async def test_reload_and_reconnect_soak(hass: HomeAssistant, envy: FakeEnvy) -> None:
+    """Reload, reconnect and push bursts without growing tasks or memory."""
+    entry = make_entry(hass, envy.port)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    # coordinators and clients that were replaced, all must be freed
+    replaced: list[weakref.ref] = []
+
+    async def cycle(number: int) -> None:
+        coordinator = entry.runtime_data
+        replaced.append(weakref.ref(coordinator))
+        await _wait_connected(coordinator)
+        for line in BURST:
+            envy.push(line)
+        await asyncio.sleep(0.1)
+
+        # a reload hands the connected client to the new coordinator
+        assert await hass.config_entries.async_reload(entry.entry_id)
+        assert coordinator.client.update_callback is not None
+        assert coordinator.client.update_callback.__self__ is entry.runtime_data
+        assert not coordinator.resources()["process_task_pending"]
+
+        # disabling closes the client, enabling connects a new one
+        client = entry.runtime_data.client
+        replaced.extend((weakref.ref(entry.runtime_data), weakref.ref(client)))
+        await hass.config_entries.async_set_disabled_by(
+            entry.entry_id, ConfigEntryDisabler.USER
+        )
+        assert client.update_callback is None
+        assert not client.connected
+        del client, coordinator
+        await hass.config_entries.async_set_disabled_by(entry.entry_id, None)
+        await _wait_connected(entry.runtime_data)
+
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(hours=number + 1))
+        await _settle(hass)
+
+    for number in range(WARMUP_CYCLES):
+        await cycle(number)
+
+    tracemalloc.start()
+    try:
+        # the baseline holds a coordinator allocated while tracing, like the end
+        await cycle(WARMUP_CYCLES)
+        baseline_tasks = len(asyncio.all_tasks())
+        baseline = _integration_bytes(tracemalloc.take_snapshot())
+        for number in range(WARMUP_CYCLES + 1, SOAK_CYCLES):
+            await cycle(number)
+            assert len(asyncio.all_tasks()) == baseline_tasks
+        growth = _integration_bytes(tracemalloc.take_snapshot()) - baseline
+    finally:
+        tracemalloc.stop()
+    assert growth < MAX_GROWTH + MAX_GROWTH_PER_CYCLE * SOAK_CYCLES
+    assert [ref for ref in replaced if ref() is not None] == []
+
+    coordinator = entry.runtime_data
+    client = coordinator.client
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    assert client.update_callback is None
+    assert coordinator.resources() == {
+        "process_task_pending": False,
+        "update_callback_set": False,
+        "listeners": 0,
+    }
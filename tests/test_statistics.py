@@ -0,0 +1,69 @@
+"""Tests for the hourly temperature statistics."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from homeassistant.components.recorder import Recorder, get_instance
+from homeassistant.components.recorder.statistics import statistics_during_period
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.madvr.const import CONF_TEMPERATURE_STATISTICS, TEMP_GPU
+from custom_components.madvr.statistics import TEMPERATURE_KEYS
+
+from .conftest import make_entry
+from .envy import FakeEnvy
+
+STATISTIC_ID = f"madvr:010203040506_{TEMP_GPU}"
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(
+    recorder_mock: Recorder, enable_custom_integrations: None
+) -> None:
+    """Set the recorder up before hass, then load the integration."""
+
+
+async def test_hourly_import_lands_in_the_recorder(
+    hass: HomeAssistant, envy: FakeEnvy
+) -> None:
+    """The hour's temperatures are imported under a valid statistic id."""
+    entry = make_entry(hass, envy.port, **{CONF_TEMPERATURE_STATISTICS: True})
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    coordinator = entry.runtime_data
+
+    async with asyncio.timeout(10):
+        while not coordinator.client.connected:
+            await asyncio.sleep(0.05)
+        envy.push("Temperatures 56 48 44 40")
+        while not coordinator.statistics.samples:
+            await asyncio.sleep(0.05)
+
+    hour = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    async_fire_time_changed(hass, hour + timedelta(hours=1))
+    await hass.async_block_till_done()
+    await async_wait_recording_done(hass)
+    assert coordinator.statistics.imported_hours == len(TEMPERATURE_KEYS)
+
+    rows = await get_instance(hass).async_add_executor_job(
+        statistics_during_period,
+        hass,
+        hour,
+        None,
+        {STATISTIC_ID},
+        "hour",
+        None,
+        {"mean", "min", "max"},
+    )
+    assert rows[STATISTIC_ID][0]["mean"] == 56.0
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,62 @@
+"""Tests for the device trigger index."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from custom_components.madvr.triggers import MadVRTriggerIndex
+
+MAC = "01-02-03-04-05-06"
+
+
+def _attach(
+    index: MadVRTriggerIndex, key: str, value: Any, fired: list[tuple[str, Any]]
+) -> None:
+    """Attach a trigger recording its name and the value it fired with."""
+    name = "any" if value is None else str(value)
+    index.async_attach(MAC, key, value, lambda new: fired.append((name, new)))
+
+
+def test_value_and_any_triggers_fire_once() -> None:
+    """A change fires the matching value trigger and the any-value trigger."""
+    index = MadVRTriggerIndex()
+    fired: list[tuple[str, Any]] = []
+    _attach(index, "aspect_dec", None, fired)
+    _attach(index, "aspect_dec", "2.40", fired)
+
+    index.async_fire(MAC, {"aspect_dec": 2.4})
+    assert sorted(fired) == [("2.40", 2.4), ("any", 2.4)]
+
+
+def test_removed_key_fires_any_trigger_once() -> None:
+    """A removed key fires each any-value trigger a single time."""
+    index = MadVRTriggerIndex()
+    fired: list[tuple[str, Any]] = []
+    _attach(index, "aspect_dec", None, fired)
+
+    index.async_fire(MAC, {"aspect_dec": None})
+    assert fired == [("any", None)]
+
+
+def test_removed_flag_is_off() -> None:
+    """A flag the client deletes on standby fires the off triggers."""
+    index = MadVRTriggerIndex()
+    fired: list[tuple[str, Any]] = []
+    _attach(index, "is_signal", False, fired)
+    _attach(index, "hdr_flag", False, fired)
+    _attach(index, "hdr_flag", True, fired)
+
+    index.async_fire(MAC, {"is_signal": None, "hdr_flag": None})
+    assert sorted(fired) == [("False", False), ("False", False)]
+
+
+def test_detach() -> None:
+    """A detached trigger no longer fires and empty levels are dropped."""
+    index = MadVRTriggerIndex()
+    fired: list[tuple[str, Any]] = []
+    detach = index.async_attach(MAC, "hdr_flag", True, fired.append)
+    detach()
+
+    index.async_fire(MAC, {"hdr_flag": True})
+    assert fired == []
+    assert index.as_dict() == {"attached": 0, "fired": 0}
@@ -0,0 +1,81 @@
+"""Tests for the validation of committed data."""
+
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.madvr.validation import MadVRPushValidator
+
+from .conftest import make_entry
+from .envy import FakeEnvy
+
+
+def test_display_tokens_are_accepted() -> None:
+    """Tokens the sensors do not list are still valid values."""
+    validator = MadVRPushValidator()
+    delta = {
+        "incoming_colorimetry": "601",
+        "incoming_signal_type": "HLG",
+        "incoming_res": "7680x4320",
+        "is_on": True,
+    }
+    assert validator.invalid_keys(delta) == []
+    assert validator.as_dict() == {"checked": 4, "rejected": 0, "malformed": {}}
+
+
+def test_malformed_values_are_rejected() -> None:
+    """Wrong types and oversized strings are reported by key."""
+    validator = MadVRPushValidator()
+    delta = {"is_on": "yes", "incoming_res": "x" * 1000, "temp_gpu": "56"}
+    assert validator.invalid_keys(delta) == ["is_on", "incoming_res"]
+    assert validator.malformed == {"is_on": 1, "incoming_res": 1}
+
+
+async def test_malformed_value_keeps_last_valid_value(
+    hass: HomeAssistant, envy: FakeEnvy
+) -> None:
+    """A malformed value is not committed and sends no removal."""
+    await envy.stop()
+    entry = make_entry(hass, envy.port)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    coordinator = entry.runtime_data
+    deltas: list[dict] = []
+    coordinator.async_add_delta_listener(deltas.append)
+
+    coordinator._async_commit({"is_on": True, "incoming_res": "3840x2160"})
+    coordinator._async_commit({"is_on": True, "incoming_res": "x" * 1000})
+    coordinator._async_commit({"is_on": True, "incoming_res": "1920x1080"})
+
+    assert deltas == [
+        {"is_on": True, "incoming_res": "3840x2160"},
+        {"incoming_res": "1920x1080"},
+    ]
+    assert coordinator.data["incoming_res"] == "1920x1080"
+    assert coordinator.validator.rejected == 1
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_priority_lane_publishes_checked_values_only(
+    hass: HomeAssistant, envy: FakeEnvy
+) -> None:
+    """The priority lane never exposes the client's dict or unchecked values."""
+    await envy.stop()
+    entry = make_entry(hass, envy.port)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    coordinator = entry.runtime_data
+    coordinator._async_commit({"is_on": True, "incoming_res": "3840x2160"})
+
+    pushed = {"is_on": True, "incoming_res": "x" * 1000, "aspect_dec": 2.4}
+    coordinator._async_dispatch_priority(pushed)
+    assert coordinator.data == {
+        "is_on": True,
+        "incoming_res": "3840x2160",
+        "aspect_dec": 2.4,
+    }
+    pushed["aspect_dec"] = 1.78
+    assert coordinator.data["aspect_dec"] == 2.4
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
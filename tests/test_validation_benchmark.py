@@ -0,0 +1,116 @@
+"""Benchmark of the commit validation against the getsizeof guard it replaced.
+
+Reports the cost of the old guard per push and of the validation per commit,
+run with -s to see them; BENCH_PUSHES sets the number of pushes in the burst.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import timeit
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.madvr.validation import MadVRPushValidator
+
+from .conftest import make_entry
+from .envy import FakeEnvy
+
+BENCH_PUSHES = int(os.environ.get("BENCH_PUSHES", "100"))
+# seconds between pushes of the burst, well under the publish window
+PUSH_INTERVAL = 0.005
+TIMEIT_NUMBER = 20000
+
+# a full push as the client keeps it, 33 keys
+PUSH: dict[str, Any] = {
+    "is_on": True,
+    "is_signal": True,
+    "hdr_flag": True,
+    "outgoing_hdr_flag": True,
+    "power_state": "on",
+    "mac_address": "01-02-03-04-05-06",
+    "temp_gpu": 56,
+    "temp_hdmi": 48,
+    "temp_cpu": 44,
+    "temp_mainboard": 40,
+    "incoming_res": "3840x2160",
+    "incoming_frame_rate": "23.976p",
+    "incoming_color_space": "422",
+    "incoming_bit_depth": "10bit",
+    "incoming_hdr_flag": True,
+    "incoming_colorimetry": "2020",
+    "incoming_black_levels": "TV",
+    "incoming_aspect_ratio": "16:9",
+    "incoming_signal_type": "HDR10",
+    "outgoing_res": "3840x2160",
+    "outgoing_frame_rate": "23.976p",
+    "outgoing_color_space": "RGB",
+    "outgoing_bit_depth": "12bit",
+    "outgoing_colorimetry": "2020",
+    "outgoing_black_levels": "PC",
+    "outgoing_signal_type": "HDR10",
+    "aspect_res": "3840:1600",
+    "aspect_dec": 2.4,
+    "aspect_int": "240",
+    "aspect_name": '"Scope"',
+    "masking_res": "3840:1600",
+    "masking_dec": 2.4,
+    "masking_int": "240",
+}
+
+
+def _old_guard(data: dict[str, Any]) -> bool:
+    """Return if the baseline's handle_push_data let the push through."""
+    try:
+        import sys
+
+        return sys.getsizeof(data) <= 1_000_000
+    except Exception:
+        return True
+
+
+def _us(statement: Any) -> float:
+    """Return the microseconds one call of statement takes."""
+    return timeit.timeit(statement, number=TIMEIT_NUMBER) / TIMEIT_NUMBER * 1e6
+
+
+async def test_validation_cheaper_than_guard(
+    hass: HomeAssistant, envy: FakeEnvy
+) -> None:
+    """Checking the commit delta costs less per push than the old guard."""
+    await envy.stop()
+    entry = make_entry(hass, envy.port)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    coordinator = entry.runtime_data
+    coordinator._async_commit(dict(PUSH))
+
+    # a burst of temperature pushes, the window coalesces them into commits
+    commits = coordinator.commit_count
+    for push in range(BENCH_PUSHES):
+        coordinator.handle_push_data({**PUSH, "temp_gpu": 50 + push % 10})
+        await asyncio.sleep(PUSH_INTERVAL)
+    await hass.async_block_till_done()
+    commits = coordinator.commit_count - commits
+
+    validator = MadVRPushValidator()
+    guard_us = _us(lambda: _old_guard(PUSH))
+    check_us = _us(lambda: validator.invalid_keys({"temp_gpu": 57}))
+    per_push_us = check_us * commits / BENCH_PUSHES
+    print(
+        f"guard {guard_us:.2f} us/push, check {check_us:.2f} us/commit,"
+        f" {commits} commits for {BENCH_PUSHES} pushes:"
+        f" {per_push_us:.2f} us/push"
+    )
+    assert commits < BENCH_PUSHES
+    assert per_push_us < guard_us
+
+    # a huge value fails its length bound, the guard only measured the dict shell
+    huge = "x" * 10_000_000
+    assert validator.invalid_keys({"incoming_res": huge}) == ["incoming_res"]
+    assert sys.getsizeof({"incoming_res": huge}) < 1_000_000
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
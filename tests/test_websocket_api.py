@@ -0,0 +1,69 @@
+"""Tests for the madVR websocket API."""
+
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from .conftest import make_entry
+from .envy import FakeEnvy
+
+
+async def test_subscription_follows_reload(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator, envy: FakeEnvy
+) -> None:
+    """A reload resends the snapshot and deltas keep coming, removal ends it."""
+    await envy.stop()
+    assert await async_setup_component(hass, "websocket_api", {})
+    entry = make_entry(hass, envy.port)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id(
+        {"type": "madvr/subscribe", "entry_id": entry.entry_id, "keys": ["is_on"]}
+    )
+    assert (await client.receive_json())["success"]
+    assert (await client.receive_json())["event"] == {"snapshot": {}}
+
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    assert (await client.receive_json())["event"] == {"snapshot": {}}
+
+    entry.runtime_data._async_commit({"is_on": True})
+    assert (await client.receive_json())["event"] == {"delta": {"is_on": True}}
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    message = await client.receive_json()
+    assert not message["success"]
+    assert message["error"]["code"] == "not_found"
+
+
+async def test_subscription_waits_through_setup_retry(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator, envy: FakeEnvy
+) -> None:
+    """A setup retry does not end the subscription, the next load resumes it."""
+    await envy.stop()
+    assert await async_setup_component(hass, "websocket_api", {})
+    entry = make_entry(hass, envy.port)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id(
+        {"type": "madvr/subscribe", "entry_id": entry.entry_id}
+    )
+    assert (await client.receive_json())["success"]
+    assert (await client.receive_json())["event"] == {"snapshot": {}}
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_RETRY, "device unreachable")
+    # as the scheduled retry does
+    await entry.async_setup_locked(hass)
+    assert entry.state is ConfigEntryState.LOADED
+    assert (await client.receive_json())["event"] == {"snapshot": {}}
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    assert not (await client.receive_json())["success"]